@@ -0,0 +1,108 @@
+// Stand-in for the arangojs Database used by the benchmarks. Queries are
+// answered from canned results and writes are acknowledged without being
+// stored, so every iteration of a benchmark sees the same data and the time
+// measured is spent in the service itself.
+
+let keys = 0;
+
+export class FakeCursor {
+  constructor(rows, extra = {}) {
+    this.rows = rows;
+    this.position = 0;
+    this.count = rows.length;
+    this.extra = extra;
+  }
+
+  async all() {
+    const rows = this.rows.slice(this.position);
+    this.position = this.rows.length;
+    return rows;
+  }
+
+  async next() {
+    return this.rows[this.position++];
+  }
+
+  async *[Symbol.asyncIterator]() {
+    while (this.position < this.rows.length) yield this.rows[this.position++];
+  }
+}
+
+const saved = (name, doc) => {
+  const _key = doc._key ?? String(++keys);
+  return { _key, _id: `${name}/${_key}`, _rev: '_fake', new: { ...doc, _key, _id: `${name}/${_key}` } };
+};
+
+const matches = (doc, example) => Object.entries(example).every(([field, value]) => doc[field] === value);
+
+class FakeCollection {
+  constructor(name, documents) {
+    this.name = name;
+    this.documents = documents;
+  }
+
+  async exists() { return true; }
+  async create() {}
+  async drop() {}
+  async ensureIndex() {}
+  async revision() { return { revision: '0' }; }
+
+  async byExample(example) {
+    return new FakeCursor(this.documents.filter(doc => matches(doc, example)));
+  }
+
+  async firstExample(example) {
+    return this.documents.find(doc => matches(doc, example)) ?? null;
+  }
+
+  async document(key) {
+    return this.documents.find(doc => doc._key === key) ?? null;
+  }
+
+  async save(doc) { return saved(this.name, doc); }
+  async saveAll(docs) { return docs.map(doc => saved(this.name, doc)); }
+  async update(key, patch) { return { _key: key, new: { ...(await this.document(key)), ...patch } }; }
+  async remove(key) { return { _key: key }; }
+}
+
+// `queries` is a list of [pattern, rows(bindVars, options)] tried in order
+// against the AQL text; unmatched queries return no rows. `documents` holds
+// the documents of collections read with byExample and friends.
+export class FakeDatabase {
+  constructor({ queries = [], documents = {} } = {}) {
+    this.queries = queries;
+    this.documents = documents;
+    this.queryCount = 0;
+  }
+
+  async query(aqlQuery, bindVars = {}, options = {}) {
+    this.queryCount++;
+    const text = typeof aqlQuery === 'string' ? aqlQuery : aqlQuery.query;
+    const vars = typeof aqlQuery === 'string' ? bindVars : aqlQuery.bindVars;
+    for (const [pattern, rows] of this.queries) {
+      if (pattern.test(text)) {
+        const result = rows(vars ?? {}, options);
+        return new FakeCursor(result, { stats: { fullCount: result.length } });
+      }
+    }
+    return new FakeCursor([]);
+  }
+
+  collection(name) {
+    return new FakeCollection(name, this.documents[name] ?? []);
+  }
+
+  analyzer() {
+    return { exists: async () => true, create: async () => {} };
+  }
+
+  view() {
+    return { exists: async () => true, updateProperties: async () => {} };
+  }
+
+  async createView() {}
+  async createEdgeCollection() {}
+  async listCollections() { return []; }
+  async version() { return { server: 'fake', version: '0' }; }
+  close() {}
+}
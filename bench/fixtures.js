@@ -0,0 +1,74 @@
+// Dictionary content shaped like a flight dictionary, in the sizes the
+// benchmarks send and receive.
+
+export const DICTIONARY_TYPE = 'flight';
+export const DICTIONARY_VERSION = 'bench';
+
+const enumerations = size => Array.from({ length: size }, (_, i) => ({ symbol: `STATE_${i}`, numeric: i }));
+
+export function dictionary() {
+  return {
+    _key: 'bench',
+    _id: 'dictionary/bench',
+    dictionary_type: DICTIONARY_TYPE,
+    dictionary_version: DICTIONARY_VERSION,
+    dictionary_description: 'Benchmark dictionary',
+    state: 'NOT_PUBLISHED',
+    revision: 1,
+    creation_date: '2025-01-01T00:00:00.000Z',
+  };
+}
+
+export function commands(count) {
+  return Array.from({ length: count }, (_, i) => ({
+    command_stem: `BENCH_CMD_${String(i).padStart(5, '0')}`,
+    operations_category: `SUBSYSTEM_${i % 12}`,
+    cmd_description: `Sets the operating mode of unit ${i} and reports the resulting state in telemetry.`,
+    restricted_modes: ['SAFE', 'LAUNCH'],
+    cmd_type: 'FSW',
+    repeat_min: 0,
+    repeat_max: 0,
+    arguments: [
+      {
+        argument_type: 'ENUM',
+        argument_size: 8,
+        argument_description: 'Operating mode',
+        repeat_arg: 'No',
+        enumerations: enumerations(6),
+      },
+      {
+        argument_type: 'UINT',
+        argument_size: 16,
+        argument_description: 'Delay before switching, in seconds',
+        repeat_arg: 'No',
+        allowable_ranges: [{ min_value: '0', max_value: '3600' }],
+      },
+      {
+        argument_type: 'STRING',
+        argument_size: 64,
+        argument_description: 'Operator note',
+        repeat_arg: 'No',
+      },
+    ],
+  }));
+}
+
+export function channels(count) {
+  return Array.from({ length: count }, (_, i) => ({
+    _key: `channel${i}`,
+    _id: `channel/channel${i}`,
+    _rev: '_fake',
+    dictionary_type: DICTIONARY_TYPE,
+    dictionary_version: DICTIONARY_VERSION,
+    revision: 1,
+    channel_name: `BENCH-${String(i).padStart(5, '0')}`,
+    channel_id: `B-${i}`,
+    operations_category: `SUBSYSTEM_${i % 12}`,
+    description: `Measured state of unit ${i}, sampled once per second.`,
+    derived: 'No',
+    eu_present: i % 3 === 0 ? 'Yes' : 'No',
+    type: i % 4 === 0 ? 'enum' : 'float',
+    bit_size: 32,
+    ...(i % 4 === 0 && { enumerations: enumerations(8) }),
+  }));
+}
@@ -0,0 +1,281 @@
+// In-process benchmarks of route handlers. The application is built from
+// src/server.js with a fake database (bench/fakeDatabase.js) and driven with
+// fastify.inject, so what is measured is the Node side of a request alone:
+// routing, authentication, validation, handler logic and serialization.
+//
+//   npm run bench [-- [name filter...] [--iterations N] [--json FILE]]
+//
+// For each case it reports requests per second, latency, bytes allocated per
+// request and garbage collections during the run. --json writes the results
+// for comparison between runs.
+import { generateKeyPairSync } from 'node:crypto';
+import { mkdtempSync, rmSync, writeFileSync } from 'node:fs';
+import { tmpdir } from 'node:os';
+import path from 'node:path';
+import { performance } from 'node:perf_hooks';
+import { GCProfiler, getHeapStatistics } from 'node:v8';
+import jwt from 'jsonwebtoken';
+import { FakeDatabase } from './fakeDatabase.js';
+import {
+  DICTIONARY_TYPE,
+  DICTIONARY_VERSION,
+  dictionary,
+  commands,
+  channels
+} from './fixtures.js';
+
+const args = process.argv.slice(2);
+const option = name => {
+  const index = args.indexOf(name);
+  return index === -1 ? undefined : args.splice(index, 2)[1];
+};
+const iterationsOverride = option('--iterations');
+const jsonFile = option('--json');
+const filters = args;
+
+// Configuration read by src/config/env.js: no logging, response cache, rate
+// limit, warm-up or tracing, and artifacts kept out of the working tree
+const { publicKey, privateKey } = generateKeyPairSync('rsa', {
+  modulusLength: 2048,
+  publicKeyEncoding: { type: 'spki', format: 'pem' },
+  privateKeyEncoding: { type: 'pkcs8', format: 'pem' }
+});
+const artifactDir = mkdtempSync(path.join(tmpdir(), 'dict-service-bench-'));
+Object.assign(process.env, {
+  NODE_ENV: 'test',
+  PUBLIC_PEM: publicKey,
+  ARTIFACT_DIR: artifactDir,
+  CONTENT_LAYOUT: 'shared',
+  RESPONSE_CACHE_TTL_MS: '0',
+  RATE_LIMIT_PER_SECOND: '0',
+  WARMUP_VERSIONS: '0',
+  TRACE_EXPORT_FILE: '',
+  TRACE_OTLP_ENDPOINT: '',
+});
+
+const sign = subject => jwt.sign({ sub: subject, username: subject }, privateKey, { algorithm: 'RS256', expiresIn: '1h' });
+
+const base = `/api/v4/dictionaries/${DICTIONARY_TYPE}/versions/${DICTIONARY_VERSION}`;
+const CHANNEL_COUNT = 5000;
+const channelRows = channels(CHANNEL_COUNT);
+const [storedCommand] = commands(1).map(command => ({
+  ...command,
+  _key: 'command0',
+  _id: 'command/command0',
+  dictionary_type: DICTIONARY_TYPE,
+  dictionary_version: DICTIONARY_VERSION,
+  revision: 1
+}));
+
+// Summary as the dictionary document stores it once computed
+const storedSummary = {
+  revision: 1,
+  computed_at: '2025-01-01T00:00:00.000Z',
+  content: {
+    command: { total: 1, by: { operations_category: { SUBSYSTEM_0: 1 }, cmd_type: { FSW: 1 } } },
+    evr: { total: 0, by: { operations_category: {}, evr_level: {} } },
+    channel: { total: CHANNEL_COUNT, by: { operations_category: { SUBSYSTEM_0: CHANNEL_COUNT }, type: { float: CHANNEL_COUNT } } },
+    mil1553: { total: 0, by: { operations_category: {} } },
+  }
+};
+
+const db = new FakeDatabase({
+  queries: [
+    [/SORT doc\.channel_name/, ({ offset = 0, limit = 20 }) => channelRows.slice(offset, offset + limit)],
+    [/tracked: HAS\(d\.content_counts/, () => [{ tracked: true, count: CHANNEL_COUNT }]],
+    [/revision_seq: revision/, () => [2]],
+    [/CONCAT_SEPARATOR\('\/', NOT_NULL\(d\.revision_seq/, () => ['1/0']],
+    [/NOT_NULL\(d\.revision, 0\), summary: d\.summary/, () => [{ revision: 1, summary: storedSummary }]],
+    [/RETURN doc\.@nameField/, ({ nameField }) => channelRows.map(doc => doc[nameField]).filter(Boolean)],
+  ],
+  documents: {
+    dictionary: [dictionary()],
+    command: [storedCommand],
+  }
+});
+
+const token = sign('bench');
+const json = body => ({
+  payload: JSON.stringify(body),
+  headers: { authorization: `Bearer ${token}`, 'content-type': 'application/json' }
+});
+
+// Each case builds the request for iteration i and names the status it expects
+const CASES = [
+  {
+    name: 'GET /health (no auth, baseline)',
+    iterations: 5000,
+    status: 200,
+    request: () => ({ method: 'GET', url: '/api/v4/health' }),
+  },
+  {
+    name: 'GET cmds/:cmd_stem (cached token)',
+    iterations: 5000,
+    status: 200,
+    request: () => ({
+      method: 'GET',
+      url: `${base}/cmds/${storedCommand.command_stem}`,
+      headers: { authorization: `Bearer ${token}` }
+    }),
+  },
+  {
+    name: 'GET cmds/:cmd_stem (new token, JWT verification)',
+    iterations: 1000,
+    status: 200,
+    setup(iterations) {
+      this.tokens = Array.from({ length: iterations }, (_, i) => sign(`bench-${i}`));
+    },
+    request(i) {
+      return {
+        method: 'GET',
+        url: `${base}/cmds/${storedCommand.command_stem}`,
+        headers: { authorization: `Bearer ${this.tokens[i]}` }
+      };
+    },
+  },
+  {
+    name: 'POST cmds (1000 commands)',
+    iterations: 100,
+    status: 201,
+    setup() {
+      this.body = json(commands(1000));
+    },
+    request() {
+      return { method: 'POST', url: `${base}/cmds`, ...this.body };
+    },
+  },
+  {
+    name: 'GET channels (limit=20)',
+    iterations: 3000,
+    status: 200,
+    request: () => ({
+      method: 'GET',
+      url: `${base}/channels?limit=20`,
+      headers: { authorization: `Bearer ${token}` }
+    }),
+  },
+  {
+    name: 'GET channels (limit=500)',
+    iterations: 300,
+    status: 200,
+    request: () => ({
+      method: 'GET',
+      url: `${base}/channels?limit=500`,
+      headers: { authorization: `Bearer ${token}` }
+    }),
+  },
+  {
+    name: 'GET summary (stored)',
+    iterations: 5000,
+    status: 200,
+    request: () => ({
+      method: 'GET',
+      url: `${base}/summary`,
+      headers: { authorization: `Bearer ${token}` }
+    }),
+  },
+  {
+    name: 'GET suggest (prefix, all kinds)',
+    iterations: 5000,
+    status: 200,
+    request: () => ({
+      method: 'GET',
+      url: `${base}/suggest?prefix=bench-012`,
+      headers: { authorization: `Bearer ${token}` }
+    }),
+  },
+];
+
+// Bytes allocated between two heap samples, counting what each GC freed
+function allocatedBytes(heapBefore, heapAfter, gcStatistics) {
+  let allocated = 0;
+  let used = heapBefore;
+  for (const { beforeGC, afterGC } of gcStatistics) {
+    allocated += beforeGC.heapStatistics.usedHeapSize - used;
+    used = afterGC.heapStatistics.usedHeapSize;
+  }
+  return allocated + heapAfter - used;
+}
+
+async function run(app, benchCase) {
+  const iterations = Number(iterationsOverride ?? benchCase.iterations);
+  const warmup = Math.max(10, Math.floor(iterations / 10));
+  benchCase.setup?.(warmup + iterations);
+
+  // Warm up (JIT, lazily built state) and check the route answers as expected
+  let response;
+  for (let i = 0; i < warmup; i++) {
+    response = await app.inject(benchCase.request(i));
+    if (response.statusCode !== benchCase.status) {
+      throw new Error(`${benchCase.name}: expected ${benchCase.status}, got ${response.statusCode}: ${response.body.slice(0, 500)}`);
+    }
+  }
+  const requestBytes = Buffer.byteLength(benchCase.request(0).payload ?? '');
+  const responseBytes = response.rawPayload.length;
+
+  global.gc?.();
+  const latencies = new Float64Array(iterations);
+  const profiler = new GCProfiler();
+  const heapBefore = getHeapStatistics().used_heap_size;
+  profiler.start();
+  const started = performance.now();
+
+  for (let i = 0; i < iterations; i++) {
+    const start = performance.now();
+    await app.inject(benchCase.request(warmup + i));
+    latencies[i] = performance.now() - start;
+  }
+
+  const elapsed = performance.now() - started;
+  const heapAfter = getHeapStatistics().used_heap_size;
+  const { statistics } = profiler.stop();
+  latencies.sort();
+
+  return {
+    name: benchCase.name,
+    iterations,
+    ops_per_sec: Math.round(iterations / (elapsed / 1000)),
+    mean_ms: elapsed / iterations,
+    p99_ms: latencies[Math.min(iterations - 1, Math.floor(iterations * 0.99))],
+    allocated_bytes_per_op: Math.round(allocatedBytes(heapBefore, heapAfter, statistics) / iterations),
+    gc_count: statistics.length,
+    gc_ms: statistics.reduce((total, { cost }) => total + cost, 0) / 1000,
+    request_bytes: requestBytes,
+    response_bytes: responseBytes,
+  };
+}
+
+const { buildServer } = await import('../src/server.js');
+const app = buildServer({ db });
+
+try {
+  await app.ready();
+  if (!global.gc) {
+    console.warn('Run with --expose-gc (as npm run bench does) to start each case from a collected heap');
+  }
+
+  const results = [];
+  for (const benchCase of CASES) {
+    if (filters.length > 0 && !filters.some(filter => benchCase.name.includes(filter))) continue;
+    results.push(await run(app, benchCase));
+  }
+
+  console.table(results.map(result => ({
+    route: result.name,
+    'ops/sec': result.ops_per_sec,
+    'mean ms': result.mean_ms.toFixed(3),
+    'p99 ms': result.p99_ms.toFixed(3),
+    'alloc KB/op': (result.allocated_bytes_per_op / 1024).toFixed(1),
+    'GCs': result.gc_count,
+    'GC ms': result.gc_ms.toFixed(1),
+    'req KB': (result.request_bytes / 1024).toFixed(1),
+    'res KB': (result.response_bytes / 1024).toFixed(1),
+  })));
+
+  if (jsonFile) {
+    writeFileSync(jsonFile, JSON.stringify({ node: process.version, date: new Date().toISOString(), results }, null, 2));
+  }
+} finally {
+  await app.close();
+  rmSync(artifactDir, { recursive: true, force: true });
+}
@@ -0,0 +1,20 @@
+// Writes the route validators and serializers as standalone code, with the
+// OpenAPI document, to PRECOMPILED_SCHEMA_DIR for SCHEMA_MODE=precompiled.
+// The application starts as for `npm start` (so it needs its ArangoDB) but
+// does not listen. Run it again whenever a schema in src/schemas changes;
+// routes whose schemas changed since are compiled at startup until then.
+process.env.SCHEMA_MODE = 'build';
+
+const { PRECOMPILED_SCHEMA_DIR } = await import('../src/config/env.js');
+const { buildServer } = await import('../src/server.js');
+const fastify = buildServer();
+
+try {
+  await fastify.ready();
+  fastify.schemaCompilers.writeBuild(fastify.swagger());
+
+  const { validators, serializers } = fastify.schemaCompilers.stats;
+  fastify.log.info(`Wrote ${validators.count} validators, ${serializers.count} serializers and the OpenAPI document to ${PRECOMPILED_SCHEMA_DIR}`);
+} finally {
+  await fastify.close();
+}
@@ -1,11 +1,20 @@
-import fastify from './server.js';
-import { APP_PORT, APP_HOST, NODE_ENV } from './config/env.js';
+import { buildServer } from './server.js';
+import { APP_PORT, APP_HOST, NODE_ENV, SCHEMA_MODE } from './config/env.js';
+
+const fastify = buildServer();
 
 const start = async () => {
   try {
     await fastify.listen({ port: APP_PORT, host: APP_HOST });
     fastify.log.info(`Node Environment: ${NODE_ENV}`);
     fastify.log.info(`Swagger UI available at http://${APP_HOST}:${APP_PORT}/api-docs`);
+
+    const startup = fastify.startupBreakdown();
+    fastify.log.info({ startup }, `Started in ${startup.total_ms} ms`);
+    const compiled = startup.validators.compiled + startup.serializers.compiled;
+    if (SCHEMA_MODE === 'precompiled' && compiled > 0) {
+      fastify.log.warn(`${compiled} route schemas changed since the last schema build and were compiled; run npm run build:schemas`);
+    }
   } catch (err) {
     fastify.log.error(err);
     process.exit(1);
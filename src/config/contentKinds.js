@@ -0,0 +1,58 @@
+// Describes each kind of dictionary content: the collection it is stored in,
+// the field that names an element, the free text fields used for search and
+// the fields whose values the version summary counts elements by.
+export const CONTENT_KINDS = {
+  command: {
+    collection: 'command',
+    nameField: 'command_stem',
+    textFields: ['cmd_description'],
+    summaryFields: ['operations_category', 'cmd_type'],
+  },
+  evr: {
+    collection: 'evr',
+    nameField: 'evr_name',
+    textFields: ['evr_id', 'evr_message', 'evr_description'],
+    summaryFields: ['operations_category', 'evr_level'],
+  },
+  channel: {
+    collection: 'channel',
+    nameField: 'channel_name',
+    textFields: ['channel_id', 'description'],
+    summaryFields: ['operations_category', 'type'],
+  },
+  mil1553: {
+    collection: 'mil1553',
+    nameField: 'mil1553_name',
+    textFields: ['description'],
+    summaryFields: ['operations_category'],
+  },
+};
+
+// Verification items are searched alongside dictionary content but are not versioned
+export const VI_SEARCH_FIELDS = {
+  collection: 'vnv',
+  nameField: 'vi_name',
+  textFields: ['vi_id', 'vi_text'],
+};
+
+// ArangoSearch view and analyzer used by the unified search endpoint
+export const SEARCH_VIEW_NAME = 'dictionary_content_search';
+export const SEARCH_ANALYZER_NAME = 'dictionary_content_ngram';
+
+// Dictionary content that verification items of a given vi_type refer to.
+// A VI is linked to every element (in any dictionary version) whose match
+// fields equal its vi_name or an identifier mentioned in its vi_text.
+export const VI_LINK_TARGETS = {
+  COMMAND: { kind: 'command', matchFields: ['command_stem'] },
+  CHANNEL: { kind: 'channel', matchFields: ['channel_name', 'channel_id'] },
+  EVR: { kind: 'evr', matchFields: ['evr_name', 'evr_id'] },
+};
+
+// Edge collection holding the links from `vnv` to dictionary content
+export const VI_LINK_COLLECTION = 'vi_links';
+
+// Records of deleted dictionary content, for incremental sync
+export const CONTENT_TOMBSTONE_COLLECTION = 'content_tombstone';
+
+// Enumeration sets shared by the channels and mil1553 variables of a version
+export const ENUMERATION_SET_COLLECTION = 'enumeration_set';
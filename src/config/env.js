@@ -8,11 +8,101 @@ export const NODE_ENV = process.env.NODE_ENV || 'production';
 export const LOG_LEVEL = process.env.LOG_LEVEL || 'info';
 
 // ArangoDB Configuration
+// A comma separated list of coordinator URLs is used for load balancing and failover
 export const ARANGO_URL = process.env.ARANGO_URL || 'http://localhost:8529';
+export const ARANGO_URLS = ARANGO_URL.split(',').map(url => url.trim()).filter(Boolean);
 export const ARANGO_DB_NAME = process.env.ARANGO_DB_NAME || 'project_config';
 export const ARANGO_USERNAME = process.env.ARANGO_USERNAME || '';
 export const ARANGO_PASSWORD = process.env.ARANGO_PASSWORD || '';
 
+// ArangoDB connection pool
+// NONE (first URL, others for failover), ROUND_ROBIN or ONE_RANDOM
+export const ARANGO_LOAD_BALANCING = process.env.ARANGO_LOAD_BALANCING || (ARANGO_URLS.length > 1 ? 'ROUND_ROBIN' : 'NONE');
+// Sockets (concurrent requests) per coordinator; further requests queue in the driver
+export const ARANGO_MAX_SOCKETS = parseInt(process.env.ARANGO_MAX_SOCKETS || '16', 10);
+export const ARANGO_KEEP_ALIVE = (process.env.ARANGO_KEEP_ALIVE || 'true') === 'true';
+export const ARANGO_KEEP_ALIVE_MSECS = parseInt(process.env.ARANGO_KEEP_ALIVE_MSECS || '1000', 10);
+// Retries of a failed request on another coordinator (defaults to one per coordinator)
+export const ARANGO_MAX_RETRIES = parseInt(process.env.ARANGO_MAX_RETRIES || String(ARANGO_URLS.length), 10);
+// Retries of writes rejected with a write-write conflict
+export const ARANGO_RETRY_ON_CONFLICT = parseInt(process.env.ARANGO_RETRY_ON_CONFLICT || '0', 10);
+// Default limit for AQL queries, enforced by the client and by the server; 0 disables
+export const ARANGO_QUERY_TIMEOUT_MS = parseInt(process.env.ARANGO_QUERY_TIMEOUT_MS || '60000', 10);
+
 export const PUBLIC_PEM = process.env.PUBLIC_PEM
 
-export const COLLECTION_NAMES = ['dictionary', 'command', 'channel', 'evr', 'mil1553', 'vnv', 'custom_script'];
\ No newline at end of file
+export const COLLECTION_NAMES = ['dictionary', 'command', 'channel', 'evr', 'mil1553', 'vnv', 'custom_script', 'step_palette', 'content_tombstone', 'enumeration_set'];
+
+// Edge collections
+export const EDGE_COLLECTION_NAMES = ['vi_links'];
+
+// Dictionary content collections (scoped by dictionary_type/dictionary_version)
+export const CONTENT_COLLECTION_NAMES = ['command', 'channel', 'evr', 'mil1553'];
+
+// Dictionary states whose content is frozen and served from prebuilt artifacts
+export const PUBLISHED_STATES = ['PUBLISHED', 'RELEASED', 'RETIRED'];
+export const ARTIFACT_DIR = process.env.ARTIFACT_DIR || './artifacts';
+// Most recent published versions whose caches are warmed at startup; 0 disables
+export const WARMUP_VERSIONS = parseInt(process.env.WARMUP_VERSIONS || '3', 10);
+
+// Dictionary versions whose element names are kept in memory for suggestions
+export const SUGGEST_MAX_VERSIONS = parseInt(process.env.SUGGEST_MAX_VERSIONS || '20', 10);
+
+// Longest the in-memory step palette is served before it is checked for writes
+// made by other instances (and reloaded if there were any), which bounds how
+// long they take to show up
+export const STEP_PALETTE_TTL_MS = parseInt(process.env.STEP_PALETTE_TTL_MS || '30000', 10);
+
+// Responses smaller than this many bytes are sent uncompressed
+export const COMPRESSION_THRESHOLD = parseInt(process.env.COMPRESSION_THRESHOLD || '1024', 10);
+
+// Lifetime of cached V&V statistics (invalidated early on VI writes)
+export const VNV_STATS_TTL_MS = parseInt(process.env.VNV_STATS_TTL_MS || '60000', 10);
+
+// Serialized list/search responses, keyed by query and data revision
+export const RESPONSE_CACHE_TTL_MS = parseInt(process.env.RESPONSE_CACHE_TTL_MS || '30000', 10);
+export const RESPONSE_CACHE_MAX_ENTRIES = parseInt(process.env.RESPONSE_CACHE_MAX_ENTRIES || '500', 10);
+
+// Admission control: concurrent requests per route class and how many more may wait
+const admissionLimit = (name, concurrency, queue) => ({
+  concurrency: parseInt(process.env[`ADMISSION_${name}_CONCURRENCY`] || String(concurrency), 10),
+  queue: parseInt(process.env[`ADMISSION_${name}_QUEUE`] || String(queue), 10),
+});
+export const ADMISSION_LIMITS = {
+  bulk_write: admissionLimit('BULK_WRITE', 2, 8),
+  wild_search: admissionLimit('WILD_SEARCH', 4, 16),
+  export: admissionLimit('EXPORT', 2, 4),
+  point_read: admissionLimit('POINT_READ', 64, 256),
+};
+// Longest a queued request waits for a slot before it is rejected
+export const ADMISSION_QUEUE_TIMEOUT_MS = parseInt(process.env.ADMISSION_QUEUE_TIMEOUT_MS || '10000', 10);
+
+// Per-user rate limit (token bucket); a rate of 0 disables it
+export const RATE_LIMIT_PER_SECOND = parseFloat(process.env.RATE_LIMIT_PER_SECOND || '50');
+export const RATE_LIMIT_BURST = parseInt(process.env.RATE_LIMIT_BURST || '200', 10);
+
+// Items of large request bodies are validated and prepared this many at a time,
+// yielding to the event loop in between
+export const BODY_CHUNK_SIZE = parseInt(process.env.BODY_CHUNK_SIZE || '1000', 10);
+
+// Request tracing, exported as OTLP/JSON to a file (one export request per
+// line) and/or an OTLP/HTTP collector. Tracing is off unless an exporter is set.
+export const TRACE_EXPORT_FILE = process.env.TRACE_EXPORT_FILE || '';
+export const TRACE_OTLP_ENDPOINT = process.env.TRACE_OTLP_ENDPOINT || '';
+export const TRACING_ENABLED = Boolean(TRACE_EXPORT_FILE || TRACE_OTLP_ENDPOINT);
+// Share of requests traced; requests carrying a sampled `traceparent` are always traced
+export const TRACE_SAMPLE_RATIO = parseFloat(process.env.TRACE_SAMPLE_RATIO || '0.1');
+export const TRACE_EXPORT_INTERVAL_MS = parseInt(process.env.TRACE_EXPORT_INTERVAL_MS || '5000', 10);
+
+// How channel and mil1553 enumerations are stored: 'embedded' in each element,
+// or 'shared' once per distinct set and dictionary version
+export const ENUMERATION_STORAGE = process.env.ENUMERATION_STORAGE === 'shared' ? 'shared' : 'embedded';
+
+// Storage layout of dictionary content: 'shared' collections for all versions,
+// or 'per_version' collections for each dictionary type and version
+export const CONTENT_LAYOUT = process.env.CONTENT_LAYOUT === 'per_version' ? 'per_version' : 'shared';
+
+// Route schemas: 'compile' them at startup, or load the validators,
+// serializers and OpenAPI document written by `npm run build:schemas`
+export const SCHEMA_MODE = ['precompiled', 'build'].includes(process.env.SCHEMA_MODE) ? process.env.SCHEMA_MODE : 'compile';
+export const PRECOMPILED_SCHEMA_DIR = process.env.PRECOMPILED_SCHEMA_DIR || './precompiled';
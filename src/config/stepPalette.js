@@ -0,0 +1,30 @@
+// Built in steps of the procedure editor palette, with their default display
+// name and category. Steps with `requires_commands` are only enabled by default
+// when the command dictionary holds commands of that dictionary type.
+export const BUILT_IN_STEPS = [
+  { step_type: 'MANUAL_INPUT', step_display_name: 'Manual Input', palette_catagory: 'Manual' },
+  { step_type: 'MANUAL_EIP', step_display_name: 'Manual EIP', palette_catagory: 'Manual' },
+  { step_type: 'VENUE_CONFIG_MANUAL', step_display_name: 'Venue Configuration', palette_catagory: 'Manual' },
+  { step_type: 'ENVIRONMENT_MANUAL', step_display_name: 'Environment', palette_catagory: 'Manual' },
+  { step_type: 'GDS_MANUAL', step_display_name: 'GDS Manual', palette_catagory: 'Manual' },
+  { step_type: 'MANUAL_VERIFICATION', step_display_name: 'Manual Verification', palette_catagory: 'Manual' },
+  { step_type: 'QUERY_EVR', step_display_name: 'Query EVR', palette_catagory: 'Telemetry' },
+  { step_type: 'WAIT_EVR', step_display_name: 'Wait for EVR', palette_catagory: 'Telemetry' },
+  { step_type: 'VERIFY_EHA', step_display_name: 'Verify EHA', palette_catagory: 'Telemetry' },
+  { step_type: 'WAIT_EHA', step_display_name: 'Wait for EHA', palette_catagory: 'Telemetry' },
+  { step_type: 'BUS_1553', step_display_name: '1553 Bus', palette_catagory: 'Telemetry' },
+  { step_type: 'LIST_DATA_PRODUCTS', step_display_name: 'List Data Products', palette_catagory: 'Data Products' },
+  { step_type: 'WAIT_DATA_PRODUCTS', step_display_name: 'Wait for Data Products', palette_catagory: 'Data Products' },
+  { step_type: 'CMD', step_display_name: 'Command', palette_catagory: 'Commanding', requires_commands: 'flight' },
+  { step_type: 'CMD_FILE', step_display_name: 'Command File', palette_catagory: 'Commanding', requires_commands: 'flight' },
+  { step_type: 'CMD_SCMF', step_display_name: 'SCMF', palette_catagory: 'Commanding', requires_commands: 'flight' },
+  { step_type: 'CMD_SSE', step_display_name: 'SSE Command', palette_catagory: 'Commanding', requires_commands: 'sse' },
+  { step_type: 'CUSTOM_SCRIPT', step_display_name: 'Custom Script', palette_catagory: 'Custom Scripts' },
+  { step_type: 'WAIT', step_display_name: 'Wait', palette_catagory: 'Control' },
+  { step_type: 'TIME_REFERENCE', step_display_name: 'Time Reference', palette_catagory: 'Control' },
+];
+
+export const BUILT_IN_STEP_TYPES = BUILT_IN_STEPS.map(step => step.step_type);
+
+// Category of custom steps derived from active custom scripts
+export const DEFAULT_CUSTOM_STEP_CATEGORY = 'Custom Scripts';
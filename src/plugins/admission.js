@@ -0,0 +1,148 @@
+import fp from 'fastify-plugin';
+import { ADMISSION_LIMITS, ADMISSION_QUEUE_TIMEOUT_MS } from '../config/env.js';
+
+// Seconds a rejected client is asked to wait before retrying, per route class
+const RETRY_AFTER_SECONDS = {
+  bulk_write: 5,
+  wild_search: 2,
+  export: 5,
+  point_read: 1
+};
+
+const kGate = Symbol('admissionGate');
+
+// A counting semaphore with a bounded wait queue
+class Gate {
+  constructor({ concurrency, queue }) {
+    this.concurrency = concurrency;
+    this.queueLimit = queue;
+    this.active = 0;
+    this.waiting = [];
+  }
+
+  // Resolves true once a slot is held, false if the queue is full or the wait times out
+  acquire(timeoutMs) {
+    if (this.active < this.concurrency) {
+      this.active++;
+      return Promise.resolve(true);
+    }
+    if (this.waiting.length >= this.queueLimit) {
+      return Promise.resolve(false);
+    }
+
+    return new Promise(resolve => {
+      const waiter = { resolve };
+      waiter.timer = setTimeout(() => {
+        this.waiting.splice(this.waiting.indexOf(waiter), 1);
+        resolve(false);
+      }, timeoutMs);
+      this.waiting.push(waiter);
+    });
+  }
+
+  // Hands the slot to the next waiter, or frees it
+  release() {
+    const next = this.waiting.shift();
+    if (next) {
+      clearTimeout(next.timer);
+      next.resolve(true);
+    } else {
+      this.active--;
+    }
+  }
+}
+
+// Limits how many requests of each route class run at once. Routes declare
+// their class with `config: { admission: <class> }`:
+//
+//   'bulk_write'  large inserts and imports
+//   'wild_search' substring searches that scan whole collections
+//   'export'      full dictionary exports
+//   'point_read'  lookups by key and indexed list queries
+//   'search'      list queries: 'wild_search' when `wild=true`, else 'point_read'
+//
+// Requests beyond a class's concurrency wait in a bounded queue; when the
+// queue is full, or the wait exceeds ADMISSION_QUEUE_TIMEOUT_MS, they are
+// rejected at once with 503 and Retry-After. Admission runs in onRequest, so
+// a rejected upload is refused before its body is read. Routes that require
+// authentication authenticate there first, so requests without a valid token
+// never take or wait for a slot. Classes are independent, so point reads keep
+// their own slots during import storms.
+async function admissionPlugin(fastify, options) {
+  const limits = { ...ADMISSION_LIMITS, ...options.limits };
+  const queueTimeoutMs = options.queueTimeoutMs ?? ADMISSION_QUEUE_TIMEOUT_MS;
+
+  const gates = Object.fromEntries(
+    Object.entries(limits).map(([name, limit]) => [name, new Gate(limit)])
+  );
+
+  // `${method} ${url}` of gated routes that require authentication
+  const authenticatedRoutes = new Set();
+  const routeId = (method, url) => `${method} ${url}`;
+
+  function routeClass(request) {
+    const declared = request.routeOptions.config?.admission;
+    if (declared !== 'search') return declared;
+    return ['true', '1'].includes(String(request.query?.wild)) ? 'wild_search' : 'point_read';
+  }
+
+  function release(request) {
+    const gate = request[kGate];
+    if (!gate) return;
+    request[kGate] = null;
+    gate.release();
+  }
+
+  fastify.addHook('onRoute', routeOptions => {
+    const declared = routeOptions.config?.admission;
+    if (declared && declared !== 'search' && !limits[declared]) {
+      throw new Error(`Unknown admission class '${declared}' for ${routeOptions.url}`);
+    }
+    if (declared && [].concat(routeOptions.preHandler ?? []).includes(fastify.authenticate)) {
+      for (const method of [].concat(routeOptions.method)) {
+        authenticatedRoutes.add(routeId(method, routeOptions.url));
+      }
+    }
+  });
+
+  fastify.addHook('onRequest', async (request, reply) => {
+    const name = routeClass(request);
+    if (!name) return;
+
+    // The route's own authenticate preHandler then finds the request authenticated
+    if (authenticatedRoutes.has(routeId(request.method, request.routeOptions.url))) {
+      await fastify.authenticate(request, reply);
+      if (reply.sent) return;
+    }
+
+    const gate = gates[name];
+    if (!(await gate.acquire(queueTimeoutMs))) {
+      request.log.warn({ routeClass: name }, 'Request rejected by admission control');
+      reply.header('retry-after', RETRY_AFTER_SECONDS[name] ?? 1);
+      return reply.code(503).send({
+        message: `Too many ${name.replace('_', ' ')} requests in progress. Retry later.`
+      });
+    }
+    request[kGate] = gate;
+  });
+
+  fastify.addHook('onResponse', async (request) => release(request));
+  fastify.addHook('onRequestAbort', async (request) => release(request));
+
+  fastify.decorate('admission', {
+    // Current load per route class, for health reporting
+    stats() {
+      return Object.fromEntries(Object.entries(gates).map(([name, gate]) => [name, {
+        active: gate.active,
+        queued: gate.waiting.length,
+        concurrency: gate.concurrency,
+        queue: gate.queueLimit
+      }]));
+    }
+  });
+}
+
+export default fp(admissionPlugin, {
+  name: 'admission',
+  decorators: { fastify: ['authenticate'] }
+});
@@ -1,35 +1,135 @@
 import fp from 'fastify-plugin';
 import { Database } from 'arangojs';
 import {
-  ARANGO_URL,
+  ARANGO_URLS,
   ARANGO_DB_NAME,
   ARANGO_USERNAME,
   ARANGO_PASSWORD,
-  COLLECTION_NAMES
+  ARANGO_LOAD_BALANCING,
+  ARANGO_MAX_SOCKETS,
+  ARANGO_KEEP_ALIVE,
+  ARANGO_KEEP_ALIVE_MSECS,
+  ARANGO_MAX_RETRIES,
+  ARANGO_RETRY_ON_CONFLICT,
+  ARANGO_QUERY_TIMEOUT_MS,
+  TRACING_ENABLED,
+  CONTENT_LAYOUT,
+  COLLECTION_NAMES,
+  EDGE_COLLECTION_NAMES
 } from '../config/env.js';
+import {
+  CONTENT_KINDS,
+  VI_SEARCH_FIELDS,
+  SEARCH_VIEW_NAME,
+  SEARCH_ANALYZER_NAME
+} from '../config/contentKinds.js';
+import { currentSpan, withSpan, SPAN_KIND } from '../utils/tracer.js';
+
+// Characters of a dictionary type or version that may appear as is in a
+// collection name; others (including `_`, which separates the parts of the
+// name) are written as -<hex code>- so distinct versions get distinct names
+const encodeNamePart = part =>
+  [...part].map(ch => /[A-Za-z0-9]/.test(ch) ? ch : `-${ch.codePointAt(0).toString(16)}-`).join('');
+
+// Collection methods that make a request to ArangoDB, traced when tracing is enabled
+const TRACED_COLLECTION_METHODS = new Set([
+  'document', 'documents', 'documentExists', 'byExample', 'firstExample', 'lookupByKeys',
+  'save', 'saveAll', 'update', 'updateAll', 'replace', 'replaceAll',
+  'remove', 'removeAll', 'removeByExample', 'import', 'count', 'truncate', 'exists'
+]);
+
+// Attributes describing what a call returned: rows for arrays, query statistics for cursors
+function resultAttributes(result) {
+  if (Array.isArray(result)) {
+    return { 'db.response.returned_rows': result.length };
+  }
+  const stats = result?.extra?.stats;
+  return {
+    'db.response.returned_rows': result?.count,
+    'db.arangodb.writes_executed': stats?.writesExecuted,
+    'db.arangodb.scanned_index': stats?.scannedIndex,
+    'db.arangodb.scanned_full': stats?.scannedFull,
+    'db.arangodb.filtered': stats?.filtered,
+    'db.arangodb.peak_memory_bytes': stats?.peakMemoryUsage,
+  };
+}
+
+function traceCall(name, attributes, call) {
+  if (!currentSpan()) return call();
+  return withSpan(name, { 'db.system': 'arangodb', ...attributes }, async span => {
+    const result = await call();
+    span.setAttributes(resultAttributes(result));
+    return result;
+  }, SPAN_KIND.CLIENT);
+}
+
+function traceCollection(collection) {
+  return new Proxy(collection, {
+    get(target, property) {
+      const value = Reflect.get(target, property, target);
+      if (typeof value !== 'function' || !TRACED_COLLECTION_METHODS.has(property)) return value;
+      return (...args) => traceCall(`arangodb.${property}`, {
+        'db.operation.name': property,
+        'db.collection.name': target.name,
+        'dictionary.version': args[0]?.dictionary_version,
+      }, () => value.apply(target, args));
+    }
+  });
+}
 
 async function arangoPlugin(fastify, options) {
   fastify.log.info('Initializing ArangoDB connection...');
 
+  // Requests currently on the wire, for pool utilization reporting
+  const pool = { inFlight: 0, peakInFlight: 0, saturated: 0, requests: 0, errors: 0 };
+  const capacity = ARANGO_MAX_SOCKETS * ARANGO_URLS.length;
+
   const arangoConn = new Database({
-    url: ARANGO_URL,
+    url: ARANGO_URLS,
     auth: {
       username: ARANGO_USERNAME,
       password: ARANGO_PASSWORD,
     },
+    loadBalancingStrategy: ARANGO_LOAD_BALANCING,
+    maxRetries: ARANGO_MAX_RETRIES,
+    retryOnConflict: ARANGO_RETRY_ON_CONFLICT,
+    agentOptions: {
+      maxSockets: ARANGO_MAX_SOCKETS,
+      keepAlive: ARANGO_KEEP_ALIVE,
+      keepAliveMsecs: ARANGO_KEEP_ALIVE_MSECS,
+    },
+    beforeRequest: () => {
+      pool.requests++;
+      pool.inFlight++;
+      pool.peakInFlight = Math.max(pool.peakInFlight, pool.inFlight);
+      if (pool.inFlight >= capacity) pool.saturated++;
+    },
+    afterResponse: (err, res) => {
+      pool.inFlight--;
+      if (err) pool.errors++;
+
+      const span = TRACING_ENABLED && currentSpan();
+      if (span?.kind === SPAN_KIND.CLIENT && res?.body?.length) {
+        span.setAttribute('db.response.body.size', (span.attributes['db.response.body.size'] ?? 0) + res.body.length);
+      }
+    },
   });
 
   try {
-    const systemDb = arangoConn.database('_system');
-    const dbList = await systemDb.listDatabases();
+    // A database handed in by the caller (the benchmarks' fake) is used as is
+    let db = options.db;
+    if (!db) {
+      const systemDb = arangoConn.database('_system');
+      const dbList = await systemDb.listDatabases();
 
-    if (!dbList.includes(ARANGO_DB_NAME)) {
-      fastify.log.info(`Database '${ARANGO_DB_NAME}' does not exist. Creating it...`);
-      await systemDb.createDatabase(ARANGO_DB_NAME);
-      fastify.log.info(`Database '${ARANGO_DB_NAME}' created successfully.`);
-    }
+      if (!dbList.includes(ARANGO_DB_NAME)) {
+        fastify.log.info(`Database '${ARANGO_DB_NAME}' does not exist. Creating it...`);
+        await systemDb.createDatabase(ARANGO_DB_NAME);
+        fastify.log.info(`Database '${ARANGO_DB_NAME}' created successfully.`);
+      }
 
-    const db = arangoConn.database(ARANGO_DB_NAME);
+      db = arangoConn.database(ARANGO_DB_NAME);
+    }
 
     // Ensure collections exist
     const collectionNames = COLLECTION_NAMES;
@@ -45,6 +145,16 @@ async function arangoPlugin(fastify, options) {
       }
     }
 
+    // Ensure edge collections exist
+    for (const name of EDGE_COLLECTION_NAMES) {
+      const collection = db.collection(name);
+      if (!(await collection.exists())) {
+        fastify.log.info(`Edge collection '${name}' does not exist. Creating it...`);
+        await db.createEdgeCollection(name);
+        fastify.log.info(`Edge collection '${name}' created successfully.`);
+      }
+    }
+
     // Ensure indexes on key fields to optimize query performance and enforce uniqueness
     const indexDefinitions = [
       {
@@ -83,11 +193,125 @@ async function arangoPlugin(fastify, options) {
         unique: true,
         sparse: true
       },
+      {
+        // Reverse lookup from verification activities to verification items
+        collection: 'vnv',
+        fields: ['vas[*]'],
+        unique: false,
+        sparse: false
+      },
+      {
+        // Reverse lookup from verification activity collections to verification items
+        collection: 'vnv',
+        fields: ['vacs[*]'],
+        unique: false,
+        sparse: false
+      },
+      {
+        // Lookup from content names to the verification items referring to them
+        collection: 'vnv',
+        fields: ['referenced_names[*]'],
+        unique: false,
+        sparse: false
+      },
+      {
+        // Name lookups across dictionary versions when linking verification items
+        collection: 'command',
+        fields: ['command_stem'],
+        unique: false,
+        sparse: true
+      },
+      {
+        collection: 'channel',
+        fields: ['channel_name'],
+        unique: false,
+        sparse: true
+      },
+      {
+        collection: 'channel',
+        fields: ['channel_id'],
+        unique: false,
+        sparse: true
+      },
+      {
+        collection: 'evr',
+        fields: ['evr_name'],
+        unique: false,
+        sparse: true
+      },
+      {
+        collection: 'evr',
+        fields: ['evr_id'],
+        unique: false,
+        sparse: true
+      },
+      {
+        collection: 'vnv',
+        fields: ['vi_type'],
+        unique: false,
+        sparse: true
+      },
+      {
+        collection: 'vi_links',
+        fields: ['dictionary_type', 'dictionary_version', 'kind'],
+        unique: false,
+        sparse: false
+      },
+      {
+        // Incremental sync: changes of a dictionary version since a revision
+        collection: 'command',
+        fields: ['dictionary_type', 'dictionary_version', 'revision'],
+        unique: false,
+        sparse: false
+      },
+      {
+        collection: 'channel',
+        fields: ['dictionary_type', 'dictionary_version', 'revision'],
+        unique: false,
+        sparse: false
+      },
+      {
+        collection: 'evr',
+        fields: ['dictionary_type', 'dictionary_version', 'revision'],
+        unique: false,
+        sparse: false
+      },
+      {
+        collection: 'mil1553',
+        fields: ['dictionary_type', 'dictionary_version', 'revision'],
+        unique: false,
+        sparse: false
+      },
+      {
+        collection: 'content_tombstone',
+        fields: ['dictionary_type', 'dictionary_version', 'revision'],
+        unique: false,
+        sparse: false
+      },
+      {
+        // Shared enumeration sets are removed with their dictionary version
+        collection: 'enumeration_set',
+        fields: ['dictionary_type', 'dictionary_version'],
+        unique: false,
+        sparse: false
+      },
       {
         collection: 'custom_script',
         fields: ['script_id'],
         unique: true,
         sparse: true
+      },
+      {
+        collection: 'step_palette',
+        fields: ['step_type'],
+        unique: true,
+        sparse: true
+      },
+      {
+        collection: 'step_palette',
+        fields: ['step_id'],
+        unique: true,
+        sparse: true
       }
     ];
 
@@ -103,8 +327,185 @@ async function arangoPlugin(fastify, options) {
       });
     }
 
+    // Ensure the case-insensitive n-gram analyzer used for substring search
+    const analyzer = db.analyzer(SEARCH_ANALYZER_NAME);
+    if (!(await analyzer.exists())) {
+      fastify.log.info(`Analyzer '${SEARCH_ANALYZER_NAME}' does not exist. Creating it...`);
+      await analyzer.create({
+        type: 'pipeline',
+        properties: {
+          pipeline: [
+            { type: 'norm', properties: { locale: 'en', case: 'lower', accent: false } },
+            { type: 'ngram', properties: { min: 3, max: 3, preserveOriginal: true, streamType: 'utf8' } }
+          ]
+        },
+        features: ['frequency', 'norm', 'position']
+      });
+    }
+
+    // Ensure the ArangoSearch view spanning dictionary content and verification items
+    const searchLinks = {};
+    for (const kind of [...Object.values(CONTENT_KINDS), VI_SEARCH_FIELDS]) {
+      const fields = {};
+      for (const field of [kind.nameField, ...kind.textFields]) {
+        fields[field] = { analyzers: [SEARCH_ANALYZER_NAME] };
+      }
+      searchLinks[kind.collection] = {
+        analyzers: ['identity'],
+        includeAllFields: false,
+        fields: kind === VI_SEARCH_FIELDS
+          ? fields
+          : { ...fields, dictionary_type: {}, dictionary_version: {} }
+      };
+    }
+
+    const searchView = db.view(SEARCH_VIEW_NAME);
+    if (!(await searchView.exists())) {
+      fastify.log.info(`View '${SEARCH_VIEW_NAME}' does not exist. Creating it...`);
+      await db.createView(SEARCH_VIEW_NAME, { type: 'arangosearch', links: searchLinks });
+    } else {
+      await searchView.updateProperties({ links: searchLinks });
+    }
+
+    // Content collections. In the shared layout every version lives in the
+    // `command`, `evr`, `channel` and `mil1553` collections. In the per_version
+    // layout each dictionary type and version gets its own collections (e.g.
+    // `channel_flight_1-2e-2`), so queries of a version touch only its small
+    // indexes and deleting a version drops its collections.
+    const contentIndexes = indexDefinitions.filter(def => CONTENT_KINDS[def.collection]);
+
+    function contentCollectionName(kind, dictionary_type, dictionary_version) {
+      const { collection } = CONTENT_KINDS[kind];
+      return CONTENT_LAYOUT === 'per_version'
+        ? `${collection}_${encodeNamePart(dictionary_type)}_${encodeNamePart(dictionary_version)}`
+        : collection;
+    }
+
+    // Creates the collections, indexes and search view links of a version.
+    // Nothing is remembered between calls: another instance may have dropped
+    // the collections since, so their existence is checked every time.
+    async function ensureContentCollections(dictionary_type, dictionary_version) {
+      if (CONTENT_LAYOUT !== 'per_version') return;
+
+      const links = {};
+      for (const kind of Object.keys(CONTENT_KINDS)) {
+        const name = contentCollectionName(kind, dictionary_type, dictionary_version);
+        const collection = db.collection(name);
+        if (!(await collection.exists())) {
+          fastify.log.info(`Content collection '${name}' does not exist. Creating it...`);
+          await collection.create();
+        }
+        for (const def of contentIndexes.filter(def => def.collection === kind)) {
+          await collection.ensureIndex({ type: 'persistent', fields: def.fields, unique: def.unique, sparse: def.sparse });
+        }
+        links[name] = searchLinks[kind];
+      }
+      await searchView.updateProperties({ links });
+    }
+
+    // Drops the collections of a version; false in the shared layout, where
+    // the caller removes the version's documents instead
+    async function dropContentCollections(dictionary_type, dictionary_version) {
+      if (CONTENT_LAYOUT !== 'per_version') return false;
+      for (const kind of Object.keys(CONTENT_KINDS)) {
+        const collection = db.collection(contentCollectionName(kind, dictionary_type, dictionary_version));
+        if (await collection.exists()) await collection.drop();
+      }
+      return true;
+    }
+
+    // Names of the collections holding a kind of content, for all versions (of a type)
+    async function contentCollectionNames(kind, dictionary_type) {
+      const { collection } = CONTENT_KINDS[kind];
+      if (CONTENT_LAYOUT !== 'per_version') return [collection];
+      const prefix = dictionary_type ? `${collection}_${encodeNamePart(dictionary_type)}_` : `${collection}_`;
+      const existing = await db.listCollections();
+      return existing.map(({ name }) => name).filter(name => name.startsWith(prefix));
+    }
+
+    // AQL expression concatenating build(collectionBindParameter) over all
+    // collections of a kind, with the bind variables it needs
+    async function acrossVersions(kind, build, dictionary_type) {
+      const names = await contentCollectionNames(kind, dictionary_type);
+      const bindVars = {};
+      const parts = names.map((name, i) => {
+        bindVars[`@${kind}${i}`] = name;
+        return `(${build(`@@${kind}${i}`)})`;
+      });
+      return { expression: parts.length > 0 ? `FLATTEN([${parts.join(', ')}])` : '[]', bindVars };
+    }
+
+    // Content kind stored in a collection
+    function contentKindOf(name) {
+      return name.split('_')[0];
+    }
+
+    if (CONTENT_LAYOUT === 'per_version') {
+      const cursor = await db.query('FOR d IN dictionary RETURN [d.dictionary_type, d.dictionary_version]');
+      for (const [dictionary_type, dictionary_version] of await cursor.all()) {
+        await ensureContentCollections(dictionary_type, dictionary_version);
+      }
+    }
+
+    // Apply the default query time limit unless a query sets its own
+    if (ARANGO_QUERY_TIMEOUT_MS > 0) {
+      const query = db.query.bind(db);
+      const limits = { timeout: ARANGO_QUERY_TIMEOUT_MS, maxRuntime: ARANGO_QUERY_TIMEOUT_MS / 1000 };
+      db.query = (aqlQuery, bindVarsOrOptions, options) => typeof aqlQuery === 'string'
+        ? query(aqlQuery, bindVarsOrOptions, { ...limits, ...options })
+        : query(aqlQuery, { ...limits, ...bindVarsOrOptions });
+    }
+
+    // Give every query and collection call its own span in traced requests
+    if (TRACING_ENABLED) {
+      const query = db.query.bind(db);
+      db.query = (aqlQuery, bindVars, options) => {
+        const text = typeof aqlQuery === 'string' ? aqlQuery : aqlQuery?.query;
+        const vars = typeof aqlQuery === 'string' ? bindVars : aqlQuery?.bindVars;
+        return traceCall('arangodb.query', {
+          'db.operation.name': 'query',
+          'db.query.text': text?.replace(/\s+/g, ' ').trim().slice(0, 2000),
+          'db.collection.name': vars?.['@collection']?.name ?? vars?.['@collection'],
+          'dictionary.version': vars?.dictionary_version,
+        }, () => query(aqlQuery, bindVars, options));
+      };
+
+      const collection = db.collection.bind(db);
+      db.collection = name => traceCollection(collection(name));
+    }
+
     fastify.decorate('db', db);
 
+    fastify.decorate('contentCollections', {
+      layout: CONTENT_LAYOUT,
+      name: contentCollectionName,
+      collection: (kind, dictionary_type, dictionary_version) =>
+        db.collection(contentCollectionName(kind, dictionary_type, dictionary_version)),
+      names: contentCollectionNames,
+      acrossVersions,
+      kindOf: contentKindOf,
+      ensure: ensureContentCollections,
+      drop: dropContentCollections,
+    });
+
+    fastify.decorate('dbPool', {
+      stats() {
+        return {
+          coordinators: ARANGO_URLS.length,
+          load_balancing: ARANGO_LOAD_BALANCING,
+          max_sockets: ARANGO_MAX_SOCKETS,
+          keep_alive: ARANGO_KEEP_ALIVE,
+          in_flight: pool.inFlight,
+          peak_in_flight: pool.peakInFlight,
+          utilization: pool.inFlight / capacity,
+          saturated: pool.saturated,
+          requests: pool.requests,
+          errors: pool.errors,
+          server_queue_time_ms: (db.queueTime?.getAvg() ?? 0) * 1000,
+        };
+      }
+    });
+
     fastify.addHook('onClose', async (instance, done) => {
       fastify.log.info('Closing ArangoDB connection...');
       db.close?.(); // Optional chaining in case close isn't defined
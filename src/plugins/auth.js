@@ -1,6 +1,24 @@
 // auth.js
+import { randomUUID } from 'node:crypto';
 import fp from 'fastify-plugin';
 import jwt from 'jsonwebtoken';
+import { RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST } from '../config/env.js';
+import { withSpan } from '../utils/tracer.js';
+
+// Verified tokens are remembered briefly so that bursts of requests carrying
+// the same token (e.g. the sub-requests of a batch) verify its signature once.
+const TOKEN_CACHE_TTL_MS = 60 * 1000;
+const TOKEN_CACHE_MAX_ENTRIES = 1000;
+
+// Request rates are tracked per user in token buckets of RATE_LIMIT_BURST
+// requests that refill at RATE_LIMIT_PER_SECOND.
+const RATE_LIMIT_MAX_USERS = 10000;
+
+// Requests a batch injects into the router on behalf of the user it
+// authenticated carry a grant in this header instead of the user's token.
+// Grants are random, held in memory only while their batch runs, and
+// checked before anything else, so the header cannot be forged from outside.
+export const SUB_REQUEST_HEADER = 'x-batch-grant';
 
 async function authPlugin(fastify, options) {
   const { secret } = options;
@@ -9,8 +27,78 @@ async function authPlugin(fastify, options) {
     throw new Error('Secret must be provided for auth plugin');
   }
 
-  // Add an authentication decorator
+  const verifiedTokens = new Map();
+  const rateLimit = options.rateLimit ?? { perSecond: RATE_LIMIT_PER_SECOND, burst: RATE_LIMIT_BURST };
+  const buckets = new Map();
+  const grants = new Map();     // grant -> user of the batch that issued it
+
+  function verify(token, span) {
+    const now = Date.now();
+    const cached = verifiedTokens.get(token);
+    span.setAttribute('auth.token_cached', Boolean(cached && cached.expiresAt > now));
+    if (cached && cached.expiresAt > now) {
+      return cached.decoded;
+    }
+    verifiedTokens.delete(token);
+
+    const decoded = jwt.verify(token, secret);
+
+    // Never cache beyond the token's own expiry
+    const expiresAt = Math.min(now + TOKEN_CACHE_TTL_MS, decoded.exp ? decoded.exp * 1000 : Infinity);
+    if (verifiedTokens.size >= TOKEN_CACHE_MAX_ENTRIES) {
+      verifiedTokens.delete(verifiedTokens.keys().next().value);
+    }
+    verifiedTokens.set(token, { decoded, expiresAt });
+
+    return decoded;
+  }
+
+  // Takes one request from the user's bucket; returns the seconds to wait when it is empty
+  function throttle(user) {
+    if (!(rateLimit.perSecond > 0)) return 0;
+
+    const now = Date.now();
+    let bucket = buckets.get(user);
+    if (bucket) {
+      bucket.tokens = Math.min(rateLimit.burst, bucket.tokens + (now - bucket.updatedAt) / 1000 * rateLimit.perSecond);
+      bucket.updatedAt = now;
+    } else {
+      if (buckets.size >= RATE_LIMIT_MAX_USERS) {
+        buckets.delete(buckets.keys().next().value);
+      }
+      bucket = { tokens: rateLimit.burst, updatedAt: now };
+      buckets.set(user, bucket);
+    }
+
+    if (bucket.tokens < 1) {
+      return Math.ceil((1 - bucket.tokens) / rateLimit.perSecond);
+    }
+    bucket.tokens -= 1;
+    return 0;
+  }
+
+  // Issues a grant that authenticates sub-requests as `user` until revoked
+  fastify.decorate('grantSubRequests', function (user) {
+    const grant = randomUUID();
+    grants.set(grant, user);
+    return { grant, revoke: () => grants.delete(grant) };
+  });
+
+  // Add an authentication decorator. A request authenticated earlier in its
+  // lifecycle (by admission control) is not verified or counted again, and
+  // the sub-requests of a batch take the identity the batch was granted.
   fastify.decorate('authenticate', async function (request, reply) {
+    if (request.user) return;
+
+    const grant = request.headers[SUB_REQUEST_HEADER];
+    if (grant !== undefined) {
+      if (!grants.has(grant)) {
+        return reply.code(401).send({ message: 'Invalid or expired token' });
+      }
+      request.user = grants.get(grant);
+      return;
+    }
+
     try {
       const authHeader = request.headers.authorization;
 
@@ -21,13 +109,19 @@ async function authPlugin(fastify, options) {
       const token = authHeader.slice(7); // remove "Bearer "
 
       // Verify the token (you can replace this logic with your own)
-      const decoded = jwt.verify(token, secret);
+      const decoded = withSpan('auth.verify_token', undefined, span => verify(token, span));
 
       // Attach user info to request
       request.user = decoded;
     } catch (err) {
       return reply.code(401).send({ message: 'Invalid or expired token' });
     }
+
+    const retryAfter = throttle(request.user.username ?? request.user.sub ?? request.headers.authorization);
+    if (retryAfter > 0) {
+      reply.header('retry-after', retryAfter);
+      return reply.code(429).send({ message: 'Rate limit exceeded. Retry later.' });
+    }
   });
 }
 
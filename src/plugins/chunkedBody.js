@@ -0,0 +1,76 @@
+import fp from 'fastify-plugin';
+import { ajv } from '../utils/ajv.js';
+import { forEachChunk } from '../utils/chunked.js';
+
+const kItemValidator = Symbol('itemValidator');
+
+// Validates large array bodies without blocking the event loop. For routes
+// declaring `config: { chunkedBody: true }`, schema validation only checks
+// that the body is an array of acceptable length; its items are validated
+// against the body's `items` schema a chunk at a time once the request is
+// authenticated, yielding between chunks. Failures are reported exactly like
+// Fastify's validation errors. The full body schema stays in the route for
+// the API documentation.
+async function chunkedBodyPlugin(fastify, options) {
+
+  function shallowBodyValidator(bodySchema) {
+    const { items, ...arraySchema } = bodySchema;
+    const validateArray = ajv.compile(arraySchema);
+    const validateItem = ajv.compile(items ?? {});
+
+    const validate = body => validateArray(body)
+      ? true
+      : { error: validationError(validateArray.errors, '') };
+    validate[kItemValidator] = validateItem;
+    return validate;
+  }
+
+  function validationError(errors, pathPrefix) {
+    const details = errors.map(error => ({ ...error, instancePath: `${pathPrefix}${error.instancePath}` }));
+    const error = new Error(details.map(detail => `body${detail.instancePath} ${detail.message}`).join(', '));
+    error.statusCode = 400;
+    error.validation = details;
+    error.validationContext = 'body';
+    return error;
+  }
+
+  fastify.addHook('onRoute', routeOptions => {
+    if (!routeOptions.config?.chunkedBody) return;
+
+    const bodySchema = routeOptions.schema?.body;
+    if (bodySchema?.type !== 'array') {
+      throw new Error(`chunkedBody requires an array body schema for ${routeOptions.url}`);
+    }
+
+    let validateItem;
+    const routeCompiler = routeOptions.validatorCompiler;
+    routeOptions.validatorCompiler = ({ schema, httpPart, ...rest }) => {
+      if (httpPart === 'body') {
+        const validate = shallowBodyValidator(schema);
+        validateItem = validate[kItemValidator];
+        return validate;
+      }
+      return routeCompiler ? routeCompiler({ schema, httpPart, ...rest }) : ajv.compile(schema);
+    };
+
+    async function validateItems(request, reply) {
+      await forEachChunk(request.body, (chunk, offset) => {
+        for (let i = 0; i < chunk.length; i++) {
+          if (!validateItem(chunk[i])) {
+            throw validationError(validateItem.errors, `/${offset + i}`);
+          }
+        }
+      });
+    }
+
+    // Run after the route's own preHandlers so unauthenticated bodies are never walked
+    const preHandlers = routeOptions.preHandler
+      ? [].concat(routeOptions.preHandler)
+      : [];
+    routeOptions.preHandler = [...preHandlers, validateItems];
+  });
+}
+
+export default fp(chunkedBodyPlugin, {
+  name: 'chunked-body'
+});
@@ -0,0 +1,89 @@
+import fp from 'fastify-plugin';
+import { promisify } from 'node:util';
+import zlib from 'node:zlib';
+import { COMPRESSION_THRESHOLD } from '../config/env.js';
+import { parseAcceptHeader, acceptQuality } from '../utils/accept.js';
+
+const brotliCompress = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+// Supported encodings, in order of preference when the client rates them equally.
+// Brotli runs at a moderate quality: the top levels cost far more CPU per
+// response than they save in bytes.
+const ENCODINGS = [
+  {
+    name: 'br',
+    compress: payload => brotliCompress(payload, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: 5,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: payload.length
+      }
+    })
+  },
+  {
+    name: 'gzip',
+    compress: payload => gzip(payload, { level: 6 })
+  }
+];
+
+// Picks the best encoding the client accepts, or null for identity
+export function negotiateEncoding(acceptEncoding) {
+  const accepted = parseAcceptHeader(acceptEncoding);
+  let best = null;
+  let bestQuality = 0;
+  for (const encoding of ENCODINGS) {
+    const quality = acceptQuality(accepted, encoding.name);
+    if (quality > bestQuality) {
+      best = encoding;
+      bestQuality = quality;
+    }
+  }
+  return best;
+}
+
+// Compresses serialized responses with brotli or gzip, as negotiated via
+// Accept-Encoding, once they reach the size threshold. Streams and replies
+// that already carry a Content-Encoding (e.g. prebuilt artifacts) are sent
+// untouched.
+async function compressionPlugin(fastify, options) {
+  const threshold = options.threshold ?? COMPRESSION_THRESHOLD;
+
+  fastify.addHook('onSend', async (request, reply, payload) => {
+    if (payload === null || payload === undefined || request.method === 'HEAD') {
+      return payload;
+    }
+    if (typeof payload !== 'string' && !Buffer.isBuffer(payload)) {
+      return payload;
+    }
+    if (reply.hasHeader('content-encoding') || reply.statusCode === 204 || reply.statusCode === 304) {
+      return payload;
+    }
+
+    reply.header('vary', appendVary(reply.getHeader('vary')));
+
+    const length = Buffer.byteLength(payload);
+    if (length < threshold) {
+      return payload;
+    }
+
+    const encoding = negotiateEncoding(request.headers['accept-encoding']);
+    if (!encoding) {
+      return payload;
+    }
+
+    const compressed = await encoding.compress(typeof payload === 'string' ? Buffer.from(payload) : payload);
+    reply.header('content-encoding', encoding.name);
+    reply.removeHeader('content-length');
+    return compressed;
+  });
+}
+
+function appendVary(vary) {
+  if (!vary) return 'Accept-Encoding';
+  const values = String(vary).split(',').map(value => value.trim().toLowerCase());
+  return values.includes('accept-encoding') || values.includes('*') ? vary : `${vary}, Accept-Encoding`;
+}
+
+export default fp(compressionPlugin, {
+  name: 'compression'
+});
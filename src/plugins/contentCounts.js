@@ -0,0 +1,122 @@
+import fp from 'fastify-plugin';
+import { CONTENT_COLLECTION_NAMES } from '../config/env.js';
+
+// Per-(collection, dictionary_type, dictionary_version) document counts.
+// Counts live on the dictionary document under `content_counts` so every
+// replica sees the same numbers; create/delete handlers keep them current.
+async function contentCountsPlugin(fastify, options) {
+
+  // Adjust the tracked count by `delta`. Versions whose count for this
+  // collection was never initialised are left alone and backfilled on read.
+  // Called after the documents are written, so it never fails the write: if
+  // the count cannot be adjusted it is untracked, to be counted again on read.
+  async function adjust(collection, dictionary_type, dictionary_version, delta) {
+    if (!delta) return;
+
+    const query = `
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+          AND HAS(d.content_counts, @collection)
+        UPDATE d WITH {
+          content_counts: { [@collection]: MAX([d.content_counts[@collection] + @delta, 0]) }
+        } IN dictionary
+    `;
+    try {
+      await fastify.db.query(query, { dictionary_type, dictionary_version, collection, delta });
+    } catch (err) {
+      fastify.log.error(err, `Failed to adjust ${collection} count of ${dictionary_type} ${dictionary_version}; it will be recounted`);
+      await untrack(collection, dictionary_type, dictionary_version)
+        .catch(untrackErr => fastify.log.error(untrackErr, `Failed to untrack ${collection} count of ${dictionary_type} ${dictionary_version}`));
+    }
+  }
+
+  // Drops the stored count so the next read backfills it
+  async function untrack(collection, dictionary_type, dictionary_version) {
+    await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+        UPDATE d WITH { content_counts: { [@collection]: null } } IN dictionary OPTIONS { keepNull: false }
+    `, { dictionary_type, dictionary_version, collection });
+  }
+
+  // Count the documents of a version once and store the result
+  async function backfill(collection, dictionary_type, dictionary_version) {
+    const query = `
+      LET total = FIRST(
+        FOR doc IN @@col
+          FILTER doc.dictionary_type == @dictionary_type
+            AND doc.dictionary_version == @dictionary_version
+          COLLECT WITH COUNT INTO c
+          RETURN c
+      )
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+        UPDATE d WITH { content_counts: { [@collection]: total } } IN dictionary
+        RETURN total
+    `;
+    const cursor = await fastify.db.query(query, {
+      '@col': fastify.contentCollections.name(collection, dictionary_type, dictionary_version),
+      collection,
+      dictionary_type,
+      dictionary_version
+    });
+    return (await cursor.next()) ?? 0;
+  }
+
+  // Returns the number of documents in a version, or 0 if the dictionary does not exist
+  async function get(collection, dictionary_type, dictionary_version) {
+    const query = `
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+        RETURN { tracked: HAS(d.content_counts, @collection), count: d.content_counts[@collection] }
+    `;
+    const cursor = await fastify.db.query(query, { dictionary_type, dictionary_version, collection });
+    const entry = await cursor.next();
+
+    if (!entry) return 0;
+    if (entry.tracked) return entry.count;
+    return backfill(collection, dictionary_type, dictionary_version);
+  }
+
+  // Initial value for `content_counts` on a newly created dictionary
+  function initial() {
+    return Object.fromEntries(CONTENT_COLLECTION_NAMES.map(name => [name, 0]));
+  }
+
+  // Runs a paged list query and works out the x-total-count value.
+  //   count=exact    -> cached count when unfiltered, fullCount otherwise (default)
+  //   count=estimate -> cached count when unfiltered, lower bound from the page otherwise
+  //   count=none     -> no total is computed
+  async function queryPage({ collection, dictionary_type, dictionary_version, aqlQuery, bindVars, filtered, count = 'exact', offset = 0, limit }) {
+    const fullCount = filtered && count === 'exact';
+    const useCached = !filtered && count !== 'none';
+
+    const [cursor, cachedTotal] = await Promise.all([
+      fastify.db.query(aqlQuery, bindVars, { fullCount }),
+      useCached ? get(collection, dictionary_type, dictionary_version) : null
+    ]);
+    const items = await cursor.all();
+
+    let totalCount = null;
+    if (fullCount) {
+      totalCount = cursor.extra?.stats?.fullCount ?? items.length;
+    } else if (useCached) {
+      totalCount = cachedTotal;
+    } else if (count === 'estimate') {
+      totalCount = offset + items.length + (items.length === limit ? 1 : 0);
+    }
+
+    return { items, totalCount };
+  }
+
+  fastify.decorate('contentCounts', { adjust, get, initial, queryPage });
+}
+
+export default fp(contentCountsPlugin, {
+  name: 'content-counts',
+  dependencies: ['fastify-arangodb']
+});
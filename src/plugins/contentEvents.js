@@ -0,0 +1,37 @@
+import fp from 'fastify-plugin';
+
+// In-process notifications about writes, used to keep derived data
+// (artifacts, caches, indexes) in step with the database.
+//
+//   'content'       { collection, dictionary_type, dictionary_version, op, documents, previous }
+//   'dictionary'    { dictionary_type, dictionary_version, op, state, previousState }
+//   'custom_script' { op, documents, previous }
+//   'vi'            { op, documents, previous }
+//
+// `op` is one of 'insert', 'update' or 'delete'. For updates `previous` holds
+// the documents as they were before the write.
+async function contentEventsPlugin(fastify, options) {
+  const listeners = new Map();
+
+  function on(event, listener) {
+    if (!listeners.has(event)) listeners.set(event, []);
+    listeners.get(event).push(listener);
+  }
+
+  // Listeners run synchronously; a failing listener never fails the write that triggered it
+  function emit(event, payload) {
+    for (const listener of listeners.get(event) ?? []) {
+      try {
+        listener(payload);
+      } catch (err) {
+        fastify.log.error(err, `Listener for '${event}' event failed`);
+      }
+    }
+  }
+
+  fastify.decorate('contentEvents', { on, emit });
+}
+
+export default fp(contentEventsPlugin, {
+  name: 'content-events'
+});
@@ -0,0 +1,211 @@
+import fp from 'fastify-plugin';
+import { BODY_CHUNK_SIZE } from '../config/env.js';
+import { CONTENT_KINDS, CONTENT_TOMBSTONE_COLLECTION } from '../config/contentKinds.js';
+import { forEachChunk } from '../utils/chunked.js';
+
+// Stamps every write to dictionary content with a revision number that
+// increases per dictionary version, and records deletions as tombstones, so
+// replicas can fetch only what changed since the revision they hold.
+//
+// Revisions are allocated atomically on the dictionary document
+// (`revision_seq`), so writes from any number of service instances never
+// share one. A write is listed in `revisions_in_progress` until it ends.
+// `revision` is the committed watermark: the highest revision at or below
+// which every write has ended, so a reader that sees revision N also sees
+// every document stamped N or lower. A write whose instance stopped before
+// ending it stops holding the watermark back after WRITE_LEASE_MS.
+const WRITE_LEASE_MS = 15 * 60 * 1000;
+
+async function contentRevisionsPlugin(fastify, options) {
+  const writeLeaseMs = options.writeLeaseMs ?? WRITE_LEASE_MS;
+
+  async function currentRevision(dictionary_type, dictionary_version) {
+    const cursor = await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type AND d.dictionary_version == @dictionary_version
+        RETURN d.revision
+    `, { dictionary_type, dictionary_version });
+    return (await cursor.next()) ?? 0;
+  }
+
+  // Identifies the written state of a version: it changes whenever a write
+  // starts or ends, also while the watermark is held back by an earlier write.
+  // Null when the dictionary does not exist.
+  async function stamp(dictionary_type, dictionary_version) {
+    const cursor = await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type AND d.dictionary_version == @dictionary_version
+        RETURN CONCAT_SEPARATOR('/', NOT_NULL(d.revision_seq, d.revision, 0), LENGTH(NOT_NULL(d.revisions_in_progress, [])))
+    `, { dictionary_type, dictionary_version });
+    return (await cursor.next()) ?? null;
+  }
+
+  async function begin(dictionary_type, dictionary_version) {
+    const cursor = await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type AND d.dictionary_version == @dictionary_version
+        LET revision = NOT_NULL(d.revision_seq, d.revision, 0) + 1
+        UPDATE d WITH {
+          revision_seq: revision,
+          revisions_in_progress: APPEND(NOT_NULL(d.revisions_in_progress, []), [{ revision, started_at: DATE_NOW() }])
+        } IN dictionary OPTIONS { exclusive: true }
+        RETURN revision
+    `, { dictionary_type, dictionary_version });
+    const revision = await cursor.next();
+    if (revision === undefined) {
+      throw new Error(`Dictionary type "${dictionary_type}" and version "${dictionary_version}" does not exist.`);
+    }
+    return revision;
+  }
+
+  // Ends a write and moves the watermark up to just below the oldest write still running
+  async function end(dictionary_type, dictionary_version, revision) {
+    await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type AND d.dictionary_version == @dictionary_version
+        LET running = (
+          FOR w IN NOT_NULL(d.revisions_in_progress, [])
+            FILTER w.revision != @revision AND w.started_at > DATE_NOW() - @writeLeaseMs
+            RETURN w
+        )
+        UPDATE d WITH {
+          revisions_in_progress: running,
+          revision: MAX([NOT_NULL(d.revision, 0), LENGTH(running) > 0 ? MIN(running[*].revision) - 1 : d.revision_seq])
+        } IN dictionary OPTIONS { exclusive: true }
+    `, { dictionary_type, dictionary_version, revision, writeLeaseMs });
+  }
+
+  // Runs fn(revision) as a new write to a dictionary version
+  async function write(dictionary_type, dictionary_version, fn) {
+    const revision = await begin(dictionary_type, dictionary_version);
+    try {
+      return await fn(revision);
+    } finally {
+      await end(dictionary_type, dictionary_version, revision);
+    }
+  }
+
+  // Inserts new documents of one dictionary version, as one revision per
+  // chunk so that no single write holds the watermark back for long
+  async function saveAll(collection, dictionary_type, dictionary_version, documents) {
+    const results = [];
+    await forEachChunk(documents, chunk => write(dictionary_type, dictionary_version, async revision => {
+      for (const doc of chunk) doc.revision = revision;
+      results.push(...await collection.saveAll(chunk, { returnNew: true }));
+    }));
+    return results;
+  }
+
+  function update(collection, existingDoc, patch, options) {
+    const { dictionary_type, dictionary_version } = existingDoc;
+    return write(dictionary_type, dictionary_version, revision =>
+      collection.update(existingDoc._key, { ...patch, revision }, { ...options, returnNew: true }));
+  }
+
+  function remove(collection, existingDoc) {
+    const { dictionary_type, dictionary_version } = existingDoc;
+    return write(dictionary_type, dictionary_version, async revision => {
+      const kind = fastify.contentCollections.kindOf(collection.name);
+      await fastify.db.collection(CONTENT_TOMBSTONE_COLLECTION).save({
+        dictionary_type,
+        dictionary_version,
+        collection: kind,
+        key: existingDoc._key,
+        name: existingDoc[CONTENT_KINDS[kind].nameField],
+        revision
+      });
+      return collection.remove(existingDoc._key);
+    });
+  }
+
+  // Removes the content written at any of `revisions`, e.g. to undo a failed
+  // import, as a new write that records tombstones for it. Calls
+  // onRemoved(kind, documents) for every batch removed.
+  function removeWritten(dictionary_type, dictionary_version, revisions, onRemoved) {
+    return write(dictionary_type, dictionary_version, async revision => {
+      for (const [kind, { nameField }] of Object.entries(CONTENT_KINDS)) {
+        const cursor = await fastify.db.query(`
+          FOR doc IN @@col
+            FILTER doc.dictionary_type == @dictionary_type
+              AND doc.dictionary_version == @dictionary_version
+              AND doc.revision IN @revisions
+            REMOVE doc IN @@col
+            RETURN OLD
+        `, {
+          '@col': fastify.contentCollections.name(kind, dictionary_type, dictionary_version),
+          dictionary_type,
+          dictionary_version,
+          revisions
+        }, { batchSize: BODY_CHUNK_SIZE });
+
+        for await (const removed of cursor.batches) {
+          await fastify.db.collection(CONTENT_TOMBSTONE_COLLECTION).saveAll(removed.map(doc => ({
+            dictionary_type,
+            dictionary_version,
+            collection: kind,
+            key: doc._key,
+            name: doc[nameField],
+            revision
+          })));
+          await onRemoved(kind, removed);
+        }
+      }
+    });
+  }
+
+  // Content written before revisions were introduced has none, so the change
+  // feed would never return it. Stamp it, one new revision per BODY_CHUNK_SIZE
+  // documents, so clients syncing from any revision receive it.
+  async function backfill() {
+    const versionsCursor = await fastify.db.query(`
+      FOR d IN dictionary
+        RETURN { dictionary_type: d.dictionary_type, dictionary_version: d.dictionary_version }
+    `);
+    let stamped = 0;
+
+    for await (const { dictionary_type, dictionary_version } of versionsCursor) {
+      const collections = Object.keys(CONTENT_KINDS)
+        .map(kind => fastify.contentCollections.name(kind, dictionary_type, dictionary_version));
+      const unstamped = async collection => {
+        const cursor = await fastify.db.query(`
+          FOR doc IN @@col
+            FILTER doc.dictionary_type == @dictionary_type
+              AND doc.dictionary_version == @dictionary_version
+              AND doc.revision == null
+            LIMIT 1
+            RETURN 1
+        `, { '@col': collection, dictionary_type, dictionary_version });
+        return Boolean(await cursor.next());
+      };
+
+      for (const collection of collections) {
+        while (await unstamped(collection)) {
+          await write(dictionary_type, dictionary_version, async revision => {
+            const cursor = await fastify.db.query(`
+              FOR doc IN @@col
+                FILTER doc.dictionary_type == @dictionary_type
+                  AND doc.dictionary_version == @dictionary_version
+                  AND doc.revision == null
+                LIMIT @limit
+                UPDATE doc WITH { revision: @revision } IN @@col
+                COLLECT WITH COUNT INTO count
+                RETURN count
+            `, { '@col': collection, dictionary_type, dictionary_version, revision, limit: BODY_CHUNK_SIZE });
+            stamped += (await cursor.next()) ?? 0;
+          });
+        }
+      }
+    }
+
+    if (stamped > 0) fastify.log.info(`Stamped ${stamped} content document(s) written before revisions with a revision`);
+  }
+
+  fastify.addHook('onReady', backfill);
+
+  fastify.decorate('contentRevisions', { write, saveAll, update, remove, removeWritten, currentRevision, stamp });
+}
+
+export default fp(contentRevisionsPlugin, {
+  name: 'content-revisions',
+  dependencies: ['fastify-arangodb']
+});
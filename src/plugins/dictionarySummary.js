@@ -0,0 +1,113 @@
+import fp from 'fastify-plugin';
+import { PUBLISHED_STATES } from '../config/env.js';
+import { CONTENT_KINDS } from '../config/contentKinds.js';
+
+// Per-version summary statistics: the number of elements of each content
+// kind, and how many of them have each value of the kind's summary fields
+// (operations category, command type, EVR level, channel type).
+//
+// The summary is computed with COLLECT aggregations and stored on the
+// dictionary document under `summary`, tagged with the content revision it
+// was computed at. Every content write advances the revision, so a stored
+// summary is current exactly when its revision matches the dictionary's;
+// stale summaries are recomputed on the next read. Versions are summarized
+// as they are published, so reads of published versions fetch one document.
+async function dictionarySummaryPlugin(fastify, options) {
+  const pending = new Map();    // versionKey@revision -> Promise<summary>
+
+  const versionKey = (dictionary_type, dictionary_version) => `${dictionary_type}\u0000${dictionary_version}`;
+
+  // Element counts of one kind, in total and by value of each summary field
+  async function countKind(kind, dictionary_type, dictionary_version) {
+    const cursor = await fastify.db.query(`
+      RETURN {
+        total: FIRST(
+          FOR doc IN @@col
+            FILTER doc.dictionary_type == @dictionary_type
+              AND doc.dictionary_version == @dictionary_version
+            COLLECT WITH COUNT INTO count
+            RETURN count
+        ),
+        by: ZIP(@fields, (
+          FOR field IN @fields
+            LET groups = (
+              FOR doc IN @@col
+                FILTER doc.dictionary_type == @dictionary_type
+                  AND doc.dictionary_version == @dictionary_version
+                COLLECT value = doc[field] WITH COUNT INTO count
+                RETURN [TO_STRING(value), count]
+            )
+            RETURN ZIP(groups[*][0], groups[*][1])
+        ))
+      }
+    `, {
+      '@col': fastify.contentCollections.name(kind, dictionary_type, dictionary_version),
+      fields: CONTENT_KINDS[kind].summaryFields,
+      dictionary_type,
+      dictionary_version
+    });
+    return cursor.next();
+  }
+
+  // Computes the summary of a version at `revision` and stores it, unless
+  // the version was written to in the meantime
+  async function compute(dictionary_type, dictionary_version, revision) {
+    const started = Date.now();
+    const content = {};
+    await Promise.all(Object.keys(CONTENT_KINDS).map(async kind => {
+      content[kind] = await countKind(kind, dictionary_type, dictionary_version);
+    }));
+    const summary = { revision, computed_at: new Date().toISOString(), content };
+
+    // mergeObjects: false replaces the previous summary instead of merging into it
+    await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+          AND NOT_NULL(d.revision, 0) == @revision
+        UPDATE d WITH { summary: @summary } IN dictionary OPTIONS { mergeObjects: false }
+    `, { dictionary_type, dictionary_version, revision, summary });
+
+    fastify.log.info(
+      `Computed summary of ${dictionary_type} ${dictionary_version} at revision ${revision} in ${Date.now() - started}ms`
+    );
+    return summary;
+  }
+
+  // Returns the current summary of a version, or null if the dictionary does not exist
+  async function get(dictionary_type, dictionary_version) {
+    const cursor = await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+        RETURN { revision: NOT_NULL(d.revision, 0), summary: d.summary }
+    `, { dictionary_type, dictionary_version });
+    const entry = await cursor.next();
+
+    if (!entry) return null;
+    if (entry.summary?.revision === entry.revision) return entry.summary;
+
+    // Concurrent readers of the same stale version share one computation
+    const key = `${versionKey(dictionary_type, dictionary_version)}@${entry.revision}`;
+    if (!pending.has(key)) {
+      pending.set(key, compute(dictionary_type, dictionary_version, entry.revision)
+        .finally(() => pending.delete(key)));
+    }
+    return pending.get(key);
+  }
+
+  fastify.contentEvents.on('dictionary', ({ dictionary_type, dictionary_version, op, state, previousState }) => {
+    if (op === 'delete' || !PUBLISHED_STATES.includes(state) || PUBLISHED_STATES.includes(previousState)) return;
+
+    // Newly published: store its summary in the background
+    get(dictionary_type, dictionary_version)
+      .catch(err => fastify.log.error(err, `Failed to summarize ${dictionary_type} ${dictionary_version}`));
+  });
+
+  fastify.decorate('dictionarySummary', { get });
+}
+
+export default fp(dictionarySummaryPlugin, {
+  name: 'dictionary-summary',
+  dependencies: ['fastify-arangodb', 'content-events']
+});
@@ -0,0 +1,124 @@
+import fp from 'fastify-plugin';
+import { createHash } from 'node:crypto';
+import { ENUMERATION_STORAGE } from '../config/env.js';
+import { ENUMERATION_SET_COLLECTION } from '../config/contentKinds.js';
+import { forEachChunk } from '../utils/chunked.js';
+import { TtlCache } from '../utils/ttlCache.js';
+
+// Sets are content addressed and never change, so they can stay cached long
+const SET_CACHE_TTL_MS = 60 * 60 * 1000;
+const SET_CACHE_MAX_ENTRIES = 20000;
+
+// Shared enumeration tables for channels and mil1553 variables.
+//
+// Thousands of elements of a flight dictionary repeat the same few
+// enumeration tables (ON/OFF, modes). With ENUMERATION_STORAGE=shared each
+// distinct table is stored once per dictionary version in `enumeration_set`,
+// keyed by the hash of its contents, and elements keep only that hash in
+// `enumerations_ref`. Readers ask for `expand=enumerations` to get the
+// embedded form back. Sets are removed together with their version.
+async function enumerationSetsPlugin(fastify, options) {
+  const storage = options.storage ?? ENUMERATION_STORAGE;
+  const setCollection = fastify.db.collection(ENUMERATION_SET_COLLECTION);
+  const cache = new TtlCache({ ttlMs: SET_CACHE_TTL_MS, maxEntries: SET_CACHE_MAX_ENTRIES });
+
+  const hashOf = enumerations => createHash('sha1').update(JSON.stringify(enumerations)).digest('hex');
+  const setKey = (dictionary_type, dictionary_version, hash) =>
+    createHash('sha1').update(`${dictionary_type}\u0000${dictionary_version}\u0000${hash}`).digest('hex');
+
+  // Replaces the enumerations of documents about to be written by references
+  // to shared sets, saving sets not stored yet. Documents are changed in place.
+  // Sets are always saved (ignoring those already stored) rather than skipped
+  // when cached: the version may have been deleted and recreated elsewhere.
+  async function share(dictionary_type, dictionary_version, documents) {
+    if (storage !== 'shared') return documents;
+
+    const sets = new Map();
+    await forEachChunk(documents, chunk => {
+      for (const doc of chunk) {
+        if (!Array.isArray(doc.enumerations) || doc.enumerations.length === 0) continue;
+        const hash = hashOf(doc.enumerations);
+        if (!sets.has(hash)) sets.set(hash, doc.enumerations);
+        doc.enumerations_ref = hash;
+        delete doc.enumerations;
+      }
+    });
+
+    const setDocuments = [...sets].map(([hash, enumerations]) => ({
+      _key: setKey(dictionary_type, dictionary_version, hash),
+      dictionary_type,
+      dictionary_version,
+      hash,
+      enumerations
+    }));
+    if (setDocuments.length > 0) {
+      await setCollection.saveAll(setDocuments, { overwriteMode: 'ignore' });
+    }
+    return documents;
+  }
+
+  // Like share() for a PATCH body. Returns the update options to use: when
+  // the patch sets one form of enumerations the other one is removed.
+  async function sharePatch(dictionary_type, dictionary_version, patch) {
+    if (!('enumerations' in patch) && !('enumerations_ref' in patch)) return {};
+
+    await share(dictionary_type, dictionary_version, [patch]);
+    if ('enumerations_ref' in patch) patch.enumerations = null;
+    else patch.enumerations_ref = null;
+    return { keepNull: false };
+  }
+
+  // Returns documents with shared sets put back as `enumerations`. A
+  // reference to a set that is not stored is an error, not an empty table.
+  async function expand(dictionary_type, dictionary_version, documents) {
+    const missing = new Set();
+    for (const doc of documents) {
+      if (!doc?.enumerations_ref) continue;
+      const key = setKey(dictionary_type, dictionary_version, doc.enumerations_ref);
+      if (!cache.get(key)) missing.add(key);
+    }
+
+    if (missing.size > 0) {
+      const cursor = await fastify.db.query(`
+        FOR s IN @@sets
+          FILTER s._key IN @keys
+          RETURN { key: s._key, enumerations: s.enumerations }
+      `, { '@sets': ENUMERATION_SET_COLLECTION, keys: [...missing] });
+      for (const { key, enumerations } of await cursor.all()) {
+        cache.set(key, enumerations);
+      }
+    }
+
+    return documents.map(doc => {
+      if (!doc?.enumerations_ref) return doc;
+      const { enumerations_ref, ...rest } = doc;
+      const enumerations = cache.get(setKey(dictionary_type, dictionary_version, enumerations_ref));
+      if (!enumerations) {
+        throw new Error(`Enumeration set ${enumerations_ref} of ${dictionary_type} ${dictionary_version} is missing`);
+      }
+      return { ...rest, enumerations };
+    });
+  }
+
+  // All sets of a version, by hash
+  async function all(dictionary_type, dictionary_version) {
+    const cursor = await fastify.db.query(`
+      FOR s IN @@sets
+        FILTER s.dictionary_type == @dictionary_type AND s.dictionary_version == @dictionary_version
+        RETURN [s.hash, s.enumerations]
+    `, { '@sets': ENUMERATION_SET_COLLECTION, dictionary_type, dictionary_version });
+    return Object.fromEntries(await cursor.all());
+  }
+
+  // A deleted version takes its sets with it; it may be recreated under the same name
+  fastify.contentEvents.on('dictionary', ({ op }) => {
+    if (op === 'delete') cache.clear();
+  });
+
+  fastify.decorate('enumerationSets', { share, sharePatch, expand, all });
+}
+
+export default fp(enumerationSetsPlugin, {
+  name: 'enumeration-sets',
+  dependencies: ['fastify-arangodb', 'content-events']
+});
@@ -0,0 +1,66 @@
+import fp from 'fastify-plugin';
+import { compileSerializer, encode } from '../utils/msgpack.js';
+import { parseAcceptHeader, acceptQuality } from '../utils/accept.js';
+
+export const MSGPACK_CONTENT_TYPE = 'application/msgpack';
+const MSGPACK_ALIASES = [MSGPACK_CONTENT_TYPE, 'application/x-msgpack', 'application/vnd.msgpack'];
+
+// Whether an Accept header rates MessagePack at least as high as JSON
+export function prefersMsgpack(acceptHeader) {
+  if (!acceptHeader || !acceptHeader.includes('msgpack')) return false;
+
+  const accepted = parseAcceptHeader(acceptHeader);
+  const msgpackQuality = Math.max(...MSGPACK_ALIASES.map(type => accepted.get(type) ?? 0));
+  return msgpackQuality > 0 && msgpackQuality >= acceptQuality(accepted, 'application/json');
+}
+
+// Responds with MessagePack instead of JSON when the client prefers it in its
+// Accept header. Payloads are written from the route's response schema, so a
+// MessagePack response carries exactly the fields of its JSON counterpart.
+async function msgpackPlugin(fastify, options) {
+  // response schema object -> compiled serializer
+  const serializers = new WeakMap();
+
+  function responseSchemaFor(request, statusCode) {
+    const responses = request.routeOptions.schema?.response;
+    if (!responses) return null;
+    return responses[statusCode] ?? responses[`${String(statusCode)[0]}xx`] ?? responses.default ?? null;
+  }
+
+  function serializerFor(schema) {
+    if (!schema) return encode;
+    if (!serializers.has(schema)) {
+      serializers.set(schema, compileSerializer(schema));
+    }
+    return serializers.get(schema);
+  }
+
+  fastify.addHook('preSerialization', async (request, reply, payload) => {
+    if (!prefersMsgpack(request.headers.accept)) {
+      return payload;
+    }
+
+    const serialize = serializerFor(responseSchemaFor(request, reply.statusCode));
+    reply.serializer(serialize);
+    reply.type(MSGPACK_CONTENT_TYPE);
+    return payload;
+  });
+
+  // Content varies with Accept for every route that may answer in MessagePack
+  fastify.addHook('onSend', async (request, reply, payload) => {
+    if (reply.getHeader('content-type')?.toString().startsWith(MSGPACK_CONTENT_TYPE) ||
+        request.routeOptions.schema?.response) {
+      const vary = reply.getHeader('vary');
+      if (!vary) {
+        reply.header('vary', 'Accept');
+      } else if (!String(vary).toLowerCase().split(',').map(value => value.trim()).includes('accept')) {
+        reply.header('vary', `${vary}, Accept`);
+      }
+    }
+    return payload;
+  });
+}
+
+export default fp(msgpackPlugin, {
+  name: 'msgpack'
+});
@@ -0,0 +1,148 @@
+import fp from 'fastify-plugin';
+import { SUGGEST_MAX_VERSIONS } from '../config/env.js';
+import { CONTENT_KINDS } from '../config/contentKinds.js';
+import { SortedNames } from '../utils/sortedNames.js';
+
+const byName = (a, b) => {
+  const keyA = a.name.toLowerCase();
+  const keyB = b.name.toLowerCase();
+  if (keyA !== keyB) return keyA < keyB ? -1 : 1;
+  return a.name < b.name ? -1 : a.name > b.name ? 1 : 0;
+};
+
+// How often the names of a loaded version are checked against its dictionary
+const CHECK_INTERVAL_MS = 1000;
+
+// Element names of dictionary versions held in memory for autocompletion.
+//
+// The names of a version are loaded on its first suggestion request, from
+// its published artifact when there is one and from ArangoDB otherwise, and
+// kept sorted per content kind. Writes reported through content events are
+// applied in place. Writes made by other instances are noticed by comparing
+// the version's revision stamp, at most every CHECK_INTERVAL_MS and in the
+// background: when it moved, the names are read again while the loaded ones
+// are still served. The SUGGEST_MAX_VERSIONS most recently used versions are
+// kept.
+async function nameSuggestionsPlugin(fastify, options) {
+  const maxVersions = options.maxVersions ?? SUGGEST_MAX_VERSIONS;
+
+  const loaded = new Map();     // versionKey -> { names: { kind -> SortedNames }, stamp, checkedAt }, least recently used first
+  const pending = new Map();    // versionKey -> { promise, stale }
+
+  const versionKey = (dictionary_type, dictionary_version) => `${dictionary_type}\u0000${dictionary_version}`;
+  const namesIn = values => new SortedNames(values.filter(name => typeof name === 'string'));
+
+  async function readNames(dictionary_type, dictionary_version) {
+    // Read first, so that a write ending during the read moves the stamp past it
+    const stamp = await fastify.contentRevisions.stamp(dictionary_type, dictionary_version);
+    if (stamp === null) return null;
+
+    const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+    if (artifact) {
+      const names = Object.fromEntries(Object.entries(CONTENT_KINDS).map(([kind, { nameField }]) =>
+        [kind, namesIn(artifact.content[kind].map(doc => doc[nameField]))]));
+      return { names, stamp, checkedAt: Date.now() };
+    }
+
+    const names = {};
+    await Promise.all(Object.entries(CONTENT_KINDS).map(async ([kind, { nameField }]) => {
+      const namesCursor = await fastify.db.query(`
+        FOR doc IN @@col
+          FILTER doc.dictionary_type == @dictionary_type
+            AND doc.dictionary_version == @dictionary_version
+          RETURN doc.@nameField
+      `, {
+        '@col': fastify.contentCollections.name(kind, dictionary_type, dictionary_version),
+        nameField,
+        dictionary_type,
+        dictionary_version
+      });
+      names[kind] = namesIn(await namesCursor.all());
+    }));
+    return { names, stamp, checkedAt: Date.now() };
+  }
+
+  // Reads the names of a version and keeps them, sharing one read between callers
+  function load(dictionary_type, dictionary_version) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    if (!pending.has(key)) {
+      const read = { stale: false };
+      read.promise = readNames(dictionary_type, dictionary_version)
+        .then(entry => {
+          // Names read while the version was written to may miss the write: use them once only
+          if (entry && !read.stale) {
+            loaded.delete(key);
+            loaded.set(key, entry);
+            if (loaded.size > maxVersions) loaded.delete(loaded.keys().next().value);
+          }
+          return entry;
+        })
+        .finally(() => pending.delete(key));
+      pending.set(key, read);
+    }
+    return pending.get(key).promise;
+  }
+
+  // Reloads the names of a loaded version if it was written to elsewhere
+  async function revalidate(dictionary_type, dictionary_version, entry) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    const stamp = await fastify.contentRevisions.stamp(dictionary_type, dictionary_version);
+    if (stamp === null) {
+      if (loaded.get(key) === entry) loaded.delete(key);
+    } else if (stamp !== entry.stamp) {
+      await load(dictionary_type, dictionary_version);
+    }
+  }
+
+  // Names of a version by kind, or null when the version does not exist
+  async function namesOf(dictionary_type, dictionary_version) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    const entry = loaded.get(key);
+    if (!entry) return (await load(dictionary_type, dictionary_version))?.names ?? null;
+
+    loaded.delete(key);
+    loaded.set(key, entry);
+    if (Date.now() - entry.checkedAt >= CHECK_INTERVAL_MS) {
+      entry.checkedAt = Date.now();
+      revalidate(dictionary_type, dictionary_version, entry)
+        .catch(err => fastify.log.error(err, `Failed to refresh names of ${dictionary_type} ${dictionary_version}`));
+    }
+    return entry.names;
+  }
+
+  // Up to `limit` names starting with prefix, by kind, or null for an unknown version
+  async function suggest(dictionary_type, dictionary_version, prefix, kinds, limit) {
+    const names = await namesOf(dictionary_type, dictionary_version);
+    if (!names) return null;
+    const hits = kinds.flatMap(kind => names[kind].withPrefix(prefix, limit).map(name => ({ kind, name })));
+    if (kinds.length > 1) hits.sort(byName);
+    return hits.slice(0, limit);
+  }
+
+  fastify.contentEvents.on('content', ({ collection, dictionary_type, dictionary_version, op, documents, previous }) => {
+    const key = versionKey(dictionary_type, dictionary_version);
+    if (pending.has(key)) pending.get(key).stale = true;
+
+    const names = loaded.get(key)?.names[collection];
+    if (!names) return;
+
+    const { nameField } = CONTENT_KINDS[collection];
+    const namesOfDocs = docs => (docs ?? []).map(doc => doc?.[nameField]).filter(name => typeof name === 'string');
+    if (op === 'delete' || op === 'update') names.delete(namesOfDocs(op === 'update' ? previous : documents));
+    if (op === 'insert' || op === 'update') names.add(namesOfDocs(documents));
+  });
+
+  fastify.contentEvents.on('dictionary', ({ dictionary_type, dictionary_version, op }) => {
+    if (op !== 'delete') return;
+    const key = versionKey(dictionary_type, dictionary_version);
+    loaded.delete(key);
+    if (pending.has(key)) pending.get(key).stale = true;
+  });
+
+  fastify.decorate('nameSuggestions', { suggest });
+}
+
+export default fp(nameSuggestionsPlugin, {
+  name: 'name-suggestions',
+  dependencies: ['fastify-arangodb', 'content-events', 'content-revisions', 'published-artifacts']
+});
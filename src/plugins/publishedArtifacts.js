@@ -0,0 +1,263 @@
+import fp from 'fastify-plugin';
+import { promises as fs } from 'node:fs';
+import path from 'node:path';
+import { promisify } from 'node:util';
+import zlib from 'node:zlib';
+import { ARTIFACT_DIR, PUBLISHED_STATES } from '../config/env.js';
+import { CONTENT_KINDS } from '../config/contentKinds.js';
+
+const gzip = promisify(zlib.gzip);
+const gunzip = promisify(zlib.gunzip);
+
+const ARTIFACT_FORMAT = 2;
+const REBUILD_DELAY_MS = 1000;
+// How often a loaded artifact is checked against the dictionary document
+const ARTIFACT_CHECK_INTERVAL_MS = 5000;
+
+// Immutable snapshots of published dictionary versions.
+//
+// When a version is published its whole content is written once to
+// ARTIFACT_DIR as gzip-compressed JSON. Loaded artifacts are kept in memory
+// together with a name index per content kind, so full-version exports and
+// by-name lookups for published versions do not query content collections.
+// A write to a published version drops its artifact at once on this instance
+// and rebuilds it shortly after. Writes, unpublishing and republishing on
+// other instances are caught by checking an artifact in use against the state
+// and revision of its dictionary every ARTIFACT_CHECK_INTERVAL_MS; it is
+// dropped when they no longer match.
+async function publishedArtifactsPlugin(fastify, options) {
+  const artifactDir = options.artifactDir ?? ARTIFACT_DIR;
+
+  const loaded = new Map();     // versionKey -> artifact
+  const pending = new Map();    // versionKey -> Promise<artifact|null>
+  const onDisk = new Set();     // versionKeys with an artifact file
+  const rebuildTimers = new Map();
+
+  const versionKey = (dictionary_type, dictionary_version) => `${dictionary_type}\u0000${dictionary_version}`;
+
+  const artifactPath = (dictionary_type, dictionary_version) =>
+    path.join(artifactDir, dictionary_type, `${encodeURIComponent(dictionary_version)}.json.gz`);
+
+  // Turns the stored snapshot into the in-memory form with name indexes
+  function materialize(gzipped, snapshot) {
+    const index = {};
+    for (const [kind, { nameField }] of Object.entries(CONTENT_KINDS)) {
+      index[kind] = new Map(snapshot.content[kind].map(doc => [doc[nameField], doc]));
+    }
+
+    return {
+      dictionary: snapshot.dictionary,
+      revision: snapshot.dictionary.revision_seq ?? snapshot.dictionary.revision ?? 0,
+      checkedAt: 0,
+      builtAt: snapshot.built_at,
+      content: snapshot.content,
+      gzipped,
+      json: () => gunzip(gzipped),
+      find: (kind, name) => index[kind].get(name),
+      findMany: (kind, names) => names.map(name => index[kind].get(name)).filter(Boolean)
+    };
+  }
+
+  async function readSnapshot(dictionary_type, dictionary_version) {
+    const query = `
+      FOR d IN dictionary
+        FILTER d.dictionary_type == @dictionary_type
+          AND d.dictionary_version == @dictionary_version
+        RETURN UNSET(d, '_id', '_rev')
+    `;
+    const cursor = await fastify.db.query(query, { dictionary_type, dictionary_version });
+    const dictionary = await cursor.next();
+    if (!dictionary) return null;
+
+    const content = {};
+    for (const [kind, { nameField }] of Object.entries(CONTENT_KINDS)) {
+      const collection = fastify.contentCollections.name(kind, dictionary_type, dictionary_version);
+      const contentCursor = await fastify.db.query(`
+        FOR doc IN @@col
+          FILTER doc.dictionary_type == @dictionary_type
+            AND doc.dictionary_version == @dictionary_version
+          SORT doc.@nameField
+          RETURN UNSET(doc, '_id', '_rev')
+      `, { '@col': collection, nameField, dictionary_type, dictionary_version });
+      content[kind] = await contentCursor.all();
+    }
+
+    return {
+      format: ARTIFACT_FORMAT,
+      built_at: new Date().toISOString(),
+      dictionary,
+      content,
+      enumeration_sets: await fastify.enumerationSets.all(dictionary_type, dictionary_version)
+    };
+  }
+
+  // Snapshots a version from ArangoDB and writes the artifact to disk
+  async function build(dictionary_type, dictionary_version) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    const started = Date.now();
+
+    const snapshot = await readSnapshot(dictionary_type, dictionary_version);
+    if (!snapshot || !PUBLISHED_STATES.includes(snapshot.dictionary.state)) {
+      return null;
+    }
+
+    const gzipped = await gzip(Buffer.from(JSON.stringify(snapshot)), { level: zlib.constants.Z_BEST_COMPRESSION });
+
+    const file = artifactPath(dictionary_type, dictionary_version);
+    await fs.mkdir(path.dirname(file), { recursive: true });
+    await fs.writeFile(`${file}.tmp`, gzipped);
+    await fs.rename(`${file}.tmp`, file);
+
+    const artifact = materialize(gzipped, snapshot);
+    artifact.checkedAt = Date.now();
+    loaded.set(key, artifact);
+    onDisk.add(key);
+
+    fastify.log.info(
+      `Built artifact for ${dictionary_type} ${dictionary_version} (${gzipped.length} bytes) in ${Date.now() - started}ms`
+    );
+    return artifact;
+  }
+
+  async function readFromDisk(dictionary_type, dictionary_version) {
+    const gzipped = await fs.readFile(artifactPath(dictionary_type, dictionary_version));
+    const snapshot = JSON.parse(await gunzip(gzipped));
+    if (snapshot.format !== ARTIFACT_FORMAT) return null;
+
+    const artifact = materialize(gzipped, snapshot);
+    loaded.set(versionKey(dictionary_type, dictionary_version), artifact);
+    return artifact;
+  }
+
+  // Shares one in-flight load/build per version between concurrent callers
+  function once(key, task) {
+    if (!pending.has(key)) {
+      pending.set(key, task().finally(() => pending.delete(key)));
+    }
+    return pending.get(key);
+  }
+
+  // Returns the artifact if its dictionary is still published at the revision
+  // it was built from, checking at most every ARTIFACT_CHECK_INTERVAL_MS;
+  // drops it and returns null otherwise
+  function validate(dictionary_type, dictionary_version, artifact) {
+    if (Date.now() - artifact.checkedAt < ARTIFACT_CHECK_INTERVAL_MS) return artifact;
+
+    artifact.checking ??= (async () => {
+      const cursor = await fastify.db.query(`
+        FOR d IN dictionary
+          FILTER d.dictionary_type == @dictionary_type
+            AND d.dictionary_version == @dictionary_version
+          RETURN { state: d.state, revision: NOT_NULL(d.revision_seq, d.revision, 0) }
+      `, { dictionary_type, dictionary_version });
+      const current = await cursor.next();
+      if (current && PUBLISHED_STATES.includes(current.state) && current.revision === artifact.revision) {
+        artifact.checkedAt = Date.now();
+        return artifact;
+      }
+
+      fastify.log.info(`Dropping outdated artifact for ${dictionary_type} ${dictionary_version}`);
+      if (loaded.get(versionKey(dictionary_type, dictionary_version)) === artifact) {
+        await drop(dictionary_type, dictionary_version);
+      }
+      return null;
+    })().finally(() => { artifact.checking = null; });
+    return artifact.checking;
+  }
+
+  // Returns the artifact of a version if one is available without reading
+  // its content from ArangoDB (in memory or on disk), otherwise null.
+  async function lookup(dictionary_type, dictionary_version) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    let artifact = loaded.get(key);
+    if (!artifact) {
+      if (!onDisk.has(key)) return null;
+      artifact = await once(key, () => readFromDisk(dictionary_type, dictionary_version).catch(err => {
+        fastify.log.warn(err, `Discarding unreadable artifact for ${dictionary_type} ${dictionary_version}`);
+        onDisk.delete(key);
+        return null;
+      }));
+      if (!artifact) return null;
+    }
+    return validate(dictionary_type, dictionary_version, artifact);
+  }
+
+  // Like lookup, but builds the artifact from ArangoDB when the version is
+  // published and no artifact exists yet. Returns null for editable versions.
+  async function load(dictionary_type, dictionary_version) {
+    const artifact = await lookup(dictionary_type, dictionary_version);
+    if (artifact) return artifact;
+
+    const key = versionKey(dictionary_type, dictionary_version);
+    return once(key, () => build(dictionary_type, dictionary_version));
+  }
+
+  // Removes the artifact from memory and disk
+  async function drop(dictionary_type, dictionary_version) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    loaded.delete(key);
+    onDisk.delete(key);
+    await fs.rm(artifactPath(dictionary_type, dictionary_version), { force: true });
+  }
+
+  // Content of a published version changed: drop the stale artifact and
+  // rebuild it once the burst of writes is over.
+  function scheduleRebuild(dictionary_type, dictionary_version) {
+    const key = versionKey(dictionary_type, dictionary_version);
+    clearTimeout(rebuildTimers.get(key));
+    rebuildTimers.set(key, setTimeout(() => {
+      rebuildTimers.delete(key);
+      once(key, () => build(dictionary_type, dictionary_version)).catch(err => {
+        fastify.log.error(err, `Failed to rebuild artifact for ${dictionary_type} ${dictionary_version}`);
+      });
+    }, REBUILD_DELAY_MS).unref());
+  }
+
+  fastify.contentEvents.on('content', ({ dictionary_type, dictionary_version }) => {
+    const key = versionKey(dictionary_type, dictionary_version);
+    const inProgress = pending.get(key);
+    if (!loaded.has(key) && !onDisk.has(key) && !inProgress) return;
+
+    // A build in progress may have read the content before this write: let it
+    // finish, then drop what it wrote
+    Promise.resolve(inProgress).catch(() => {})
+      .then(() => drop(dictionary_type, dictionary_version))
+      .then(() => scheduleRebuild(dictionary_type, dictionary_version))
+      .catch(err => fastify.log.error(err, 'Failed to drop stale artifact'));
+  });
+
+  fastify.contentEvents.on('dictionary', ({ dictionary_type, dictionary_version, op, state, previousState }) => {
+    const published = op !== 'delete' && PUBLISHED_STATES.includes(state);
+    const wasPublished = PUBLISHED_STATES.includes(previousState);
+
+    if (published && !wasPublished) {
+      // Newly published: snapshot it in the background
+      once(versionKey(dictionary_type, dictionary_version), () => build(dictionary_type, dictionary_version))
+        .catch(err => fastify.log.error(err, `Failed to build artifact for ${dictionary_type} ${dictionary_version}`));
+    } else if (!published) {
+      drop(dictionary_type, dictionary_version)
+        .catch(err => fastify.log.error(err, 'Failed to drop artifact'));
+    }
+  });
+
+  // Index the artifacts already on disk; they are read lazily on first use
+  for (const dictionary_type of await fs.readdir(artifactDir).catch(() => [])) {
+    for (const file of await fs.readdir(path.join(artifactDir, dictionary_type)).catch(() => [])) {
+      if (file.endsWith('.json.gz')) {
+        onDisk.add(versionKey(dictionary_type, decodeURIComponent(file.slice(0, -'.json.gz'.length))));
+      }
+    }
+  }
+  fastify.log.info(`Found ${onDisk.size} published dictionary artifact(s) in '${artifactDir}'`);
+
+  fastify.addHook('onClose', async () => {
+    for (const timer of rebuildTimers.values()) clearTimeout(timer);
+  });
+
+  fastify.decorate('artifacts', { lookup, load, build, drop, snapshot: readSnapshot });
+}
+
+export default fp(publishedArtifactsPlugin, {
+  name: 'published-artifacts',
+  dependencies: ['fastify-arangodb', 'content-events', 'enumeration-sets']
+});
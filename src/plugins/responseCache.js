@@ -0,0 +1,152 @@
+import fp from 'fastify-plugin';
+import { RESPONSE_CACHE_TTL_MS, RESPONSE_CACHE_MAX_ENTRIES } from '../config/env.js';
+import { TtlCache } from '../utils/ttlCache.js';
+import { negotiateEncoding } from './compression.js';
+import { prefersMsgpack } from './msgpack.js';
+
+// Larger payloads (e.g. exports or very large pages) are not worth holding in memory
+const MAX_CACHED_PAYLOAD_BYTES = 1024 * 1024;
+
+// How long a revision stamp read from ArangoDB is used before it is read again
+const STAMP_CHECK_INTERVAL_MS = 1000;
+
+const kCacheKey = Symbol('responseCacheKey');
+
+// Revision scope of a cached route: the data its responses are built from
+const SCOPES = {
+  dictionary: params => `dictionary:${params.dictionary_type}/${params.dictionary_version}`,
+  vi: () => 'vi',
+  custom_script: () => 'custom_script'
+};
+
+// Scopes whose revision is also kept in ArangoDB, part of the cache key
+const STORED_REVISIONS = {
+  dictionary: (fastify, params) => fastify.contentRevisions.stamp(params.dictionary_type, params.dictionary_version)
+};
+
+// Serves repeated list and search queries from their already serialized (and
+// compressed) bytes. Routes opt in with `config: { responseCache: <scope(s)> }`,
+// where the scopes name the data the response depends on. Every write to that
+// data bumps its in-memory revision, which is part of the cache key, so stale
+// entries are never served and simply age out. Writes made by other instances
+// are seen through the dictionary's revision stamp, which is part of the key
+// too. The stamp is kept in memory, dropped on this instance's writes and read
+// again from ArangoDB at most every STAMP_CHECK_INTERVAL_MS, so cache hits
+// normally need no database round trip. Verification items and custom
+// scripts have no stored revision: for them RESPONSE_CACHE_TTL_MS bounds how
+// long writes of other instances take to show up. Must be registered after the
+// plugins that transform payloads in onSend and before single-flight, so a
+// cache hit never starts a flight.
+async function responseCachePlugin(fastify, options) {
+  const cache = new TtlCache({
+    ttlMs: options.ttlMs ?? RESPONSE_CACHE_TTL_MS,
+    maxEntries: options.maxEntries ?? RESPONSE_CACHE_MAX_ENTRIES
+  });
+
+  // scope key -> revision
+  const revisions = new Map();
+  // scope key -> stamp last read from ArangoDB, and reads in flight
+  const stamps = new TtlCache({ ttlMs: STAMP_CHECK_INTERVAL_MS, maxEntries: options.maxEntries ?? RESPONSE_CACHE_MAX_ENTRIES });
+  const stampReads = new Map();
+
+  function bump(scopeKey) {
+    revisions.set(scopeKey, (revisions.get(scopeKey) ?? 0) + 1);
+    stamps.delete(scopeKey);
+  }
+
+  // The stored revision stamp of a scope, shared by concurrent requests
+  function storedStamp(scope, scopeKey, params) {
+    const cached = stamps.get(scopeKey);
+    if (cached !== undefined) return cached;
+    if (!stampReads.has(scopeKey)) {
+      stampReads.set(scopeKey, STORED_REVISIONS[scope](fastify, params)
+        .then(stamp => {
+          stamps.set(scopeKey, stamp);
+          return stamp;
+        })
+        .finally(() => stampReads.delete(scopeKey)));
+    }
+    return stampReads.get(scopeKey);
+  }
+
+  fastify.contentEvents.on('content', ({ dictionary_type, dictionary_version }) =>
+    bump(SCOPES.dictionary({ dictionary_type, dictionary_version })));
+  fastify.contentEvents.on('dictionary', ({ dictionary_type, dictionary_version }) =>
+    bump(SCOPES.dictionary({ dictionary_type, dictionary_version })));
+  fastify.contentEvents.on('vi', () => bump(SCOPES.vi()));
+  fastify.contentEvents.on('custom_script', () => bump(SCOPES.custom_script()));
+
+  function normalizedQuery(query) {
+    return JSON.stringify(Object.keys(query ?? {}).sort().map(name => [name, query[name]]));
+  }
+
+  async function cacheKey(request, scopes) {
+    const revisionKey = (await Promise.all([].concat(scopes).map(async scope => {
+      const scopeKey = SCOPES[scope](request.params);
+      const stored = STORED_REVISIONS[scope] ? `#${await storedStamp(scope, scopeKey, request.params)}` : '';
+      return `${scopeKey}@${revisions.get(scopeKey) ?? 0}${stored}`;
+    }))).join(',');
+    const representation = [
+      prefersMsgpack(request.headers.accept) ? 'msgpack' : 'json',
+      negotiateEncoding(request.headers['accept-encoding'])?.name ?? 'identity'
+    ].join('+');
+    return [
+      revisionKey,
+      request.routeOptions.url,
+      JSON.stringify(request.params ?? {}),
+      normalizedQuery(request.query),
+      representation
+    ].join('\n');
+  }
+
+  async function serveFromCache(request, reply) {
+    const key = await cacheKey(request, request.routeOptions.config.responseCache);
+    const cached = cache.get(key);
+
+    if (!cached) {
+      // Remember the key as of now: a write during the query moves the revision on
+      request[kCacheKey] = key;
+      return;
+    }
+
+    for (const [name, value] of Object.entries(cached.headers)) {
+      reply.header(name, value);
+    }
+    return reply.send(cached.payload);
+  }
+
+  fastify.addHook('onRoute', routeOptions => {
+    const scopes = routeOptions.config?.responseCache;
+    if (!scopes) return;
+    for (const scope of [].concat(scopes)) {
+      if (!SCOPES[scope]) {
+        throw new Error(`Unknown response cache scope '${scope}' for ${routeOptions.url}`);
+      }
+    }
+
+    // Run after the route's own preHandlers so only authenticated requests are answered
+    const preHandlers = routeOptions.preHandler
+      ? [].concat(routeOptions.preHandler)
+      : [];
+    routeOptions.preHandler = [...preHandlers, serveFromCache];
+  });
+
+  fastify.addHook('onSend', async (request, reply, payload) => {
+    const key = request[kCacheKey];
+    if (!key || reply.statusCode !== 200) return payload;
+    if (typeof payload !== 'string' && !Buffer.isBuffer(payload)) return payload;
+    if (Buffer.byteLength(payload) > MAX_CACHED_PAYLOAD_BYTES) return payload;
+
+    const headers = {};
+    for (const name of ['content-type', 'content-encoding', 'vary', 'x-total-count']) {
+      if (reply.hasHeader(name)) headers[name] = reply.getHeader(name);
+    }
+    cache.set(key, { headers, payload });
+    return payload;
+  });
+}
+
+export default fp(responseCachePlugin, {
+  name: 'response-cache',
+  dependencies: ['content-events', 'content-revisions']
+});
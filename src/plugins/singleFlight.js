@@ -0,0 +1,106 @@
+import fp from 'fastify-plugin';
+import { createHash } from 'node:crypto';
+
+// Request headers that change the bytes of a response
+const VARYING_HEADERS = ['accept', 'accept-encoding', 'if-none-match'];
+
+// Response headers that are not copied to requests sharing a leader's response
+const UNSHARED_HEADERS = new Set(['content-length', 'date', 'connection', 'transfer-encoding', 'set-cookie']);
+
+const kFlight = Symbol('singleFlight');
+
+// Coalesces identical concurrent reads. For routes declaring
+// `config: { singleFlight: true }`, the first authenticated request for a
+// given route, params, query, body and negotiated representation runs the
+// handler; requests arriving while it is in flight wait for it and are sent
+// the same serialized (and compressed) payload. Must be registered after the
+// plugins that transform payloads in onSend so the shared bytes are final.
+async function singleFlightPlugin(fastify, options) {
+  // flight key -> { promise, resolve }
+  const flights = new Map();
+
+  function flightKey(request) {
+    const hash = createHash('sha1');
+    hash.update(`${request.method} ${request.routeOptions.url}\n`);
+    hash.update(JSON.stringify(request.params ?? {}));
+    hash.update(JSON.stringify(request.query ?? {}));
+    if (request.body !== undefined) {
+      hash.update(JSON.stringify(request.body));
+    }
+    for (const header of VARYING_HEADERS) {
+      hash.update(`\n${request.headers[header] ?? ''}`);
+    }
+    return hash.digest('base64');
+  }
+
+  // Ends the leader's flight, handing its response (or null) to the waiting requests
+  function land(request, response) {
+    const flight = request[kFlight];
+    if (!flight) return;
+    request[kFlight] = null;
+    flights.delete(flight.key);
+    flight.resolve(response);
+  }
+
+  async function joinFlight(request, reply) {
+    const key = flightKey(request);
+    const inFlight = flights.get(key);
+
+    if (!inFlight) {
+      let resolve;
+      const promise = new Promise(res => { resolve = res; });
+      const flight = { key, promise, resolve };
+      flights.set(key, flight);
+      request[kFlight] = flight;
+      return;
+    }
+
+    const shared = await inFlight.promise;
+    if (!shared) {
+      // The leader could not share its response; run the handler instead
+      return;
+    }
+
+    reply.code(shared.statusCode);
+    for (const [name, value] of Object.entries(shared.headers)) {
+      reply.header(name, value);
+    }
+    return reply.send(shared.payload);
+  }
+
+  fastify.addHook('onRoute', routeOptions => {
+    if (!routeOptions.config?.singleFlight) return;
+
+    // Run after the route's own preHandlers so only authenticated requests share a flight
+    const preHandlers = routeOptions.preHandler
+      ? [].concat(routeOptions.preHandler)
+      : [];
+    routeOptions.preHandler = [...preHandlers, joinFlight];
+  });
+
+  fastify.addHook('onSend', async (request, reply, payload) => {
+    if (!request[kFlight]) return payload;
+
+    const shareable = reply.statusCode < 500 &&
+      (typeof payload === 'string' || Buffer.isBuffer(payload));
+    if (!shareable) {
+      land(request, null);
+      return payload;
+    }
+
+    const headers = {};
+    for (const [name, value] of Object.entries(reply.getHeaders())) {
+      if (!UNSHARED_HEADERS.has(name)) headers[name] = value;
+    }
+    land(request, { statusCode: reply.statusCode, headers, payload });
+    return payload;
+  });
+
+  // Never leave waiting requests behind if the leader ends without sending
+  fastify.addHook('onResponse', async (request) => land(request, null));
+  fastify.addHook('onRequestAbort', async (request) => land(request, null));
+}
+
+export default fp(singleFlightPlugin, {
+  name: 'single-flight'
+});
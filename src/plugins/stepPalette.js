@@ -0,0 +1,281 @@
+import fp from 'fastify-plugin';
+import { createHash } from 'node:crypto';
+import { STEP_PALETTE_TTL_MS } from '../config/env.js';
+import {
+  BUILT_IN_STEPS,
+  DEFAULT_CUSTOM_STEP_CATEGORY
+} from '../config/stepPalette.js';
+
+const BUILT_IN_FIELDS = ['step_display_name', 'palette_catagory', 'enable_disable'];
+const CUSTOM_FIELDS = ['step_display_name', 'palette_catagory'];
+
+// In-memory procedure editor palette.
+//
+// The palette is built from the `step_palette` overrides, the custom scripts
+// and the dictionary types present in the command collection, then kept
+// current from write events. Writes made by other instances are picked up in
+// the background once the palette is older than STEP_PALETTE_TTL_MS: the
+// revisions of the collections it is read from are checked, and it is read
+// again only when one of them has moved. Every content write updates its
+// dictionary document, so the `dictionary` revision covers command types.
+// The ETag of the palette routes is a hash of its content, so it is the same
+// on every instance and survives reloads that find nothing new; editor opens
+// are answered from memory (or with 304 Not Modified) without scanning
+// `custom_script`.
+async function stepPalettePlugin(fastify, options) {
+  const ttlMs = options.ttlMs ?? STEP_PALETTE_TTL_MS;
+
+  // Collections whose writes can change the palette
+  const SOURCE_COLLECTIONS = ['custom_script', 'step_palette', 'dictionary'];
+
+  let state = null;
+  let loadedAt = 0;
+  let loadedStamp = null;
+  let loading = null;
+  let checking = null;
+  let generation = 0;   // bumped by every change, used to detect changes during a load
+  let views = null;
+
+  // Identifies the written state of the palette's source collections
+  async function readStamp() {
+    const revisions = await Promise.all(SOURCE_COLLECTIONS.map(name =>
+      fastify.db.collection(name).revision().then(result => result.revision)));
+    return revisions.join('/');
+  }
+
+  async function readState() {
+    const commands = await fastify.contentCollections.acrossVersions('command', col => `
+          FOR c IN ${col}
+            COLLECT dictionary_type = c.dictionary_type
+            RETURN dictionary_type`);
+    const [scripts, overrides, commandTypes] = await Promise.all([
+      fastify.db.query(`
+        FOR s IN custom_script
+          FILTER s.script_id != null
+          RETURN { script_id: s.script_id, script_name: s.script_name, status: s.status }
+      `).then(cursor => cursor.all()),
+      fastify.db.query(`
+        FOR p IN step_palette
+          RETURN UNSET(p, '_key', '_id', '_rev')
+      `).then(cursor => cursor.all()),
+      fastify.db.query(`
+        FOR dictionary_type IN UNIQUE(${commands.expression})
+          RETURN dictionary_type
+      `, commands.bindVars).then(cursor => cursor.all())
+    ]);
+
+    return {
+      scripts: new Map(scripts.map(script => [script.script_id, script])),
+      builtInOverrides: new Map(overrides.filter(o => o.step_type).map(o => [o.step_type, o])),
+      customOverrides: new Map(overrides.filter(o => o.step_id).map(o => [o.step_id, o])),
+      commandTypes: new Set(commandTypes)
+    };
+  }
+
+  // Reads the palette, again if it changed while reading
+  function load() {
+    if (!loading) {
+      loading = (async () => {
+        let loadedState;
+        let stamp;
+        let startGeneration;
+        do {
+          startGeneration = generation;
+          // Read before the state, so a write made meanwhile moves it on
+          stamp = await readStamp();
+          loadedState = await readState();
+        } while (startGeneration !== generation);
+        state = loadedState;
+        loadedStamp = stamp;
+        loadedAt = Date.now();
+        changed();
+        return state;
+      })().finally(() => { loading = null; });
+    }
+    return loading;
+  }
+
+  // Reloads the palette if its source collections were written since it was loaded
+  function check() {
+    checking ??= (async () => {
+      if (await readStamp() === loadedStamp) {
+        loadedAt = Date.now();
+        return;
+      }
+      await load();
+    })().finally(() => { checking = null; });
+    return checking;
+  }
+
+  // Loads the palette on first use. Once it is older than the TTL it is
+  // checked in the background while the loaded one is still served.
+  async function ensureState() {
+    if (!state) return load();
+    if (Date.now() - loadedAt >= ttlMs) {
+      check().catch(err => fastify.log.error(err, 'Failed to reload step palette'));
+    }
+    return state;
+  }
+
+  function changed() {
+    generation++;
+    views = null;
+  }
+
+  function pick(source, fields) {
+    const result = {};
+    for (const field of fields) {
+      if (source?.[field] !== undefined) result[field] = source[field];
+    }
+    return result;
+  }
+
+  function buildViews() {
+    const builtIn = BUILT_IN_STEPS.map(step => {
+      const enabled = !step.requires_commands || state.commandTypes.has(step.requires_commands);
+      return {
+        step_type: step.step_type,
+        step_display_name: step.step_display_name,
+        palette_catagory: step.palette_catagory,
+        enable_disable: enabled ? 'ENABLE' : 'DISABLE',
+        ...pick(state.builtInOverrides.get(step.step_type), BUILT_IN_FIELDS)
+      };
+    });
+
+    const custom = new Map();
+    // Every active custom script is a step unless it was removed from the palette
+    for (const script of state.scripts.values()) {
+      if (script.status !== 'ACTIVE') continue;
+      const override = state.customOverrides.get(script.script_id);
+      if (override?.removed) continue;
+      custom.set(script.script_id, {
+        step_id: script.script_id,
+        step_display_name: script.script_name ?? script.script_id,
+        palette_catagory: DEFAULT_CUSTOM_STEP_CATEGORY,
+        ...pick(override, CUSTOM_FIELDS)
+      });
+    }
+    // Steps added explicitly that are not backed by a known custom script
+    for (const override of state.customOverrides.values()) {
+      if (override.removed || state.scripts.has(override.step_id)) continue;
+      custom.set(override.step_id, {
+        step_id: override.step_id,
+        ...pick(override, CUSTOM_FIELDS)
+      });
+    }
+
+    const customSteps = [...custom.values()].sort((a, b) =>
+      String(a.step_display_name ?? a.step_id).localeCompare(String(b.step_display_name ?? b.step_id)));
+
+    const hash = createHash('sha1').update(JSON.stringify([builtIn, customSteps])).digest('hex').slice(0, 16);
+    return {
+      builtIn,
+      custom: customSteps,
+      customById: custom,
+      etag: `"palette-${hash}"`
+    };
+  }
+
+  // Returns { builtIn, custom, customById, etag } for the current palette
+  async function current() {
+    await ensureState();
+    if (!views) views = buildViews();
+    return views;
+  }
+
+  // Status of the custom script a step id refers to, undefined when there is none
+  function scriptStatus(step_id) {
+    return state?.scripts.get(step_id)?.status;
+  }
+
+  // Records a stored `step_palette` document after a write
+  function applyOverride(doc) {
+    if (!state) return;
+    const override = { ...doc };
+    delete override._key;
+    delete override._id;
+    delete override._rev;
+    if (override.step_type) state.builtInOverrides.set(override.step_type, override);
+    if (override.step_id) state.customOverrides.set(override.step_id, override);
+    changed();
+  }
+
+  function removeOverride(step_id) {
+    if (!state) return;
+    state.customOverrides.delete(step_id);
+    changed();
+  }
+
+  fastify.contentEvents.on('custom_script', ({ op, documents }) => {
+    if (!state) {
+      generation++;
+      return;
+    }
+    for (const doc of documents) {
+      if (op === 'delete') {
+        state.scripts.delete(doc.script_id);
+      } else if (doc.script_id) {
+        state.scripts.set(doc.script_id, {
+          script_id: doc.script_id,
+          script_name: doc.script_name,
+          status: doc.status
+        });
+      }
+    }
+    changed();
+  });
+
+  // Re-checks whether any command of a dictionary type is left after deletions
+  async function recheckCommandType(dictionary_type) {
+    let present = false;
+    for (const name of await fastify.contentCollections.names('command', dictionary_type)) {
+      const cursor = await fastify.db.query(`
+        FOR c IN @@col
+          FILTER c.dictionary_type == @dictionary_type
+          LIMIT 1
+          RETURN 1
+      `, { '@col': name, dictionary_type });
+      present = (await cursor.all()).length > 0;
+      if (present) break;
+    }
+    if (state && present !== state.commandTypes.has(dictionary_type)) {
+      if (present) state.commandTypes.add(dictionary_type);
+      else state.commandTypes.delete(dictionary_type);
+      changed();
+    }
+  }
+
+  fastify.contentEvents.on('content', ({ collection, dictionary_type, op }) => {
+    if (collection !== 'command') return;
+    if (!state) {
+      generation++;
+      return;
+    }
+    if (op === 'insert' && !state.commandTypes.has(dictionary_type)) {
+      state.commandTypes.add(dictionary_type);
+      changed();
+    } else if (op === 'delete' && state.commandTypes.has(dictionary_type)) {
+      recheckCommandType(dictionary_type)
+        .catch(err => fastify.log.error(err, 'Failed to refresh step palette command types'));
+    }
+  });
+
+  fastify.contentEvents.on('dictionary', ({ dictionary_type, op }) => {
+    if (op !== 'delete') return;
+    if (!state) {
+      generation++;
+      return;
+    }
+    if (state.commandTypes.has(dictionary_type)) {
+      recheckCommandType(dictionary_type)
+        .catch(err => fastify.log.error(err, 'Failed to refresh step palette command types'));
+    }
+  });
+
+  fastify.decorate('stepPalette', { current, scriptStatus, applyOverride, removeOverride });
+}
+
+export default fp(stepPalettePlugin, {
+  name: 'step-palette',
+  dependencies: ['fastify-arangodb', 'content-events']
+});
@@ -0,0 +1,198 @@
+import fp from 'fastify-plugin';
+import { appendFile } from 'node:fs/promises';
+import {
+  TRACING_ENABLED,
+  TRACE_EXPORT_FILE,
+  TRACE_OTLP_ENDPOINT,
+  TRACE_SAMPLE_RATIO,
+  TRACE_EXPORT_INTERVAL_MS
+} from '../config/env.js';
+import { startRootSpan, traceparentOf, runWithSpan, runInSpan, nowNanos } from '../utils/tracer.js';
+
+// Spans are exported at least this many at a time between intervals
+const EXPORT_BATCH_SIZE = 512;
+
+const kTrace = Symbol('trace');
+
+// Traces sampled requests end to end. Each request gets a root span with a
+// child span per lifecycle phase:
+//
+//   request.onRequest     routing, admission control
+//   request.parse         reading and parsing the body
+//   request.validation    schema validation
+//   request.preHandler    authentication, chunked validation, cache lookups
+//   request.handler       the route handler; ArangoDB calls are its children
+//   request.serialization response serialization
+//   request.send          msgpack, compression and writing the response
+//
+// JWT verification and every ArangoDB call add their own spans wherever
+// they run. The root span's `traceparent` is returned in the response.
+async function tracingPlugin(fastify, options) {
+  if (!TRACING_ENABLED) return;
+
+  const resource = {
+    attributes: [{ key: 'service.name', value: { stringValue: 'dict-service' } }]
+  };
+  let pending = [];
+
+  async function flush() {
+    if (pending.length === 0) return;
+    const spans = pending;
+    pending = [];
+
+    const body = JSON.stringify({
+      resourceSpans: [{
+        resource,
+        scopeSpans: [{ scope: { name: 'dict-service' }, spans: spans.map(span => span.toOtlp()) }]
+      }]
+    });
+
+    try {
+      if (TRACE_EXPORT_FILE) {
+        await appendFile(TRACE_EXPORT_FILE, body + '\n');
+      }
+      if (TRACE_OTLP_ENDPOINT) {
+        await fetch(`${TRACE_OTLP_ENDPOINT.replace(/\/$/, '')}/v1/traces`, {
+          method: 'POST',
+          headers: { 'content-type': 'application/json' },
+          body
+        });
+      }
+    } catch (error) {
+      fastify.log.warn(error, 'Failed to export traces');
+    }
+  }
+
+  function onEnd(span) {
+    pending.push(span);
+    if (pending.length >= EXPORT_BATCH_SIZE) flush();
+  }
+
+  const timer = setInterval(flush, TRACE_EXPORT_INTERVAL_MS);
+  timer.unref();
+
+  // Ends the phase in progress and starts the next one
+  function phase(request, next) {
+    const trace = request[kTrace];
+    if (!trace) return;
+    const now = nowNanos();
+    if (trace.phase) {
+      trace.root.startChild(trace.phase, undefined, { startTime: trace.phaseStart }).end(now);
+    }
+    trace.phase = next;
+    trace.phaseStart = now;
+  }
+
+  fastify.addHook('onRequest', (request, reply, done) => {
+    const root = startRootSpan(`${request.method} ${request.routeOptions.url ?? 'unknown route'}`, {
+      traceparent: request.headers.traceparent,
+      sampleRatio: TRACE_SAMPLE_RATIO,
+      attributes: {
+        'http.request.method': request.method,
+        'http.route': request.routeOptions.url,
+        'url.path': request.url.split('?')[0],
+        'http.request.body.size': Number(request.headers['content-length']) || undefined,
+      },
+      onEnd
+    });
+    if (!root) return done();
+
+    request[kTrace] = { root, phase: 'request.onRequest', phaseStart: root.startTime };
+    reply.header('traceparent', traceparentOf(root));
+    runWithSpan(root, done);
+  });
+
+  fastify.addHook('preParsing', (request, reply, payload, done) => {
+    phase(request, 'request.parse');
+    done(null, payload);
+  });
+
+  // Body parsing may run outside the request's async context; restore it
+  fastify.addHook('preValidation', (request, reply, done) => {
+    phase(request, 'request.validation');
+    const trace = request[kTrace];
+    return trace ? runWithSpan(trace.root, done) : done();
+  });
+
+  fastify.addHook('preHandler', (request, reply, done) => {
+    phase(request, 'request.preHandler');
+    done();
+  });
+
+  fastify.addHook('onRoute', routeOptions => {
+    const handler = routeOptions.handler;
+    routeOptions.handler = function tracedHandler(request, reply) {
+      const trace = request[kTrace];
+      if (!trace) return handler.call(this, request, reply);
+
+      phase(request, null);
+      return runInSpan(trace.root.startChild('request.handler'), () => handler.call(this, request, reply));
+    };
+  });
+
+  fastify.addHook('preSerialization', (request, reply, payload, done) => {
+    const trace = request[kTrace];
+    if (trace) trace.serializationStart = nowNanos();
+    done(null, payload);
+  });
+
+  fastify.addHook('onSend', (request, reply, payload, done) => {
+    const trace = request[kTrace];
+    if (!trace) return done(null, payload);
+
+    // A reply sent before the handler ran (cache hit, rejection) ends the phase it was sent from
+    phase(request, null);
+    const now = nowNanos();
+    if (trace.serializationStart) {
+      trace.root.startChild('request.serialization', undefined, { startTime: trace.serializationStart }).end(now);
+    }
+    trace.sendStart = now;
+    done(null, payload);
+  });
+
+  fastify.addHook('onResponse', (request, reply, done) => {
+    const trace = request[kTrace];
+    if (!trace) return done();
+
+    const now = nowNanos();
+    if (trace.sendStart) {
+      trace.root.startChild('request.send', undefined, { startTime: trace.sendStart }).end(now);
+    }
+
+    const { root } = trace;
+    root.setAttributes({
+      'http.response.status_code': reply.statusCode,
+      'http.response.body.size': Number(reply.getHeader('content-length')) || undefined,
+      'dictionary.type': request.params?.dictionary_type,
+      'dictionary.version': request.params?.dictionary_version,
+      'enduser.id': request.user?.username ?? request.user?.sub,
+    });
+    if (reply.statusCode >= 500) {
+      root.recordError({ message: `HTTP ${reply.statusCode}` });
+    }
+    root.end(now);
+    done();
+  });
+
+  fastify.addHook('onError', (request, reply, error, done) => {
+    request[kTrace]?.root.recordError(error);
+    done();
+  });
+
+  fastify.addHook('onRequestAbort', (request, done) => {
+    const trace = request[kTrace];
+    if (trace) {
+      trace.root.recordError({ message: 'Request aborted by the client' }).end();
+    }
+    done();
+  });
+
+  fastify.addHook('onClose', async () => {
+    clearInterval(timer);
+    await flush();
+  });
+}
+
+export default fp(tracingPlugin, {
+  name: 'tracing'
+});
@@ -0,0 +1,211 @@
+import fp from 'fastify-plugin';
+import { BODY_CHUNK_SIZE } from '../config/env.js';
+import {
+  CONTENT_KINDS,
+  VI_LINK_TARGETS,
+  VI_LINK_COLLECTION
+} from '../config/contentKinds.js';
+
+// Identifiers are runs of letters, digits and '_', '-', '.', ':' of at least 3 characters
+const IDENTIFIER_PATTERN = /[A-Za-z0-9_\-.:]{3,}/g;
+const MAX_TEXT_IDENTIFIERS = 200;
+
+// Names a verification item refers to: its vi_name plus identifiers in its vi_text
+export function referencedNames(vi) {
+  const names = new Set();
+  if (vi.vi_name) names.add(vi.vi_name);
+  for (const match of String(vi.vi_text ?? '').matchAll(IDENTIFIER_PATTERN)) {
+    if (names.size > MAX_TEXT_IDENTIFIERS) break;
+    names.add(match[0].replace(/[.:]+$/, ''));
+  }
+  return [...names];
+}
+
+// Maintains the `vi_links` edges from verification items to the dictionary
+// content they refer to. VIs are linked when they are created or patched, and
+// keep the names they refer to in `referenced_names` (array indexed, like
+// `vas` and `vacs`); content is linked to the VIs naming it when it is
+// inserted or updated. VIs written before `referenced_names` existed, or
+// whose linking failed after they were written, are linked once the server
+// is listening.
+async function viLinksPlugin(fastify, options) {
+
+  const targetsByKind = Object.fromEntries(
+    Object.entries(VI_LINK_TARGETS).map(([vi_type, target]) => [target.kind, { vi_type, ...target }])
+  );
+
+  const matchFilter = (variable, fields, namesExpression) =>
+    fields.map(field => `${variable}.${field} IN ${namesExpression}`).join(' OR ');
+
+  // Replaces the outgoing links of the given verification items
+  async function linkVerificationItems(vis) {
+    await unlinkVerificationItems(vis);
+    await fastify.db.query(`
+      FOR vi IN @vis
+        UPDATE vi._key WITH { referenced_names: vi.names } IN vnv
+    `, { vis: vis.map(vi => ({ _key: vi._key, names: referencedNames(vi) })) });
+
+    for (const [vi_type, { kind, matchFields }] of Object.entries(VI_LINK_TARGETS)) {
+      const sources = vis
+        .filter(vi => vi.vi_type === vi_type)
+        .map(vi => ({ _id: vi._id, vi_id: vi.vi_id, names: referencedNames(vi) }))
+        .filter(vi => vi.names.length > 0);
+      if (sources.length === 0) continue;
+
+      const { nameField } = CONTENT_KINDS[kind];
+      const { expression, bindVars } = await fastify.contentCollections.acrossVersions(kind, col => `
+            FOR doc IN ${col}
+              FILTER ${matchFilter('doc', matchFields, 'vi.names')}
+              RETURN doc`);
+      await fastify.db.query(`
+        FOR vi IN @sources
+          FOR doc IN ${expression}
+            INSERT {
+              _from: vi._id,
+              _to: doc._id,
+              vi_id: vi.vi_id,
+              kind: @kind,
+              name: doc.@nameField,
+              dictionary_type: doc.dictionary_type,
+              dictionary_version: doc.dictionary_version
+            } INTO @@links
+      `, { ...bindVars, sources, kind, nameField, '@links': VI_LINK_COLLECTION });
+    }
+  }
+
+  // Links verification items that were just written. The write has already
+  // committed, so a failure is logged rather than thrown, and the VIs are
+  // left without referenced_names to be linked again by linkUnindexed.
+  async function linkWritten(vis) {
+    try {
+      await linkVerificationItems(vis);
+    } catch (err) {
+      fastify.log.error(err, `Failed to link ${vis.length} verification item(s); they are linked again at the next start`);
+      await fastify.db.query(`
+        FOR key IN @keys
+          UPDATE key WITH { referenced_names: null } IN vnv OPTIONS { keepNull: true, ignoreErrors: true }
+      `, { keys: vis.map(vi => vi._key) })
+        .catch(clearErr => fastify.log.error(clearErr, 'Failed to mark verification items for linking'));
+    }
+  }
+
+  // Removes the links of deleted verification items, logging failures
+  async function unlinkDeleted(vis) {
+    try {
+      await unlinkVerificationItems(vis);
+    } catch (err) {
+      fastify.log.error(err, `Failed to unlink ${vis.length} deleted verification item(s)`);
+    }
+  }
+
+  async function unlinkVerificationItems(vis) {
+    await fastify.db.query(`
+      FOR e IN @@links
+        FILTER e._from IN @ids
+        REMOVE e IN @@links
+    `, { ids: vis.map(vi => vi._id), '@links': VI_LINK_COLLECTION });
+  }
+
+  async function unlinkContent(documents) {
+    await fastify.db.query(`
+      FOR e IN @@links
+        FILTER e._to IN @ids
+        REMOVE e IN @@links
+    `, { ids: documents.map(doc => doc._id), '@links': VI_LINK_COLLECTION });
+  }
+
+  // Links newly written content to the verification items referring to it
+  async function linkContent(kind, documents) {
+    const target = targetsByKind[kind];
+    if (!target || documents.length === 0) return;
+
+    const { nameField } = CONTENT_KINDS[kind];
+
+    // name -> documents carrying it in one of the match fields
+    const documentsByName = new Map();
+    for (const doc of documents) {
+      for (const field of target.matchFields) {
+        if (doc[field] === undefined || doc[field] === null) continue;
+        const name = String(doc[field]);
+        if (!documentsByName.has(name)) documentsByName.set(name, new Set());
+        documentsByName.get(name).add(doc);
+      }
+    }
+
+    // VIs of the target type naming any of the documents, through the referenced_names index
+    const cursor = await fastify.db.query(`
+      FOR name IN @names
+        FOR vi IN vnv
+          FILTER name IN vi.referenced_names[*] AND vi.vi_type == @vi_type
+          RETURN { _id: vi._id, vi_id: vi.vi_id, name }
+    `, { names: [...documentsByName.keys()], vi_type: target.vi_type });
+
+    const edges = [];
+    const linked = new Map();   // vi _id -> documents already linked to it
+    for await (const { _id, vi_id, name } of cursor) {
+      if (!linked.has(_id)) linked.set(_id, new Set());
+      for (const doc of documentsByName.get(name)) {
+        if (linked.get(_id).has(doc)) continue;
+        linked.get(_id).add(doc);
+        edges.push({
+          _from: _id,
+          _to: doc._id,
+          vi_id,
+          kind,
+          name: doc[nameField],
+          dictionary_type: doc.dictionary_type,
+          dictionary_version: doc.dictionary_version
+        });
+      }
+    }
+
+    if (edges.length > 0) {
+      await fastify.db.collection(VI_LINK_COLLECTION).saveAll(edges);
+    }
+  }
+
+  fastify.contentEvents.on('content', ({ collection, op, documents }) => {
+    if (!targetsByKind[collection]) return;
+
+    const task = op === 'insert'
+      ? linkContent(collection, documents)
+      : op === 'update'
+        ? unlinkContent(documents).then(() => linkContent(collection, documents))
+        : unlinkContent(documents);
+
+    task.catch(err => fastify.log.error(err, `Failed to update verification item links for ${collection}`));
+  });
+
+  // Links the VIs that have no referenced_names yet: those written before
+  // links were kept, whose existing content was never linked to them
+  async function linkUnindexed() {
+    const started = Date.now();
+    let linkedCount = 0;
+    for (;;) {
+      const cursor = await fastify.db.query(`
+        FOR vi IN vnv
+          FILTER vi.referenced_names == null
+          LIMIT @limit
+          RETURN vi
+      `, { limit: BODY_CHUNK_SIZE });
+      const vis = await cursor.all();
+      if (vis.length === 0) break;
+      await linkVerificationItems(vis);
+      linkedCount += vis.length;
+    }
+    if (linkedCount > 0) {
+      fastify.log.info(`Linked ${linkedCount} verification item(s) to dictionary content in ${Date.now() - started}ms`);
+    }
+  }
+
+  fastify.addHook('onListen', async () => {
+    linkUnindexed().catch(err => fastify.log.error(err, 'Failed to link existing verification items'));
+  });
+
+  fastify.decorate('viLinks', { linkVerificationItems, unlinkVerificationItems, linkWritten, unlinkDeleted });
+}
+
+export default fp(viLinksPlugin, {
+  name: 'vi-links',
+  dependencies: ['fastify-arangodb', 'content-events']
+});
@@ -0,0 +1,105 @@
+import fp from 'fastify-plugin';
+import { PUBLISHED_STATES, WARMUP_VERSIONS } from '../config/env.js';
+import { CONTENT_KINDS } from '../config/contentKinds.js';
+
+// Warms caches for the most recently created published dictionary versions
+// once the server is listening, so the first requests after a deploy do not
+// all go to cold storage. For each version it
+//
+//   - reads every content document of the version through its name index,
+//     filling ArangoDB's block cache with the index and documents
+//   - makes sure the version's content counts are stored
+//   - loads (or builds) the published artifact with its in-memory name
+//     indexes, which serve exports and by-name lookups
+//
+// `/health` answers 503 until the warm-up has finished; its outcome, duration
+// and size are reported by `fastify.warmup.status()`. A failed warm-up is
+// logged and does not keep the service unready.
+async function warmupPlugin(fastify, options) {
+  const versions = options.versions ?? WARMUP_VERSIONS;
+  const status = {
+    state: versions > 0 ? 'pending' : 'disabled',
+    versions: [],
+    documents: 0,
+    artifact_bytes: 0,
+    duration_ms: 0,
+  };
+  let closing = false;
+
+  async function recentPublishedVersions() {
+    const cursor = await fastify.db.query(`
+      FOR d IN dictionary
+        FILTER d.state IN @states
+        SORT d.creation_date DESC
+        LIMIT @versions
+        RETURN { dictionary_type: d.dictionary_type, dictionary_version: d.dictionary_version }
+    `, { states: PUBLISHED_STATES, versions });
+    return cursor.all();
+  }
+
+  async function warmVersion({ dictionary_type, dictionary_version }) {
+    let documents = 0;
+    for (const kind of Object.keys(CONTENT_KINDS)) {
+      const cursor = await fastify.db.query(`
+        FOR doc IN @@col
+          FILTER doc.dictionary_type == @dictionary_type
+            AND doc.dictionary_version == @dictionary_version
+          COLLECT AGGREGATE documents = COUNT(1), attributes = SUM(LENGTH(doc))
+          RETURN { documents, attributes }
+      `, {
+        '@col': fastify.contentCollections.name(kind, dictionary_type, dictionary_version),
+        dictionary_type,
+        dictionary_version
+      });
+      documents += (await cursor.next())?.documents ?? 0;
+      await fastify.contentCounts.get(kind, dictionary_type, dictionary_version);
+    }
+
+    const artifact = await fastify.artifacts.load(dictionary_type, dictionary_version);
+    return { dictionary_type, dictionary_version, documents, artifact_bytes: artifact?.gzipped.length ?? 0 };
+  }
+
+  async function run() {
+    const started = Date.now();
+    status.state = 'running';
+    try {
+      for (const version of await recentPublishedVersions()) {
+        if (closing) break;
+        const warmed = await warmVersion(version);
+        status.versions.push(warmed);
+        status.documents += warmed.documents;
+        status.artifact_bytes += warmed.artifact_bytes;
+      }
+      status.state = 'done';
+    } catch (err) {
+      fastify.log.warn(err, 'Cache warm-up failed');
+      status.state = 'failed';
+    }
+    status.duration_ms = Date.now() - started;
+    fastify.log.info(
+      `Warmed ${status.versions.length} published dictionary version(s), ${status.documents} documents ` +
+      `and ${status.artifact_bytes} artifact bytes in ${status.duration_ms}ms`
+    );
+  }
+
+  if (versions > 0) {
+    // Runs in the background: /health reports the service unready meanwhile
+    fastify.addHook('onListen', async () => {
+      run();
+    });
+  }
+
+  fastify.addHook('onClose', async () => {
+    closing = true;
+  });
+
+  fastify.decorate('warmup', {
+    status: () => status,
+    ready: () => status.state !== 'pending' && status.state !== 'running',
+  });
+}
+
+export default fp(warmupPlugin, {
+  name: 'warmup',
+  dependencies: ['fastify-arangodb', 'content-counts', 'published-artifacts']
+});
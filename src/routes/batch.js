@@ -0,0 +1,95 @@
+import { batchSchema } from '../schemas/batchSchema.js';
+import { SUB_REQUEST_HEADER } from '../plugins/auth.js';
+
+const API_PREFIX = '/api/v4';
+
+// Sub-response headers worth passing back to the caller
+const FORWARDED_HEADERS = ['content-type', 'x-total-count', 'etag'];
+
+export default async function batchRoutes(fastify, options) {
+
+  // Resolves a sub-request url to an absolute /api/v4 path
+  function resolveUrl(url) {
+    return url.startsWith(`${API_PREFIX}/`) ? url : `${API_PREFIX}${url.startsWith('/') ? '' : '/'}${url}`;
+  }
+
+  // Runs one sub-request through the router as the batch's user. Its grant
+  // marks it as a sub-request, so a sub-request that reaches this route
+  // (however its url is spelled) is refused rather than nested.
+  async function dispatch(subRequest, grant) {
+    const url = resolveUrl(subRequest.url);
+    const result = subRequest.id !== undefined ? { id: subRequest.id } : {};
+
+    const headers = {
+      [SUB_REQUEST_HEADER]: grant,
+      accept: 'application/json'
+    };
+    const hasBody = subRequest.body !== undefined && subRequest.method !== 'GET';
+    if (hasBody) {
+      headers['content-type'] = 'application/json';
+    }
+
+    const response = await fastify.inject({
+      method: subRequest.method,
+      url,
+      headers,
+      payload: hasBody ? JSON.stringify(subRequest.body) : undefined
+    });
+
+    const responseHeaders = {};
+    for (const name of FORWARDED_HEADERS) {
+      if (response.headers[name] !== undefined) {
+        responseHeaders[name] = String(response.headers[name]);
+      }
+    }
+
+    let body = response.body;
+    if (String(response.headers['content-type'] ?? '').includes('application/json') && body.length > 0) {
+      try {
+        body = JSON.parse(body);
+      } catch (err) {
+        // Leave malformed JSON as text
+      }
+    }
+
+    return { ...result, status: response.statusCode, headers: responseHeaders, body };
+  }
+
+  // POST /batch
+  fastify.post('/batch', {
+    schema: batchSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { requests, sequential = false } = request.body;
+
+      if (request.headers[SUB_REQUEST_HEADER] !== undefined) {
+        return reply.code(400).send({
+          error: 'Bad Request',
+          message: 'Batch requests cannot be nested'
+        });
+      }
+
+      // The batch is authenticated and rate limited once; its sub-requests are not
+      const { grant, revoke } = fastify.grantSubRequests(request.user);
+      try {
+        if (sequential) {
+          const responses = [];
+          for (const subRequest of requests) {
+            responses.push(await dispatch(subRequest, grant));
+          }
+          return responses;
+        }
+
+        return await Promise.all(requests.map(subRequest => dispatch(subRequest, grant)));
+      } catch (error) {
+        fastify.log.error(error, 'Batch request failed');
+        return reply.code(500).send({
+          error: 'Internal Server Error',
+          message: 'An unexpected error occurred.'
+        });
+      } finally {
+        revoke();
+      }
+    }
+  });
+}
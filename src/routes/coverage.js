@@ -0,0 +1,151 @@
+import { getCoverageSchema, getImpactSchema } from '../schemas/coverageSchema.js';
+import { CONTENT_KINDS, VI_LINK_TARGETS, VI_LINK_COLLECTION } from '../config/contentKinds.js';
+
+// Attributes that differ between versions of an otherwise unchanged element
+const VERSION_ATTRIBUTES = ['_key', '_id', '_rev', 'dictionary_version', 'revision'];
+
+const LINKED_KINDS = Object.values(VI_LINK_TARGETS).map(target => target.kind);
+
+export default async function coverageRoutes(fastify, options) {
+
+  // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/coverage
+  fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/coverage', {
+    config: { admission: 'wild_search' },
+    schema: getCoverageSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+      const { kind = 'channel', covered, limit = 20, offset = 0 } = request.query;
+
+      try {
+        const { nameField } = CONTENT_KINDS[kind];
+        const collection = fastify.contentCollections.name(kind, dictionary_type, dictionary_version);
+
+        let coveredFilter = '';
+        if (covered === true) coveredFilter = 'FILTER LENGTH(vi_ids) > 0';
+        if (covered === false) coveredFilter = 'FILTER LENGTH(vi_ids) == 0';
+
+        const aqlQuery = `
+          FOR doc IN @@col
+            FILTER doc.dictionary_type == @dictionary_type
+              AND doc.dictionary_version == @dictionary_version
+            LET vi_ids = (
+              FOR vi IN 1..1 INBOUND doc @@links
+                SORT vi.vi_id
+                RETURN DISTINCT vi.vi_id
+            )
+            ${coveredFilter}
+            SORT doc.@nameField
+            LIMIT @offset, @limit
+            RETURN { name: doc.@nameField, vi_ids }
+        `;
+
+        const cursor = await fastify.db.query(aqlQuery, {
+          '@col': collection,
+          '@links': VI_LINK_COLLECTION,
+          nameField,
+          dictionary_type,
+          dictionary_version,
+          offset,
+          limit
+        }, { fullCount: true });
+        const items = await cursor.all();
+        const totalCount = cursor.extra?.stats?.fullCount ?? items.length;
+
+        reply.header('x-total-count', totalCount);
+        return items;
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // GET /dictionaries/{dictionary_type}/impact
+  fastify.get('/dictionaries/:dictionary_type/impact', {
+    config: { admission: 'wild_search' },
+    schema: getImpactSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type } = request.params;
+      const { from_version, to_version, kinds = LINKED_KINDS } = request.query;
+
+      try {
+        if (from_version === to_version) {
+          return reply.code(400).send({
+            error: 'Bad Request',
+            message: 'from_version and to_version must differ'
+          });
+        }
+
+        const bindVars = {
+          '@links': VI_LINK_COLLECTION,
+          dictionary_type,
+          from_version,
+          to_version,
+          ignored: VERSION_ATTRIBUTES
+        };
+
+        // Per kind: removed or changed elements of from_version, added elements of to_version,
+        // each followed to the verification items linked to it
+        const subqueries = [...new Set(kinds)].map(kind => {
+          const { nameField } = CONTENT_KINDS[kind];
+          bindVars[`@${kind}_from`] = fastify.contentCollections.name(kind, dictionary_type, from_version);
+          bindVars[`@${kind}_to`] = fastify.contentCollections.name(kind, dictionary_type, to_version);
+
+          const versionMatch = (variable, version, other) => `
+                  FILTER ${variable}.dictionary_type == @dictionary_type
+                    AND ${variable}.dictionary_version == @${version}
+                    AND ${variable}.${nameField} == ${other}.${nameField}`;
+
+          return `
+            UNION(
+              (
+                FOR a IN @@${kind}_from
+                  FILTER a.dictionary_type == @dictionary_type AND a.dictionary_version == @from_version
+                  LET b = FIRST(
+                    FOR x IN @@${kind}_to${versionMatch('x', 'to_version', 'a')}
+                      RETURN x
+                  )
+                  LET change = b == null ? 'removed' : (UNSET(a, @ignored) == UNSET(b, @ignored) ? null : 'changed')
+                  FILTER change != null
+                  FOR vi IN 1..1 INBOUND a @@links
+                    RETURN { vi, kind: '${kind}', name: a.${nameField}, change }
+              ),
+              (
+                FOR b IN @@${kind}_to
+                  FILTER b.dictionary_type == @dictionary_type AND b.dictionary_version == @to_version
+                  LET a = FIRST(
+                    FOR x IN @@${kind}_from${versionMatch('x', 'from_version', 'b')}
+                      RETURN 1
+                  )
+                  FILTER a == null
+                  FOR vi IN 1..1 INBOUND b @@links
+                    RETURN { vi, kind: '${kind}', name: b.${nameField}, change: 'added' }
+              )
+            )`;
+        });
+
+        const changes = subqueries.length === 1 ? subqueries[0] : `UNION(${subqueries.join(',')})`;
+
+        const aqlQuery = `
+          FOR c IN ${changes}
+            COLLECT vi_id = c.vi.vi_id, vi_name = c.vi.vi_name, vi_type = c.vi.vi_type
+              INTO changes = { kind: c.kind, name: c.name, change: c.change }
+            SORT vi_id
+            RETURN { vi_id, vi_name, vi_type, changes }
+        `;
+
+        const cursor = await fastify.db.query(aqlQuery, bindVars);
+        return await cursor.all();
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+}
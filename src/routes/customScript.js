@@ -2,10 +2,12 @@ import {
   getCustomScriptsSchema,
   createCustomScriptSchema,
   bulkQueryCustomScriptsSchema,
+  syncCustomScriptsSchema,
   getCustomScriptByIdSchema,
   updateCustomScriptSchema,
   deleteCustomScriptSchema
 } from '../schemas/customScriptSchema.js';
+import { mapInChunks, saveAllInChunks } from '../utils/chunked.js';
 
 export default async function customScriptRoutes(fastify, options) {
 
@@ -13,6 +15,7 @@ export default async function customScriptRoutes(fastify, options) {
 
   // POST /custom_scripts
   fastify.post('/custom_scripts', {
+    config: { admission: 'bulk_write', chunkedBody: true },
     schema: createCustomScriptSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -20,8 +23,7 @@ export default async function customScriptRoutes(fastify, options) {
       try {
 
         // Step 1: Check for existing scripts with same script_id
-        const scriptIds = newCustomScripts
-          .map(script => script.script_id)
+        const scriptIds = (await mapInChunks(newCustomScripts, script => script.script_id))
           .filter(Boolean);
 
         if (scriptIds.length > 0) {
@@ -42,9 +44,10 @@ export default async function customScriptRoutes(fastify, options) {
         }
 
         // Step 2: Bulk insert
-        const result = await collection.saveAll(newCustomScripts, { returnNew: true });
+        const result = await saveAllInChunks(collection, newCustomScripts, { returnNew: true });
 
         const savedScripts = result.map(r => r.new);
+        fastify.contentEvents.emit('custom_script', { op: 'insert', documents: savedScripts });
         return reply.code(201).send(savedScripts);
 
       } catch (error) {
@@ -58,6 +61,7 @@ export default async function customScriptRoutes(fastify, options) {
 
   // GET /custom_scripts
   fastify.get('/custom_scripts', {
+    config: { singleFlight: true, responseCache: 'custom_script', admission: 'search' },
     schema: getCustomScriptsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -126,6 +130,7 @@ export default async function customScriptRoutes(fastify, options) {
 
   // GET /custom_scripts/{script_id}
   fastify.get('/custom_scripts/:script_id', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: getCustomScriptByIdSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -169,6 +174,7 @@ export default async function customScriptRoutes(fastify, options) {
 
         const updatedCustomScript = request.body;
         const { new: updatedDoc } = await collection.update(existingDoc._key, updatedCustomScript, { returnNew: true });
+        fastify.contentEvents.emit('custom_script', { op: 'update', documents: [updatedDoc], previous: [existingDoc] });
         return updatedDoc;
       } catch (error) {
         reply.code(400).send({
@@ -196,6 +202,7 @@ export default async function customScriptRoutes(fastify, options) {
         }
         // Step 2: Delete by _key
         await collection.remove(existingDoc._key);
+        fastify.contentEvents.emit('custom_script', { op: 'delete', documents: [existingDoc] });
 
         return reply.code(204).send();
       } catch (error) {
@@ -209,6 +216,7 @@ export default async function customScriptRoutes(fastify, options) {
 
   // GET /custom_scripts/bulk_query
   fastify.post('/custom_scripts/bulk_query', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: bulkQueryCustomScriptsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -232,4 +240,117 @@ export default async function customScriptRoutes(fastify, options) {
       }
     }
   });
+
+  // POST /custom_scripts/sync
+  fastify.post('/custom_scripts/sync', {
+    config: { admission: 'bulk_write' },
+    schema: syncCustomScriptsSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { scripts, deactivate_missing = false } = request.body;
+      try {
+        const incoming = scripts.map(script => ({ status: 'ACTIVE', ...script }));
+
+        const seen = new Set();
+        const duplicates = new Set();
+        for (const { script_id } of incoming) {
+          if (seen.has(script_id)) duplicates.add(script_id);
+          seen.add(script_id);
+        }
+        if (duplicates.size > 0) {
+          return reply.code(400).send({
+            error: 'Bad Request',
+            message: `Duplicate script_ids in request: ${[...duplicates].join(', ')}`
+          });
+        }
+
+        // Step 1: Classify every incoming script against the stored hash in one pass
+        const query = `
+          FOR s IN @incoming
+            LET existing = FIRST(
+              FOR doc IN custom_script
+                FILTER doc.script_id == s.script_id
+                RETURN { _key: doc._key, hash: doc.hash, status: doc.status }
+            )
+            FILTER existing == null OR existing.hash != s.hash OR existing.status != s.status
+            RETURN { script_id: s.script_id, _key: existing._key }
+        `;
+        const cursor = await fastify.db.query(query, {
+          incoming: incoming.map(({ script_id, hash, status }) => ({ script_id, hash, status }))
+        });
+        const changes = await cursor.all();
+
+        const byId = new Map(incoming.map(script => [script.script_id, script]));
+        const toInsert = changes.filter(change => !change._key).map(change => byId.get(change.script_id));
+        const toUpdate = changes.filter(change => change._key)
+          .map(change => ({ ...byId.get(change.script_id), _key: change._key }));
+
+        // Step 2: Write only new and changed scripts. Scripts the database
+        // refused are reported as failed rather than as written.
+        const inserted = [];
+        const updated = [];
+        const failed = [];
+        const collectFailures = (scripts, result) => scripts.forEach((script, i) => {
+          if (result[i].error) failed.push({ script_id: script.script_id, message: result[i].errorMessage });
+        });
+
+        if (toInsert.length > 0) {
+          const result = await collection.saveAll(toInsert, { returnNew: true });
+          collectFailures(toInsert, result);
+          const saved = result.filter(r => !r.error);
+          inserted.push(...saved.map(r => r.new.script_id));
+          if (saved.length > 0) {
+            fastify.contentEvents.emit('custom_script', { op: 'insert', documents: saved.map(r => r.new) });
+          }
+        }
+        if (toUpdate.length > 0) {
+          const result = await collection.updateAll(toUpdate, { returnNew: true, returnOld: true, mergeObjects: false });
+          collectFailures(toUpdate, result);
+          const saved = result.filter(r => !r.error);
+          updated.push(...saved.map(r => r.new.script_id));
+          if (saved.length > 0) {
+            fastify.contentEvents.emit('custom_script', {
+              op: 'update',
+              documents: saved.map(r => r.new),
+              previous: saved.map(r => r.old)
+            });
+          }
+        }
+
+        // Step 3: Optionally retire registered scripts missing from the set
+        let deactivated = [];
+        if (deactivate_missing) {
+          const deactivateQuery = `
+            FOR doc IN custom_script
+              FILTER doc.script_id NOT IN @script_ids AND doc.status != 'INACTIVE'
+              UPDATE doc WITH { status: 'INACTIVE' } IN custom_script
+              RETURN { new: NEW, old: OLD }
+          `;
+          const deactivateCursor = await fastify.db.query(deactivateQuery, { script_ids: [...seen] });
+          const result = await deactivateCursor.all();
+          if (result.length > 0) {
+            fastify.contentEvents.emit('custom_script', {
+              op: 'update',
+              documents: result.map(r => r.new),
+              previous: result.map(r => r.old)
+            });
+          }
+          deactivated = result.map(r => r.new.script_id);
+        }
+
+        return {
+          inserted,
+          updated,
+          deactivated,
+          unchanged: incoming.length - changes.length,
+          failed
+        };
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
 }
@@ -1,4 +1,4 @@
-import { getDictionariesSchema, createDictionarySchema, getDictionaryByVersionSchema, deleteDictionarySchema, updateDictionarySchema } from '../schemas/dictionarySchema.js'
+import { getDictionariesSchema, createDictionarySchema, getDictionaryByVersionSchema, getDictionarySummarySchema, deleteDictionarySchema, updateDictionarySchema } from '../schemas/dictionarySchema.js'
 import { COLLECTION_NAMES } from '../config/env.js'
 
 export default async function dictionaryRoutes(fastify, options) {
@@ -46,6 +46,7 @@ export default async function dictionaryRoutes(fastify, options) {
             dictionary_description: @dictionary_description,
             dictionary_version: @dictionary_version,
             state: @state,
+            content_counts: @content_counts,
             creation_date: DATE_ISO8601(DATE_NOW())
           } INTO dictionary
           RETURN NEW
@@ -55,9 +56,11 @@ export default async function dictionaryRoutes(fastify, options) {
           dictionary_type,
           dictionary_description,
           dictionary_version,
-          state
+          state,
+          content_counts: fastify.contentCounts.initial()
         };
 
+        await fastify.contentCollections.ensure(dictionary_type, dictionary_version);
         const cursor = await fastify.db.query(insertQuery, bindVars);
         const [newDictionary] = await cursor.all();
 
@@ -121,7 +124,7 @@ export default async function dictionaryRoutes(fastify, options) {
             ${filterClause}
             SORT doc.${dbSortBy} ${sort.toUpperCase()}
             LIMIT @offset, @limit
-            RETURN doc
+            RETURN UNSET(doc, 'summary')
         `;
 
         const options = { fullCount: true };
@@ -169,6 +172,31 @@ export default async function dictionaryRoutes(fastify, options) {
     }
   });
 
+  // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/summary
+  fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/summary', {
+    schema: getDictionarySummarySchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+
+      try {
+        const summary = await fastify.dictionarySummary.get(dictionary_type, dictionary_version);
+
+        if (!summary) {
+          return reply.code(404).send({
+            message: `The requested resource was not found.`
+          });
+        }
+        return summary;
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
   // PATCH /dictionaries/{dictionary_type}/versions/{dictionary_version}
   fastify.patch('/dictionaries/:dictionary_type/versions/:dictionary_version', {
     schema: updateDictionarySchema,
@@ -193,6 +221,13 @@ export default async function dictionaryRoutes(fastify, options) {
         if (state !== undefined) updateData.state = state;
 
         const { new: updatedDoc } = await collection.update(existingDoc._key, updateData, { returnNew: true });
+        fastify.contentEvents.emit('dictionary', {
+          dictionary_type,
+          dictionary_version,
+          op: 'update',
+          state: updatedDoc.state,
+          previousState: existingDoc.state
+        });
 
         return { dictionary_info: updatedDoc };
       } catch (error) {
@@ -221,8 +256,12 @@ export default async function dictionaryRoutes(fastify, options) {
           });
         }
 
-        // Step 1: Bulk delete related dictionary_content documents using AQL
-        const collectionNames = ['command', 'channel', 'evr', 'mil1553', 'vnv', 'custom_script']
+        // Step 1: Bulk delete related dictionary_content documents using AQL,
+        // or drop the version's own content collections in the per_version layout
+        const collectionNames = ['vnv', 'custom_script', 'vi_links', 'content_tombstone', 'enumeration_set']
+        if (!(await fastify.contentCollections.drop(dictionary_type, dictionary_version))) {
+          collectionNames.unshift('command', 'channel', 'evr', 'mil1553')
+        }
 
         for (const col of collectionNames) {
           const aql = `
@@ -236,6 +275,12 @@ export default async function dictionaryRoutes(fastify, options) {
 
         // Step 2: Remove the dictionary document
         await collection.remove(existingDoc._key);
+        fastify.contentEvents.emit('dictionary', {
+          dictionary_type,
+          dictionary_version,
+          op: 'delete',
+          previousState: existingDoc.state
+        });
 
 
         return reply.code(204).send();
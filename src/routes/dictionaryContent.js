@@ -23,19 +23,56 @@ import {
   getMil1553VariableByNameSchema,
   updateMil1553VariableSchema,
   deleteMil1553VariableSchema,
+  searchDictionaryContentSchema,
+  suggestNamesSchema,
+  getDictionaryContentChangesSchema,
+  exportDictionaryContentSchema,
+  importDictionaryXmlSchema,
 } from '../schemas/dictionaryContentSchema.js'
+import {
+  CONTENT_KINDS,
+  VI_SEARCH_FIELDS,
+  SEARCH_VIEW_NAME,
+  SEARCH_ANALYZER_NAME,
+  CONTENT_TOMBSTONE_COLLECTION,
+  VI_LINK_COLLECTION
+} from '../config/contentKinds.js'
+import { mapInChunks } from '../utils/chunked.js'
+import { parseAcceptHeader, acceptQuality } from '../utils/accept.js'
+import { createDictionaryXmlParser, XML_RECORD_SCHEMAS } from '../utils/dictionaryXml.js'
+import { BODY_CHUNK_SIZE } from '../config/env.js'
 
 export default async function dictionaryContentRoutes(fastify, options) {
 
   const dictionaryCollection = fastify.db.collection('dictionary')
-  const commandCollection = fastify.db.collection('command')
-  const evrCollection = fastify.db.collection('evr')
-  const channelCollection = fastify.db.collection('channel')
-  const mil1553Collection = fastify.db.collection('mil1553')
+  // Collection holding a kind of content of the version named in the request's params
+  const contentCollection = (kind, { dictionary_type, dictionary_version }) =>
+    fastify.contentCollections.collection(kind, dictionary_type, dictionary_version)
+  const contentCollectionName = (kind, { dictionary_type, dictionary_version }) =>
+    fastify.contentCollections.name(kind, dictionary_type, dictionary_version)
+
+  // Splits the results of a bulk insert into the documents that were saved
+  // and the `field` values of those that were not, e.g. ones repeated within a request
+  const splitSaved = (results, documents, field) => ({
+    saved: results.filter(r => !r.error).map(r => r.new),
+    failed: documents.filter((doc, i) => results[i].error).map(doc => doc[field])
+  });
+
+  // Puts shared enumeration sets back into elements when the request asks for `expand=enumerations`
+  const withEnumerations = (request, documents) => request.query.expand === 'enumerations'
+    ? fastify.enumerationSets.expand(request.params.dictionary_type, request.params.dictionary_version, documents)
+    : documents;
+
+  // XML dictionaries are handed to the import route as the raw request
+  // stream and parsed while they are received
+  fastify.addContentTypeParser(['application/xml', 'text/xml'], (request, payload, done) => {
+    done(null, payload);
+  });
 
   // ====== CMDS =======
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/cmds
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/cmds', {
+    config: { admission: 'bulk_write', chunkedBody: true },
     schema: createCommandSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -55,26 +92,25 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 2: Enrich each command with dictionary metadata
-        const enrichedCommands = newCommands.map(cmd => ({
+        const enrichedCommands = await mapInChunks(newCommands, cmd => ({
           ...cmd,
           dictionary_type,
           dictionary_version
         }));
 
         // Step 3: Check for duplicate command_stem values
-        const commandStems = enrichedCommands
-          .map(cmd => cmd.command_stem)
+        const commandStems = (await mapInChunks(enrichedCommands, cmd => cmd.command_stem))
           .filter(Boolean);
 
         if (commandStems.length > 0) {
           const query = `
-            FOR doc IN command
+            FOR doc IN @@collection
               FILTER doc.command_stem IN @commandStems
                 AND doc.dictionary_type == @dictionary_type
                 AND doc.dictionary_version == @dictionary_version
               RETURN doc.command_stem
           `;
-          const dupCursor = await fastify.db.query(query, { commandStems, dictionary_type, dictionary_version });
+          const dupCursor = await fastify.db.query(query, { commandStems, dictionary_type, dictionary_version, '@collection': contentCollectionName('command', request.params) });
           const existingStems = await dupCursor.all();
 
           if (existingStems.length > 0) {
@@ -86,8 +122,18 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 4: Save all commands in bulk
-        const result = await commandCollection.saveAll(enrichedCommands, { returnNew: true });
-        const savedCommands = result.map(r => r.new);
+        const result = await fastify.contentRevisions.saveAll(contentCollection('command', request.params), dictionary_type, dictionary_version, enrichedCommands);
+        const { saved: savedCommands, failed } = splitSaved(result, enrichedCommands, 'command_stem');
+        if (savedCommands.length > 0) {
+          await fastify.contentCounts.adjust('command', dictionary_type, dictionary_version, savedCommands.length);
+          fastify.contentEvents.emit('content', { collection: 'command', dictionary_type, dictionary_version, op: 'insert', documents: savedCommands });
+        }
+        if (failed.length > 0) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: `Commands with the following command_stem values could not be saved (they may be repeated in the request): ${failed.join(', ')}. The other ${savedCommands.length} were saved.`
+          });
+        }
 
         return reply.code(201).send(savedCommands);
 
@@ -103,6 +149,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/cmds
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/cmds', {
+    config: { singleFlight: true, responseCache: 'dictionary', admission: 'search' },
     schema: getCommandsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -112,6 +159,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
         limit = 20,
         offset = 0,
         wild = false,
+        count = 'exact',
         command_stem,
         ops_cat,
         command_description
@@ -141,19 +189,26 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const filterClause = filters.length ? `FILTER ${filters.join(' AND ')}` : '';
 
         const aqlQuery = `
-          FOR doc IN command
+          FOR doc IN @@collection
             ${filterClause}
             SORT doc.command_stem ${sort.toUpperCase()}
             LIMIT @offset, @limit
             RETURN doc
         `;
 
-        const cursor = await fastify.db.query(aqlQuery, { ...bindVars, dictionary_type, dictionary_version, limit, offset }, { fullCount: true });
-        const items = await cursor.all();
-
-        const totalCount = cursor.extra?.stats?.fullCount ?? items.length;
+        const { items, totalCount } = await fastify.contentCounts.queryPage({
+          collection: 'command',
+          dictionary_type,
+          dictionary_version,
+          aqlQuery,
+          bindVars: { ...bindVars, dictionary_type, dictionary_version, limit, offset, '@collection': contentCollectionName('command', request.params) },
+          filtered: filters.length > 2,
+          count,
+          offset,
+          limit
+        });
 
-        reply.header('x-total-count', totalCount);
+        if (totalCount !== null) reply.header('x-total-count', totalCount);
         return items;
 
       } catch (error) {
@@ -167,6 +222,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/cmds/bulk_query
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/cmds/bulk_query', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: bulkQueryCommandsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -174,8 +230,11 @@ export default async function dictionaryContentRoutes(fastify, options) {
       const command_stems = request.body;
 
       try {
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) return artifact.findMany('command', command_stems);
+
         const query = `
-          FOR doc IN command
+          FOR doc IN @@collection
             FILTER doc.dictionary_type == @dictionary_type
               AND doc.dictionary_version == @dictionary_version
               AND doc.command_stem IN @command_stems
@@ -185,7 +244,8 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const cursor = await fastify.db.query(query, {
           dictionary_type,
           dictionary_version,
-          command_stems
+          command_stems,
+          '@collection': contentCollectionName('command', request.params)
         });
 
         const commands = await cursor.all();
@@ -201,14 +261,27 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/cmds/{cmd_stem}
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/cmds/:cmd_stem', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: getCommandByStemSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
       const { dictionary_type, dictionary_version, cmd_stem } = request.params;
 
       try {
+        // Published versions are served from their prebuilt artifact
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) {
+          const doc = artifact.find('command', cmd_stem);
+          if (!doc) {
+            return reply.code(404).send({
+              message: `The requested resource was not found.`
+            });
+          }
+          return doc;
+        }
+
         // 1. Find document 
-        const cursor = await commandCollection.byExample({ dictionary_type, dictionary_version, command_stem: cmd_stem })
+        const cursor = await contentCollection('command', request.params).byExample({ dictionary_type, dictionary_version, command_stem: cmd_stem })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -236,7 +309,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await commandCollection.byExample({ dictionary_type, dictionary_version, command_stem: cmd_stem })
+        const cursor = await contentCollection('command', request.params).byExample({ dictionary_type, dictionary_version, command_stem: cmd_stem })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -244,7 +317,8 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
 
-        const { new: updatedDoc } = await commandCollection.update(existingDoc._key, patchCommand, { returnNew: true });
+        const { new: updatedDoc } = await fastify.contentRevisions.update(contentCollection('command', request.params), existingDoc, patchCommand);
+        fastify.contentEvents.emit('content', { collection: 'command', dictionary_type, dictionary_version, op: 'update', documents: [updatedDoc], previous: [existingDoc] });
         return updatedDoc;
       } catch (error) {
         reply.code(400).send({
@@ -264,7 +338,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await commandCollection.byExample({ dictionary_type, dictionary_version, command_stem: cmd_stem })
+        const cursor = await contentCollection('command', request.params).byExample({ dictionary_type, dictionary_version, command_stem: cmd_stem })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -272,7 +346,9 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
         // Step 2: Delete by _key
-        await commandCollection.remove(existingDoc._key);
+        await fastify.contentRevisions.remove(contentCollection('command', request.params), existingDoc);
+        await fastify.contentCounts.adjust('command', dictionary_type, dictionary_version, -1);
+        fastify.contentEvents.emit('content', { collection: 'command', dictionary_type, dictionary_version, op: 'delete', documents: [existingDoc] });
 
         return reply.code(204).send();
       } catch (error) {
@@ -287,6 +363,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
   // ====== EVRS =======
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/evrs
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/evrs', {
+    config: { admission: 'bulk_write', chunkedBody: true },
     schema: createEvrSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -306,26 +383,25 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 2: Enrich EVRs with dictionary metadata
-        const enrichedEvrs = newEvrs.map(evr => ({
+        const enrichedEvrs = await mapInChunks(newEvrs, evr => ({
           ...evr,
           dictionary_type,
           dictionary_version
         }));
 
         // Step 3: Check for duplicate evr_id values
-        const evrIds = enrichedEvrs
-          .map(evr => evr.evr_id)
+        const evrIds = (await mapInChunks(enrichedEvrs, evr => evr.evr_id))
           .filter(Boolean);
 
         if (evrIds.length > 0) {
           const query = `
-            FOR doc IN evr
+            FOR doc IN @@collection
               FILTER doc.evr_id IN @evrIds
                 AND doc.dictionary_type == @dictionary_type
                 AND doc.dictionary_version == @dictionary_version
               RETURN doc.evr_id
           `;
-          const dupCursor = await fastify.db.query(query, { evrIds, dictionary_type, dictionary_version });
+          const dupCursor = await fastify.db.query(query, { evrIds, dictionary_type, dictionary_version, '@collection': contentCollectionName('evr', request.params) });
           const existingEvrs = await dupCursor.all();
 
           if (existingEvrs.length > 0) {
@@ -337,8 +413,18 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 4: Bulk insert using saveAll
-        const result = await evrCollection.saveAll(enrichedEvrs, { returnNew: true });
-        const savedEvrs = result.map(r => r.new);
+        const result = await fastify.contentRevisions.saveAll(contentCollection('evr', request.params), dictionary_type, dictionary_version, enrichedEvrs);
+        const { saved: savedEvrs, failed } = splitSaved(result, enrichedEvrs, 'evr_id');
+        if (savedEvrs.length > 0) {
+          await fastify.contentCounts.adjust('evr', dictionary_type, dictionary_version, savedEvrs.length);
+          fastify.contentEvents.emit('content', { collection: 'evr', dictionary_type, dictionary_version, op: 'insert', documents: savedEvrs });
+        }
+        if (failed.length > 0) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: `EVRs with the following evr_id values could not be saved (they may be repeated in the request): ${failed.join(', ')}. The other ${savedEvrs.length} were saved.`
+          });
+        }
 
         return reply.code(201).send(savedEvrs);
       } catch (error) {
@@ -353,6 +439,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/evrs
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/evrs', {
+    config: { singleFlight: true, responseCache: 'dictionary', admission: 'search' },
     schema: getEvrsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -362,6 +449,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
         limit = 20,
         offset = 0,
         wild = false,
+        count = 'exact',
         evr_id,
         evr_name,
         evr_level,
@@ -397,19 +485,26 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const filterClause = filters.length ? `FILTER ${filters.join(' AND ')}` : '';
 
         const aqlQuery = `
-          FOR doc IN evr
+          FOR doc IN @@collection
             ${filterClause}
             SORT doc.evr_name ${sort.toUpperCase()}
             LIMIT @offset, @limit
             RETURN doc
         `;
 
-        const cursor = await fastify.db.query(aqlQuery, { ...bindVars, dictionary_type, dictionary_version, limit, offset }, { fullCount: true });
-
-        const items = await cursor.all();
-        const totalCount = cursor.extra?.stats?.fullCount ?? items.length;
+        const { items, totalCount } = await fastify.contentCounts.queryPage({
+          collection: 'evr',
+          dictionary_type,
+          dictionary_version,
+          aqlQuery,
+          bindVars: { ...bindVars, dictionary_type, dictionary_version, limit, offset, '@collection': contentCollectionName('evr', request.params) },
+          filtered: filters.length > 2,
+          count,
+          offset,
+          limit
+        });
 
-        reply.header('x-total-count', totalCount);
+        if (totalCount !== null) reply.header('x-total-count', totalCount);
         return items;
 
       } catch (error) {
@@ -423,6 +518,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/evrs/bulk_query
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/evrs/bulk_query', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: bulkQueryEvrsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -430,8 +526,11 @@ export default async function dictionaryContentRoutes(fastify, options) {
       const evr_names = request.body;
 
       try {
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) return artifact.findMany('evr', evr_names);
+
         const query = `
-          FOR doc IN evr
+          FOR doc IN @@collection
             FILTER doc.dictionary_type == @dictionary_type
               AND doc.dictionary_version == @dictionary_version
               AND doc.evr_name IN @evr_names
@@ -440,7 +539,8 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const cursor = await fastify.db.query(query, {
           dictionary_type,
           dictionary_version,
-          evr_names
+          evr_names,
+          '@collection': contentCollectionName('evr', request.params)
         });
 
         const evers = await cursor.all();
@@ -456,14 +556,27 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/evrs/{evr_name}
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/evrs/:evr_name', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: getEvrByNameSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
       const { dictionary_type, dictionary_version, evr_name } = request.params;
 
       try {
+        // Published versions are served from their prebuilt artifact
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) {
+          const doc = artifact.find('evr', evr_name);
+          if (!doc) {
+            return reply.code(404).send({
+              message: `The requested resource was not found.`
+            });
+          }
+          return doc;
+        }
+
         // 1. Find document 
-        const cursor = await evrCollection.byExample({ dictionary_type, dictionary_version, evr_name })
+        const cursor = await contentCollection('evr', request.params).byExample({ dictionary_type, dictionary_version, evr_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -491,7 +604,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await evrCollection.byExample({ dictionary_type, dictionary_version, evr_name })
+        const cursor = await contentCollection('evr', request.params).byExample({ dictionary_type, dictionary_version, evr_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -499,7 +612,8 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
 
-        const { new: updatedDoc } = await evrCollection.update(existingDoc._key, patchEvr, { returnNew: true });
+        const { new: updatedDoc } = await fastify.contentRevisions.update(contentCollection('evr', request.params), existingDoc, patchEvr);
+        fastify.contentEvents.emit('content', { collection: 'evr', dictionary_type, dictionary_version, op: 'update', documents: [updatedDoc], previous: [existingDoc] });
         return updatedDoc;
 
       } catch (error) {
@@ -520,7 +634,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await evrCollection.byExample({ dictionary_type, dictionary_version, evr_name })
+        const cursor = await contentCollection('evr', request.params).byExample({ dictionary_type, dictionary_version, evr_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -528,7 +642,9 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
         // Step 2: Delete by _key
-        await evrCollection.remove(existingDoc._key);
+        await fastify.contentRevisions.remove(contentCollection('evr', request.params), existingDoc);
+        await fastify.contentCounts.adjust('evr', dictionary_type, dictionary_version, -1);
+        fastify.contentEvents.emit('content', { collection: 'evr', dictionary_type, dictionary_version, op: 'delete', documents: [existingDoc] });
 
         return reply.code(204).send();
       } catch (error) {
@@ -543,6 +659,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
   // ====== CHANNELS =======
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/channels
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/channels', {
+    config: { admission: 'bulk_write', chunkedBody: true },
     schema: createChannelSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -562,26 +679,25 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 2: Enrich each channel with dictionary metadata
-        const enrichedChannels = newChannels.map(channel => ({
+        const enrichedChannels = await mapInChunks(newChannels, channel => ({
           ...channel,
           dictionary_type,
           dictionary_version
         }));
 
         // Step 3: Check for duplicate channel_id values
-        const channelIds = enrichedChannels
-          .map(c => c.channel_id)
+        const channelIds = (await mapInChunks(enrichedChannels, c => c.channel_id))
           .filter(Boolean);
 
         if (channelIds.length > 0) {
           const query = `
-            FOR doc IN channel
+            FOR doc IN @@collection
               FILTER doc.channel_id IN @channelIds
                 AND doc.dictionary_type == @dictionary_type
                 AND doc.dictionary_version == @dictionary_version
               RETURN doc.channel_id
           `;
-          const dupCursor = await fastify.db.query(query, { channelIds, dictionary_type, dictionary_version });
+          const dupCursor = await fastify.db.query(query, { channelIds, dictionary_type, dictionary_version, '@collection': contentCollectionName('channel', request.params) });
           const existingIds = await dupCursor.all();
 
           if (existingIds.length > 0) {
@@ -593,8 +709,19 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 4: Bulk insert using saveAll
-        const result = await channelCollection.saveAll(enrichedChannels, { returnNew: true });
-        const savedChannels = result.map(r => r.new);
+        await fastify.enumerationSets.share(dictionary_type, dictionary_version, enrichedChannels);
+        const result = await fastify.contentRevisions.saveAll(contentCollection('channel', request.params), dictionary_type, dictionary_version, enrichedChannels);
+        const { saved: savedChannels, failed } = splitSaved(result, enrichedChannels, 'channel_id');
+        if (savedChannels.length > 0) {
+          await fastify.contentCounts.adjust('channel', dictionary_type, dictionary_version, savedChannels.length);
+          fastify.contentEvents.emit('content', { collection: 'channel', dictionary_type, dictionary_version, op: 'insert', documents: savedChannels });
+        }
+        if (failed.length > 0) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: `Channels with the following channel_id values could not be saved (they may be repeated in the request): ${failed.join(', ')}. The other ${savedChannels.length} were saved.`
+          });
+        }
 
         return reply.code(201).send(savedChannels);
       } catch (error) {
@@ -609,6 +736,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/channels
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/channels', {
+    config: { singleFlight: true, responseCache: 'dictionary', admission: 'search' },
     schema: getChannelsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -618,6 +746,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
         limit = 20,
         offset = 0,
         wild = false,
+        count = 'exact',
         channel_name,
         description,
         ops_cat,
@@ -651,20 +780,27 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const filterClause = filters.length ? `FILTER ${filters.join(' AND ')}` : '';
 
         const aqlQuery = `
-          FOR doc IN channel
+          FOR doc IN @@collection
             ${filterClause}
             SORT doc.channel_name ${sort.toUpperCase()}
             LIMIT @offset, @limit
             RETURN doc
         `;
 
-        const cursor = await fastify.db.query(aqlQuery, { ...bindVars, dictionary_type, dictionary_version, limit, offset }, { fullCount: true });
+        const { items, totalCount } = await fastify.contentCounts.queryPage({
+          collection: 'channel',
+          dictionary_type,
+          dictionary_version,
+          aqlQuery,
+          bindVars: { ...bindVars, dictionary_type, dictionary_version, limit, offset, '@collection': contentCollectionName('channel', request.params) },
+          filtered: filters.length > 2,
+          count,
+          offset,
+          limit
+        });
 
-        const items = await cursor.all();
-        const totalCount = cursor.extra?.stats?.fullCount ?? items.length;
-
-        reply.header('x-total-count', totalCount);
-        return items;
+        if (totalCount !== null) reply.header('x-total-count', totalCount);
+        return withEnumerations(request, items);
 
 
       } catch (error) {
@@ -678,6 +814,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/channels/bulk_query
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/channels/bulk_query', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: bulkQueryChannelsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -685,8 +822,11 @@ export default async function dictionaryContentRoutes(fastify, options) {
       const channel_names = request.body;
 
       try {
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) return withEnumerations(request, artifact.findMany('channel', channel_names));
+
         const query = `
-          FOR doc IN channel
+          FOR doc IN @@collection
             FILTER doc.dictionary_type == @dictionary_type
               AND doc.dictionary_version == @dictionary_version
               AND doc.channel_name IN @channel_names
@@ -696,11 +836,12 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const cursor = await fastify.db.query(query, {
           dictionary_type,
           dictionary_version,
-          channel_names
+          channel_names,
+          '@collection': contentCollectionName('channel', request.params)
         });
 
         const channels = await cursor.all();
-        return channels
+        return withEnumerations(request, channels);
       } catch (error) {
         reply.code(400).send({
           error: 'Bad Request',
@@ -712,21 +853,34 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/channels/{channel_name}
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/channels/:channel_name', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: getChannelByNameSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
       const { dictionary_type, dictionary_version, channel_name } = request.params;
 
       try {
+        // Published versions are served from their prebuilt artifact
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) {
+          const doc = artifact.find('channel', channel_name);
+          if (!doc) {
+            return reply.code(404).send({
+              message: `The requested resource was not found.`
+            });
+          }
+          return (await withEnumerations(request, [doc]))[0];
+        }
+
         // 1. Find document 
-        const cursor = await channelCollection.byExample({ dictionary_type, dictionary_version, channel_name })
+        const cursor = await contentCollection('channel', request.params).byExample({ dictionary_type, dictionary_version, channel_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
             message: `The requested resource was not found.`
           });
         }
-        return existingDoc
+        return (await withEnumerations(request, [existingDoc]))[0];
       } catch (error) {
         reply.code(400).send({
           error: 'Bad Request',
@@ -746,7 +900,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await channelCollection.byExample({ dictionary_type, dictionary_version, channel_name })
+        const cursor = await contentCollection('channel', request.params).byExample({ dictionary_type, dictionary_version, channel_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -754,7 +908,9 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
 
-        const { new: updatedDoc } = await channelCollection.update(existingDoc._key, patchChannel, { returnNew: true });
+        const updateOptions = await fastify.enumerationSets.sharePatch(dictionary_type, dictionary_version, patchChannel);
+        const { new: updatedDoc } = await fastify.contentRevisions.update(contentCollection('channel', request.params), existingDoc, patchChannel, updateOptions);
+        fastify.contentEvents.emit('content', { collection: 'channel', dictionary_type, dictionary_version, op: 'update', documents: [updatedDoc], previous: [existingDoc] });
         return updatedDoc;
 
       } catch (error) {
@@ -775,7 +931,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await channelCollection.byExample({ dictionary_type, dictionary_version, channel_name })
+        const cursor = await contentCollection('channel', request.params).byExample({ dictionary_type, dictionary_version, channel_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -783,7 +939,9 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
         // Step 2: Delete by _key
-        await channelCollection.remove(existingDoc._key);
+        await fastify.contentRevisions.remove(contentCollection('channel', request.params), existingDoc);
+        await fastify.contentCounts.adjust('channel', dictionary_type, dictionary_version, -1);
+        fastify.contentEvents.emit('content', { collection: 'channel', dictionary_type, dictionary_version, op: 'delete', documents: [existingDoc] });
 
         return reply.code(204).send();
       } catch (error) {
@@ -798,6 +956,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
   // ====== MIL1553 =======
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/mil1553
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/mil1553', {
+    config: { admission: 'bulk_write', chunkedBody: true },
     schema: createMil1553VariableSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -817,26 +976,25 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 2: Enrich items with dictionary metadata
-        const enrichedMil1553s = newMil1553s.map(item => ({
+        const enrichedMil1553s = await mapInChunks(newMil1553s, item => ({
           ...item,
           dictionary_type,
           dictionary_version
         }));
 
         // Step 3: Check for duplicate mil1553_name values
-        const milNames = enrichedMil1553s
-          .map(item => item.mil1553_name)
+        const milNames = (await mapInChunks(enrichedMil1553s, item => item.mil1553_name))
           .filter(Boolean);
 
         if (milNames.length > 0) {
           const query = `
-            FOR doc IN mil1553
+            FOR doc IN @@collection
               FILTER doc.mil1553_name IN @milNames
                 AND doc.dictionary_type == @dictionary_type
                 AND doc.dictionary_version == @dictionary_version
               RETURN doc.mil1553_name
           `;
-          const dupCursor = await fastify.db.query(query, { milNames, dictionary_type, dictionary_version });
+          const dupCursor = await fastify.db.query(query, { milNames, dictionary_type, dictionary_version, '@collection': contentCollectionName('mil1553', request.params) });
           const existingNames = await dupCursor.all();
 
           if (existingNames.length > 0) {
@@ -848,8 +1006,19 @@ export default async function dictionaryContentRoutes(fastify, options) {
         }
 
         // Step 4: Save all using saveAll()
-        const result = await mil1553Collection.saveAll(enrichedMil1553s, { returnNew: true });
-        const savedMil1553s = result.map(r => r.new);
+        await fastify.enumerationSets.share(dictionary_type, dictionary_version, enrichedMil1553s);
+        const result = await fastify.contentRevisions.saveAll(contentCollection('mil1553', request.params), dictionary_type, dictionary_version, enrichedMil1553s);
+        const { saved: savedMil1553s, failed } = splitSaved(result, enrichedMil1553s, 'mil1553_name');
+        if (savedMil1553s.length > 0) {
+          await fastify.contentCounts.adjust('mil1553', dictionary_type, dictionary_version, savedMil1553s.length);
+          fastify.contentEvents.emit('content', { collection: 'mil1553', dictionary_type, dictionary_version, op: 'insert', documents: savedMil1553s });
+        }
+        if (failed.length > 0) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: `MIL-1553 items with the following mil1553_name values could not be saved (they may be repeated in the request): ${failed.join(', ')}. The other ${savedMil1553s.length} were saved.`
+          });
+        }
 
         return reply.code(201).send(savedMil1553s);
       } catch (error) {
@@ -864,6 +1033,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/mil1553    
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/mil1553', {
+    config: { singleFlight: true, responseCache: 'dictionary', admission: 'search' },
     schema: getMil1553VariablesSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -873,6 +1043,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
         limit = 20,
         offset = 0,
         wild = false,
+        count = 'exact',
         mil1553_name,
         ops_cat,
         description,
@@ -910,20 +1081,27 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const filterClause = filters.length ? `FILTER ${filters.join(' AND ')}` : '';
 
         const aqlQuery = `
-          FOR doc IN mil1553
+          FOR doc IN @@collection
             ${filterClause}
             SORT doc.mil1553_name ${sort.toUpperCase()}
             LIMIT @offset, @limit
             RETURN doc
         `;
 
-        const cursor = await fastify.db.query(aqlQuery, { ...bindVars, dictionary_type, dictionary_version, limit, offset }, { fullCount: true });
-
-        const items = await cursor.all();
-        const totalCount = cursor.extra?.stats?.fullCount ?? items.length;
+        const { items, totalCount } = await fastify.contentCounts.queryPage({
+          collection: 'mil1553',
+          dictionary_type,
+          dictionary_version,
+          aqlQuery,
+          bindVars: { ...bindVars, dictionary_type, dictionary_version, limit, offset, '@collection': contentCollectionName('mil1553', request.params) },
+          filtered: filters.length > 2,
+          count,
+          offset,
+          limit
+        });
 
-        reply.header('x-total-count', totalCount);
-        return items;
+        if (totalCount !== null) reply.header('x-total-count', totalCount);
+        return withEnumerations(request, items);
       } catch (error) {
         reply.code(400).send({
           error: 'Bad Request',
@@ -935,6 +1113,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/mil1553/bulk_query
   fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/mil1553/bulk_query', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: bulkQueryMil1553VariablesSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -942,8 +1121,11 @@ export default async function dictionaryContentRoutes(fastify, options) {
       const mil1553_names = request.body;
 
       try {
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) return withEnumerations(request, artifact.findMany('mil1553', mil1553_names));
+
         const query = `
-          FOR doc IN mil1553
+          FOR doc IN @@collection
             FILTER doc.dictionary_type == @dictionary_type
               AND doc.dictionary_version == @dictionary_version
               AND doc.mil1553_name IN @mil1553_names
@@ -953,11 +1135,12 @@ export default async function dictionaryContentRoutes(fastify, options) {
         const cursor = await fastify.db.query(query, {
           dictionary_type,
           dictionary_version,
-          mil1553_names
+          mil1553_names,
+          '@collection': contentCollectionName('mil1553', request.params)
         });
 
         const channels = await cursor.all();
-        return channels
+        return withEnumerations(request, channels);
       } catch (error) {
         reply.code(400).send({
           error: 'Bad Request',
@@ -969,21 +1152,34 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
   // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/mil1553/{mil1553_name}
   fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/mil1553/:mil1553_name', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: getMil1553VariableByNameSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
       const { dictionary_type, dictionary_version, mil1553_name } = request.params;
 
       try {
+        // Published versions are served from their prebuilt artifact
+        const artifact = await fastify.artifacts.lookup(dictionary_type, dictionary_version);
+        if (artifact) {
+          const doc = artifact.find('mil1553', mil1553_name);
+          if (!doc) {
+            return reply.code(404).send({
+              message: `The requested resource was not found.`
+            });
+          }
+          return (await withEnumerations(request, [doc]))[0];
+        }
+
         // 1. Find document 
-        const cursor = await mil1553Collection.byExample({ dictionary_type, dictionary_version, mil1553_name })
+        const cursor = await contentCollection('mil1553', request.params).byExample({ dictionary_type, dictionary_version, mil1553_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
             message: `The requested resource was not found.`
           });
         }
-        return existingDoc
+        return (await withEnumerations(request, [existingDoc]))[0];
       } catch (error) {
         reply.code(400).send({
           error: 'Bad Request',
@@ -1003,7 +1199,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await mil1553Collection.byExample({ dictionary_type, dictionary_version, mil1553_name })
+        const cursor = await contentCollection('mil1553', request.params).byExample({ dictionary_type, dictionary_version, mil1553_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -1011,7 +1207,9 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
 
-        const { new: updatedDoc } = await mil1553Collection.update(existingDoc._key, patchMil1553, { returnNew: true });
+        const updateOptions = await fastify.enumerationSets.sharePatch(dictionary_type, dictionary_version, patchMil1553);
+        const { new: updatedDoc } = await fastify.contentRevisions.update(contentCollection('mil1553', request.params), existingDoc, patchMil1553, updateOptions);
+        fastify.contentEvents.emit('content', { collection: 'mil1553', dictionary_type, dictionary_version, op: 'update', documents: [updatedDoc], previous: [existingDoc] });
         return updatedDoc;
       } catch (error) {
         reply.code(400).send({
@@ -1031,7 +1229,7 @@ export default async function dictionaryContentRoutes(fastify, options) {
 
       try {
         // 1. Find document 
-        const cursor = await mil1553Collection.byExample({ dictionary_type, dictionary_version, mil1553_name })
+        const cursor = await contentCollection('mil1553', request.params).byExample({ dictionary_type, dictionary_version, mil1553_name })
         const existingDoc = await cursor.next();
         if (!existingDoc) {
           return reply.code(404).send({
@@ -1039,7 +1237,9 @@ export default async function dictionaryContentRoutes(fastify, options) {
           });
         }
         // Step 2: Delete by _key
-        await mil1553Collection.remove(existingDoc._key);
+        await fastify.contentRevisions.remove(contentCollection('mil1553', request.params), existingDoc);
+        await fastify.contentCounts.adjust('mil1553', dictionary_type, dictionary_version, -1);
+        fastify.contentEvents.emit('content', { collection: 'mil1553', dictionary_type, dictionary_version, op: 'delete', documents: [existingDoc] });
 
         return reply.code(204).send();
       } catch (error) {
@@ -1051,4 +1251,338 @@ export default async function dictionaryContentRoutes(fastify, options) {
     }
   });
 
+  // ====== SEARCH =======
+  // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/search
+  fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/search', {
+    config: { singleFlight: true, responseCache: ['dictionary', 'vi'], admission: 'wild_search' },
+    schema: searchDictionaryContentSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+      const {
+        q,
+        types = [...Object.keys(CONTENT_KINDS), 'vi'],
+        limit = 10
+      } = request.query;
+
+      try {
+        // One ranked subquery per kind, combined and re-ranked in a single round trip.
+        // Verification items are limited to those linked to the version's content.
+        const searchVis = types.includes('vi');
+        const subqueries = [...new Set(types)].map(type => {
+          const kind = type === 'vi' ? VI_SEARCH_FIELDS : CONTENT_KINDS[type];
+          const versionFilter = type === 'vi'
+            ? ''
+            : 'doc.dictionary_type == @dictionary_type AND doc.dictionary_version == @dictionary_version AND';
+          const linkFilter = type === 'vi' ? 'FILTER doc._id IN linkedVis' : '';
+          const collection = type === 'vi' ? kind.collection : contentCollectionName(type, request.params);
+          const matches = [
+            `BOOST(PHRASE(doc.${kind.nameField}, @q), 2)`,
+            ...kind.textFields.map(field => `PHRASE(doc.${field}, @q)`)
+          ].join(' OR ');
+
+          return `(
+            FOR doc IN ${SEARCH_VIEW_NAME}
+              SEARCH ${versionFilter} ANALYZER(${matches}, '${SEARCH_ANALYZER_NAME}')
+              OPTIONS { collections: ['${collection}'] }
+              ${linkFilter}
+              LET score = BM25(doc)
+              SORT score DESC
+              LIMIT @limit
+              RETURN { type: '${type}', name: doc.${kind.nameField}, score, item: doc }
+          )`;
+        });
+
+        const linkedVis = searchVis ? `
+          LET linkedVis = (
+            FOR e IN ${VI_LINK_COLLECTION}
+              FILTER e.dictionary_type == @dictionary_type AND e.dictionary_version == @dictionary_version
+              RETURN DISTINCT e._from
+          )` : '';
+        const aqlQuery = `${linkedVis}
+          FOR hit IN FLATTEN([${subqueries.join(', ')}])
+            SORT hit.score DESC
+            RETURN hit
+        `;
+
+        const bindVars = { q, limit, dictionary_type, dictionary_version };
+
+        const cursor = await fastify.db.query(aqlQuery, bindVars);
+        return await cursor.all();
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+  // ====== SUGGEST =======
+  // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/suggest
+  fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/suggest', {
+    schema: suggestNamesSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+      const { prefix, kind = Object.keys(CONTENT_KINDS), limit = 20 } = request.query;
+
+      try {
+        const suggestions = await fastify.nameSuggestions.suggest(dictionary_type, dictionary_version, prefix, [...new Set(kind)], limit);
+        if (!suggestions) {
+          return reply.code(404).send({
+            message: `The requested resource was not found.`
+          });
+        }
+        return suggestions;
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // ====== IMPORT =======
+  // POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/import
+  fastify.post('/dictionaries/:dictionary_type/versions/:dictionary_version/import', {
+    config: { admission: 'bulk_write' },
+    schema: importDictionaryXmlSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+
+      if (typeof request.body?.pipe !== 'function') {
+        return reply.code(400).send({
+          error: 'Bad Request',
+          message: 'The dictionary must be sent as application/xml.'
+        });
+      }
+
+      try {
+        const cursor = await dictionaryCollection.byExample({ dictionary_type, dictionary_version });
+        const existingDict = await cursor.next();
+
+        if (!existingDict) {
+          return reply.code(404).send({
+            error: 'Not Found',
+            message: `Dictionary type "${dictionary_type}" and version "${dictionary_version}" does not exist.`
+          });
+        }
+
+        const imported = Object.fromEntries(Object.keys(XML_RECORD_SCHEMAS).map(kind => [kind, 0]));
+
+        // Each batch is written as a revision of its own, so the change feed
+        // and other writers are not held back for the whole import. A failed
+        // import is undone by removing what was written at those revisions.
+        const revisions = [];
+        let pending = Object.fromEntries(Object.keys(XML_RECORD_SCHEMAS).map(kind => [kind, []]));
+        let pendingCount = 0;
+
+        const parser = createDictionaryXmlParser((kind, document) => {
+          pending[kind].push({ ...document, dictionary_type, dictionary_version });
+          pendingCount++;
+        });
+
+        async function flush() {
+          const batch = pending;
+          pending = Object.fromEntries(Object.keys(XML_RECORD_SCHEMAS).map(kind => [kind, []]));
+          pendingCount = 0;
+          if (Object.values(batch).every(documents => documents.length === 0)) return;
+
+          await fastify.contentRevisions.write(dictionary_type, dictionary_version, async revision => {
+            revisions.push(revision);
+            for (const [kind, documents] of Object.entries(batch)) {
+              if (documents.length === 0) continue;
+              const { nameField } = CONTENT_KINDS[kind];
+              for (const doc of documents) doc.revision = revision;
+              await fastify.enumerationSets.share(dictionary_type, dictionary_version, documents);
+              const results = await contentCollection(kind, request.params).saveAll(documents, { returnNew: true });
+
+              const saved = results.filter(r => !r.error).map(r => r.new);
+              if (saved.length > 0) {
+                imported[kind] += saved.length;
+                await fastify.contentCounts.adjust(kind, dictionary_type, dictionary_version, saved.length);
+                fastify.contentEvents.emit('content', { collection: kind, dictionary_type, dictionary_version, op: 'insert', documents: saved });
+              }
+
+              const duplicates = documents.filter((doc, i) => results[i].error).map(doc => doc[nameField]);
+              if (duplicates.length > 0) {
+                const error = new Error(`Elements of kind ${kind} with the following names could not be saved (they may already exist): ${duplicates.join(', ')}`);
+                error.statusCode = 409;
+                throw error;
+              }
+            }
+          });
+        }
+
+        async function undo() {
+          if (revisions.length === 0) return;
+          await fastify.contentRevisions.removeWritten(dictionary_type, dictionary_version, revisions, async (kind, removed) => {
+            await fastify.contentCounts.adjust(kind, dictionary_type, dictionary_version, -removed.length);
+            fastify.contentEvents.emit('content', { collection: kind, dictionary_type, dictionary_version, op: 'delete', documents: removed });
+          });
+          for (const kind of Object.keys(imported)) imported[kind] = 0;
+        }
+
+        try {
+          request.body.setEncoding('utf8');
+          for await (const chunk of request.body) {
+            parser.write(chunk);
+            // Reading pauses while a batch is written, which bounds memory use
+            if (pendingCount >= BODY_CHUNK_SIZE) await flush();
+          }
+          parser.end();
+          await flush();
+        } catch (error) {
+          await undo();
+          throw error;
+        }
+
+        const revision = revisions.at(-1) ?? existingDict.revision ?? 0;
+        return reply.code(201).send({ revision, imported });
+
+      } catch (error) {
+        fastify.log.error(error, 'Failed to import dictionary XML');
+        if (error.statusCode === 409) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: error.message
+          });
+        }
+        return reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // ====== CHANGES =======
+  // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/changes
+  fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/changes', {
+    config: { singleFlight: true, admission: 'point_read' },
+    schema: getDictionaryContentChangesSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+      const { since, limit = 1000 } = request.query;
+
+      try {
+        const dictCursor = await dictionaryCollection.byExample({ dictionary_type, dictionary_version });
+        const existingDict = await dictCursor.next();
+        if (!existingDict) {
+          return reply.code(404).send({
+            message: `The requested resource was not found.`
+          });
+        }
+
+        // Documents stamped above the dictionary's revision belong to a write still in progress
+        const current = existingDict.revision ?? 0;
+        const collections = { tombstones: CONTENT_TOMBSTONE_COLLECTION };
+        for (const kind of Object.keys(CONTENT_KINDS)) collections[kind] = contentCollectionName(kind, request.params);
+        const collectionVars = Object.fromEntries(Object.entries(collections).map(([name, collection]) => [`@${name}`, collection]));
+        const versionVars = { dictionary_type, dictionary_version, since, current };
+
+        // A page ends with a whole revision: the one holding the limit-th change
+        // after `since`. Writes are revisions of at most BODY_CHUNK_SIZE elements,
+        // so a page exceeds the limit by less than that.
+        const revisionsQuery = Object.keys(collections).map(name => `(
+            FOR doc IN @@${name}
+              FILTER doc.dictionary_type == @dictionary_type
+                AND doc.dictionary_version == @dictionary_version
+                AND doc.revision > @since AND doc.revision <= @current
+              SORT doc.revision
+              LIMIT @limit
+              RETURN doc.revision
+          )`).join(', ');
+        const endCursor = await fastify.db.query(`
+          LET revisions = (
+            FOR revision IN UNION(${revisionsQuery})
+              SORT revision
+              LIMIT @limit
+              RETURN revision
+          )
+          RETURN LENGTH(revisions) < @limit ? @current : LAST(revisions)
+        `, { ...collectionVars, ...versionVars, limit });
+        const revision = await endCursor.next();
+
+        const bindVars = { ...collectionVars, dictionary_type, dictionary_version, since, revision };
+        const subqueries = Object.entries(CONTENT_KINDS).map(([kind, { nameField }]) => `(
+            FOR doc IN @@${kind}
+              FILTER doc.dictionary_type == @dictionary_type
+                AND doc.dictionary_version == @dictionary_version
+                AND doc.revision > @since AND doc.revision <= @revision
+              RETURN { kind: '${kind}', op: 'upsert', revision: doc.revision, key: doc._key, name: doc.${nameField}, document: UNSET(doc, '_id', '_rev') }
+          )`);
+
+        const aqlQuery = `
+          LET deletes = (
+            FOR t IN @@tombstones
+              FILTER t.dictionary_type == @dictionary_type
+                AND t.dictionary_version == @dictionary_version
+                AND t.revision > @since AND t.revision <= @revision
+              RETURN { kind: t.collection, op: 'delete', revision: t.revision, key: t.key, name: t.name }
+          )
+          FOR change IN UNION(deletes, ${subqueries.join(', ')})
+            SORT change.revision, change.op == 'delete' ? 0 : 1
+            RETURN change
+        `;
+
+        const cursor = await fastify.db.query(aqlQuery, bindVars);
+        const changes = await cursor.all();
+        if (request.query.expand === 'enumerations') {
+          const documents = await fastify.enumerationSets.expand(dictionary_type, dictionary_version, changes.map(change => change.document));
+          changes.forEach((change, i) => { if (change.document) change.document = documents[i]; });
+        }
+        return { revision, next: revision < current ? revision : null, changes };
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // ====== EXPORT =======
+  // GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/export
+  fastify.get('/dictionaries/:dictionary_type/versions/:dictionary_version/export', {
+    config: { admission: 'export' },
+    schema: exportDictionaryContentSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { dictionary_type, dictionary_version } = request.params;
+
+      try {
+        reply.type('application/json');
+
+        // Published versions: send the precompressed artifact as is to clients
+        // accepting gzip at all, rather than compressing it again in another encoding
+        const artifact = await fastify.artifacts.load(dictionary_type, dictionary_version);
+        if (artifact) {
+          reply.header('vary', 'accept-encoding');
+          if (acceptQuality(parseAcceptHeader(request.headers['accept-encoding']), 'gzip') > 0) {
+            reply.header('content-encoding', 'gzip');
+            return reply.send(artifact.gzipped);
+          }
+          return reply.send(await artifact.json());
+        }
+
+        // Editable versions are read from the database on every request
+        const snapshot = await fastify.artifacts.snapshot(dictionary_type, dictionary_version);
+        if (!snapshot) {
+          return reply.code(404).send({
+            message: `The requested resource was not found.`
+          });
+        }
+        return reply.send(JSON.stringify(snapshot));
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
 }
\ No newline at end of file
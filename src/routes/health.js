@@ -1,12 +1,44 @@
-import { healthCheckSchema } from '../schemas/healthSchema.js';
+import { healthCheckSchema, arangoHealthSchema, warmupHealthSchema } from '../schemas/healthSchema.js';
 
 export default async function healthRoutes(fastify, options) {
   fastify.get('/health', {
     schema: healthCheckSchema,
     handler: async (request, reply) => {
+      // Not ready to take traffic until the cache warm-up has finished
+      if (!fastify.warmup.ready()) {
+        reply.header('retry-after', 5);
+        return reply.code(503).send({
+          message: 'Warming up caches of recently published dictionary versions.'
+        });
+      }
       return { 
         status: 'OK', 
       };
     }
   });
+
+  fastify.get('/health/warmup', {
+    schema: warmupHealthSchema,
+    handler: async (request, reply) => {
+      return fastify.warmup.status();
+    }
+  });
+
+  fastify.get('/health/arangodb', {
+    schema: arangoHealthSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      let status = 'OK';
+      try {
+        await fastify.db.version();
+      } catch (error) {
+        request.log.warn(error, 'ArangoDB health check failed');
+        status = 'UNAVAILABLE';
+      }
+      return {
+        status,
+        ...fastify.dbPool.stats()
+      };
+    }
+  });
 }
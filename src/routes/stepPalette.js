@@ -0,0 +1,271 @@
+import {
+  getBuiltInStepsSchema,
+  updateBuiltInStepSchema,
+  getCustomStepsSchema,
+  createCustomStepsSchema,
+  getCustomStepByIdSchema,
+  updateCustomStepSchema,
+  deleteCustomStepSchema
+} from '../schemas/stepPaletteSchema.js';
+
+export default async function stepPaletteRoutes(fastify, options) {
+
+  const collection = fastify.db.collection('step_palette');
+
+  // Sets the palette ETag and answers 304 when the client already has it
+  function notModified(request, reply, etag) {
+    reply.header('etag', etag);
+    reply.header('cache-control', 'private, no-cache');
+
+    const ifNoneMatch = request.headers['if-none-match'];
+    if (!ifNoneMatch) return false;
+    return ifNoneMatch.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag);
+  }
+
+  function contains(value, search) {
+    return String(value ?? '').toLowerCase().includes(search.toLowerCase());
+  }
+
+  // Stores a palette override and returns the stored document
+  async function upsertOverride(match, fields) {
+    const cursor = await fastify.db.query(`
+      UPSERT @match
+        INSERT MERGE(@match, @fields)
+        UPDATE @fields
+        IN step_palette
+        RETURN NEW
+    `, { match, fields });
+    const doc = await cursor.next();
+    fastify.stepPalette.applyOverride(doc);
+    return doc;
+  }
+
+  // GET /step_palette/built_in/ (as documented, and without the trailing slash)
+  const getBuiltInSteps = {
+    schema: getBuiltInStepsSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { step_type, display_name, enable_disable } = request.query;
+      try {
+        const palette = await fastify.stepPalette.current();
+        if (notModified(request, reply, palette.etag)) {
+          return reply.code(304).send();
+        }
+
+        return palette.builtIn.filter(step =>
+          (!step_type || contains(step.step_type, step_type)) &&
+          (!display_name || contains(step.step_display_name, display_name)) &&
+          (!enable_disable || step.enable_disable === enable_disable)
+        );
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  };
+  fastify.get('/step_palette/built_in/', getBuiltInSteps);
+  fastify.get('/step_palette/built_in', getBuiltInSteps);
+
+  // PATCH /step_palette/built_in/{step_type}
+  fastify.patch('/step_palette/built_in/:step_type', {
+    schema: updateBuiltInStepSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { step_type } = request.params;
+      try {
+        await upsertOverride({ step_type }, request.body);
+
+        const palette = await fastify.stepPalette.current();
+        return palette.builtIn.find(step => step.step_type === step_type);
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // GET /step_palette/custom/ (as documented, and without the trailing slash)
+  const getCustomSteps = {
+    schema: getCustomStepsSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const {
+        sort = 'asc',
+        limit = 20,
+        offset = 0,
+        wild = false,
+        display_name
+      } = request.query;
+
+      try {
+        const palette = await fastify.stepPalette.current();
+        if (notModified(request, reply, palette.etag)) {
+          return reply.code(304).send();
+        }
+
+        let steps = palette.custom;
+        if (display_name) {
+          steps = steps.filter(step => wild
+            ? contains(step.step_display_name, display_name)
+            : step.step_display_name === display_name);
+        }
+        if (sort.toUpperCase() === 'DESC') {
+          steps = [...steps].reverse();
+        }
+
+        reply.header('x-total-count', steps.length);
+        return steps.slice(offset, offset + limit);
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  };
+  fastify.get('/step_palette/custom/', getCustomSteps);
+  fastify.get('/step_palette/custom', getCustomSteps);
+
+  // POST /step_palette/custom/ (as documented, and without the trailing slash)
+  const createCustomSteps = {
+    schema: createCustomStepsSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const newSteps = request.body;
+      try {
+        // Step 1: Check for steps already in the palette
+        const palette = await fastify.stepPalette.current();
+        const existingStepIds = newSteps
+          .map(step => step.step_id)
+          .filter(step_id => palette.customById.has(step_id));
+
+        if (existingStepIds.length > 0) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: `Custom steps with the following step_ids already exist: ${existingStepIds.join(', ')}`
+          });
+        }
+
+        const inactiveStepIds = newSteps
+          .map(step => step.step_id)
+          .filter(step_id => ![undefined, 'ACTIVE'].includes(fastify.stepPalette.scriptStatus(step_id)));
+
+        if (inactiveStepIds.length > 0) {
+          return reply.code(400).send({
+            error: 'Bad Request',
+            message: `Custom scripts with the following script_ids are not ACTIVE: ${inactiveStepIds.join(', ')}`
+          });
+        }
+
+        // Step 2: Store the steps (restores steps previously removed from the palette)
+        for (const { step_id, ...fields } of newSteps) {
+          await upsertOverride({ step_id }, { ...fields, removed: false });
+        }
+
+        const updated = await fastify.stepPalette.current();
+        return reply.code(201).send(newSteps.map(step => updated.customById.get(step.step_id)));
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  };
+  fastify.post('/step_palette/custom/', createCustomSteps);
+  fastify.post('/step_palette/custom', createCustomSteps);
+
+  // GET /step_palette/custom/{step_id}
+  fastify.get('/step_palette/custom/:step_id', {
+    schema: getCustomStepByIdSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { step_id } = request.params;
+      try {
+        const palette = await fastify.stepPalette.current();
+        const step = palette.customById.get(step_id);
+
+        if (!step) {
+          return reply.code(404).send({
+            message: `The requested resource was not found.`
+          });
+        }
+
+        reply.header('etag', palette.etag);
+        return step;
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // PATCH /step_palette/custom/{step_id}
+  fastify.patch('/step_palette/custom/:step_id', {
+    schema: updateCustomStepSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { step_id } = request.params;
+      try {
+        const palette = await fastify.stepPalette.current();
+        if (!palette.customById.has(step_id)) {
+          return reply.code(404).send({
+            message: `Step with ID '${step_id}' not found.`
+          });
+        }
+
+        await upsertOverride({ step_id }, request.body);
+
+        const updated = await fastify.stepPalette.current();
+        return updated.customById.get(step_id);
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
+  // DELETE /step_palette/custom/{step_id}
+  fastify.delete('/step_palette/custom/:step_id', {
+    schema: deleteCustomStepSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { step_id } = request.params;
+      try {
+        const palette = await fastify.stepPalette.current();
+        if (!palette.customById.has(step_id)) {
+          return reply.code(404).send({
+            message: `The requested resource was not found.`
+          });
+        }
+
+        if (fastify.stepPalette.scriptStatus(step_id) === 'ACTIVE') {
+          // Steps of active scripts are derived; remember that this one was removed
+          await upsertOverride({ step_id }, { removed: true });
+        } else {
+          const cursor = await collection.byExample({ step_id });
+          const existingDoc = await cursor.next();
+          if (existingDoc) {
+            await collection.remove(existingDoc._key);
+          }
+          fastify.stepPalette.removeOverride(step_id);
+        }
+
+        return reply.code(204).send();
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+}
@@ -4,16 +4,29 @@ import {
   getVerificationItemByIdSchema,
   updateVerificationItemSchema,
   deleteVerificationItemSchema,
-  bulkQueryVerificationItemsSchema
+  bulkQueryVerificationItemsSchema,
+  getVerificationItemsByVaSchema,
+  getVerificationItemsByVacSchema,
+  bulkQueryVasSchema,
+  bulkQueryVacsSchema,
+  getVerificationItemStatsSchema
 } from '../schemas/vnvSchema.js';
+import { VNV_STATS_TTL_MS } from '../config/env.js';
+import { mapInChunks, saveAllInChunks } from '../utils/chunked.js';
+import { TtlCache } from '../utils/ttlCache.js';
 
 
 export default async function vnvRoutes(fastify, options) {
 
   const collection = fastify.db.collection('vnv')
 
+  // Aggregated VI statistics, keyed by filters; cleared on every VI write
+  const statsCache = new TtlCache({ ttlMs: VNV_STATS_TTL_MS, maxEntries: 100 });
+  fastify.contentEvents.on('vi', () => statsCache.clear());
+
   // POST /vnv/vis
   fastify.post('/vnv/vis', {
+    config: { admission: 'bulk_write', chunkedBody: true },
     schema: createVerificationItemSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -22,8 +35,7 @@ export default async function vnvRoutes(fastify, options) {
 
       try {
         // Step 1: Check for existing vi_id
-        const viIds = verificationItems
-          .map(item => item.vi_id)
+        const viIds = (await mapInChunks(verificationItems, item => item.vi_id))
           .filter(Boolean);
 
         if (viIds.length > 0) {
@@ -44,7 +56,7 @@ export default async function vnvRoutes(fastify, options) {
         }
 
         // Step 2: Format and insert in bulk
-        const newItems = verificationItems.map(item => ({
+        const newItems = await mapInChunks(verificationItems, item => ({
           vi_id: item.vi_id,
           vi_name: item.vi_name,
           vi_owner: item.vi_owner,
@@ -54,9 +66,20 @@ export default async function vnvRoutes(fastify, options) {
           vacs: item.vacs
         }));
 
-        const result = await collection.saveAll(newItems, { returnNew: true });
+        const result = await saveAllInChunks(collection, newItems, { returnNew: true });
 
-        const savedItems = result.map(r => r.new);
+        const savedItems = result.filter(r => !r.error).map(r => r.new);
+        const failedIds = newItems.filter((item, i) => result[i].error).map(item => item.vi_id);
+        if (savedItems.length > 0) {
+          await fastify.viLinks.linkWritten(savedItems);
+          fastify.contentEvents.emit('vi', { op: 'insert', documents: savedItems });
+        }
+        if (failedIds.length > 0) {
+          return reply.code(409).send({
+            error: 'Conflict',
+            message: `Verification items with the following vi_ids could not be saved (they may be repeated in the request): ${failedIds.join(', ')}. The other ${savedItems.length} were saved.`
+          });
+        }
         return reply.code(201).send(savedItems);
 
       } catch (error) {
@@ -72,6 +95,7 @@ export default async function vnvRoutes(fastify, options) {
 
   // GET /vnv/vis
   fastify.get('/vnv/vis', {
+    config: { singleFlight: true, responseCache: 'vi', admission: 'search' },
     schema: getVerificationItemsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -86,7 +110,7 @@ export default async function vnvRoutes(fastify, options) {
         vi_owner,
         vi_type,
         vi_text,
-        va_poc,
+        va_name,
         vac_name
       } = request.query;
 
@@ -111,8 +135,19 @@ export default async function vnvRoutes(fastify, options) {
         if (vi_owner) addFilter('vi_owner', vi_owner);
         if (vi_type) addFilter('vi_type', vi_type);
         if (vi_text) addFilter('vi_text', vi_text);
-        if (va_poc) addFilter('va_poc', va_poc);
-        if (vac_name) addFilter('vac_name', vac_name);
+
+        // Helper: match an element of a linked activity array; exact matches use the array index
+        function addArrayFilter(paramName, arrayField, value) {
+          if (wild) {
+            filters.push(`LENGTH(doc.${arrayField}[* FILTER CONTAINS(LOWER(CURRENT), LOWER(@${paramName}))]) > 0`);
+          } else {
+            filters.push(`@${paramName} IN doc.${arrayField}[*]`);
+          }
+          bindVars[paramName] = value;
+        }
+
+        if (va_name) addArrayFilter('va_name', 'vas', va_name);
+        if (vac_name) addArrayFilter('vac_name', 'vacs', vac_name);
 
         const filterClause = filters.length ? `FILTER ${filters.join(' AND ')}` : '';
 
@@ -142,8 +177,90 @@ export default async function vnvRoutes(fastify, options) {
 
 
 
+  // GET /vnv/stats
+  fastify.get('/vnv/stats', {
+    config: { singleFlight: true, admission: 'point_read' },
+    schema: getVerificationItemStatsSchema,
+    preHandler: fastify.authenticate,
+    handler: async (request, reply) => {
+      const { vi_type, vi_owner, va_name, vac_name } = request.query;
+
+      try {
+        const cacheKey = JSON.stringify([vi_type, vi_owner, va_name, vac_name]);
+        const cached = statsCache.get(cacheKey);
+        if (cached) {
+          return cached;
+        }
+
+        let filters = [];
+        let bindVars = {};
+
+        if (vi_type) {
+          filters.push('doc.vi_type == @vi_type');
+          bindVars.vi_type = vi_type;
+        }
+        if (vi_owner) {
+          filters.push('doc.vi_owner == @vi_owner');
+          bindVars.vi_owner = vi_owner;
+        }
+        if (va_name) {
+          filters.push('@va_name IN doc.vas[*]');
+          bindVars.va_name = va_name;
+        }
+        if (vac_name) {
+          filters.push('@vac_name IN doc.vacs[*]');
+          bindVars.vac_name = vac_name;
+        }
+
+        const filterClause = filters.length ? `FILTER ${filters.join(' AND ')}` : '';
+
+        const aqlQuery = `
+          LET by_type = (
+            FOR doc IN vnv
+              ${filterClause}
+              COLLECT vi_type = doc.vi_type
+              AGGREGATE items = COUNT(1),
+                        without_vas = SUM(LENGTH(doc.vas) == 0 ? 1 : 0),
+                        without_vacs = SUM(LENGTH(doc.vacs) == 0 ? 1 : 0)
+              SORT items DESC
+              RETURN { vi_type, count: items, without_vas, without_vacs }
+          )
+          LET by_owner = (
+            FOR doc IN vnv
+              ${filterClause}
+              COLLECT vi_owner = doc.vi_owner
+              AGGREGATE items = COUNT(1),
+                        without_vas = SUM(LENGTH(doc.vas) == 0 ? 1 : 0),
+                        without_vacs = SUM(LENGTH(doc.vacs) == 0 ? 1 : 0)
+              SORT items DESC
+              RETURN { vi_owner, count: items, without_vas, without_vacs }
+          )
+          RETURN {
+            count: SUM(by_type[*].count),
+            without_vas: SUM(by_type[*].without_vas),
+            without_vacs: SUM(by_type[*].without_vacs),
+            by_type,
+            by_owner
+          }
+        `;
+
+        const cursor = await fastify.db.query(aqlQuery, bindVars);
+        const stats = await cursor.next();
+
+        statsCache.set(cacheKey, stats);
+        return stats;
+      } catch (error) {
+        reply.code(400).send({
+          error: 'Bad Request',
+          message: error.message
+        });
+      }
+    }
+  });
+
   // GET /vnv/vis/{vi_id}
   fastify.get('/vnv/vis/:vi_id', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: getVerificationItemByIdSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -189,6 +306,8 @@ export default async function vnvRoutes(fastify, options) {
         
         // 2. Perform partial update by _key
         const { new: updatedDoc } = await collection.update(existingDoc._key, updateData, { returnNew: true });
+        await fastify.viLinks.linkWritten([updatedDoc]);
+        fastify.contentEvents.emit('vi', { op: 'update', documents: [updatedDoc], previous: [existingDoc] });
         return updatedDoc;
       } catch (error) {
         reply.code(400).send({
@@ -216,6 +335,8 @@ export default async function vnvRoutes(fastify, options) {
         }
         // Step 2: Delete by _key
         await collection.remove(existingDoc._key);
+        await fastify.viLinks.unlinkDeleted([existingDoc]);
+        fastify.contentEvents.emit('vi', { op: 'delete', documents: [existingDoc] });
 
         return reply.code(204).send();
       } catch (error) {
@@ -229,6 +350,7 @@ export default async function vnvRoutes(fastify, options) {
 
   // POST /vnv/vis/bulk
   fastify.post('/vnv/vis/bulk', {
+    config: { singleFlight: true, admission: 'point_read' },
     schema: bulkQueryVerificationItemsSchema,
     preHandler: fastify.authenticate,
     handler: async (request, reply) => {
@@ -253,4 +375,76 @@ export default async function vnvRoutes(fastify, options) {
       }
     }
   });
+
+  // Reverse lookups from verification activities (vas) and activity
+  // collections (vacs) to the VIs linked to them, backed by array indexes
+  const reverseLookups = [
+    { param: 'va', field: 'vas', path: '/vnv/vas', schema: getVerificationItemsByVaSchema, bulkSchema: bulkQueryVasSchema },
+    { param: 'vac', field: 'vacs', path: '/vnv/vacs', schema: getVerificationItemsByVacSchema, bulkSchema: bulkQueryVacsSchema }
+  ];
+
+  for (const { param, field, path, schema, bulkSchema } of reverseLookups) {
+    // GET /vnv/vas/{va} and GET /vnv/vacs/{vac}
+    fastify.get(`${path}/:${param}`, {
+      config: { singleFlight: true, responseCache: 'vi', admission: 'point_read' },
+      schema,
+      preHandler: fastify.authenticate,
+      handler: async (request, reply) => {
+        const name = request.params[param];
+        const { limit = 20, offset = 0 } = request.query;
+        try {
+          const query = `
+            FOR doc IN vnv
+              FILTER @name IN doc.@field[*]
+              SORT doc.vi_id
+              LIMIT @offset, @limit
+              RETURN doc
+          `;
+
+          const cursor = await fastify.db.query(query, { name, field, limit, offset }, { fullCount: true });
+          const items = await cursor.all();
+          const totalCount = cursor.extra?.stats?.fullCount ?? items.length;
+
+          reply.header('x-total-count', totalCount);
+          return items;
+        } catch (error) {
+          reply.code(400).send({
+            error: 'Bad Request',
+            message: error.message
+          });
+        }
+      }
+    });
+
+    // POST /vnv/vas/bulk and POST /vnv/vacs/bulk
+    fastify.post(`${path}/bulk`, {
+      config: { singleFlight: true, admission: 'point_read' },
+      schema: bulkSchema,
+      preHandler: fastify.authenticate,
+      handler: async (request, reply) => {
+        const names = request.body;
+        try {
+          // One index lookup per name
+          const query = `
+            FOR name IN @names
+              LET vi_ids = (
+                FOR doc IN vnv
+                  FILTER name IN doc.@field[*]
+                  SORT doc.vi_id
+                  RETURN doc.vi_id
+              )
+              RETURN { [@param]: name, vi_ids }
+          `;
+
+          const cursor = await fastify.db.query(query, { names, field, param });
+          return await cursor.all();
+        } catch (error) {
+          reply.code(400).send({
+            error: 'Bad Request',
+            message: error.message
+          });
+        }
+      }
+    });
+  }
 }
@@ -0,0 +1,90 @@
+// src/schemas/batchSchema.js
+
+import { commonErrorResponses } from './shared_schemas/sharedSchemas.js';
+
+// Maximum number of sub-requests accepted in a single batch
+export const BATCH_MAX_REQUESTS = 50;
+
+// Schema for a single sub-request of a batch
+const batchSubRequestSchema = {
+  type: 'object',
+  required: ['method', 'url'],
+  properties: {
+    id: {
+      description: 'Optional client supplied identifier echoed back in the matching response',
+      type: 'string',
+    },
+    method: {
+      description: 'HTTP method of the sub-request',
+      type: 'string',
+      enum: ['GET', 'POST', 'PATCH', 'DELETE'],
+    },
+    url: {
+      description: 'Path of the sub-request including its query string, either relative to /api/v4 (e.g. /dictionaries/flight/versions/1.0/cmds?limit=5) or absolute',
+      type: 'string',
+      minLength: 1,
+    },
+    body: {
+      description: 'JSON body of the sub-request (POST and PATCH only)',
+    },
+  },
+  additionalProperties: false,
+};
+
+// Schema for a single sub-response of a batch
+const batchSubResponseSchema = {
+  type: 'object',
+  properties: {
+    id: {
+      description: 'Identifier of the matching sub-request, if one was given',
+      type: 'string',
+    },
+    status: {
+      description: 'HTTP status code of the sub-request',
+      type: 'integer',
+    },
+    headers: {
+      description: 'Selected response headers of the sub-request (content-type, x-total-count, etag)',
+      type: 'object',
+      additionalProperties: { type: 'string' },
+    },
+    body: {
+      description: 'Response body of the sub-request, parsed when it is JSON',
+    },
+  },
+  required: ['status'],
+};
+
+// Schema for POST /batch
+export const batchSchema = {
+  summary: 'Execute several API requests in one round trip',
+  description: `Runs a list of sub-requests against the existing /api/v4 routes and returns their responses in the same order. The caller is authenticated once; every sub-request is executed with the same credentials. Sub-requests run concurrently unless \`sequential\` is set, in which case they run one after the other in the given order. At most ${BATCH_MAX_REQUESTS} sub-requests are accepted and batches cannot be nested.`,
+  tags: ['Batch'],
+  security: [{ bearerAuth: [] }],
+  body: {
+    type: 'object',
+    required: ['requests'],
+    properties: {
+      sequential: {
+        description: 'Run the sub-requests one after the other instead of concurrently (use when later requests depend on earlier writes)',
+        type: 'boolean',
+        default: false,
+      },
+      requests: {
+        type: 'array',
+        minItems: 1,
+        maxItems: BATCH_MAX_REQUESTS,
+        items: batchSubRequestSchema,
+      },
+    },
+    additionalProperties: false,
+  },
+  response: {
+    200: {
+      description: 'Success. One response per sub-request, in request order.',
+      type: 'array',
+      items: batchSubResponseSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
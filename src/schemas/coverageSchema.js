@@ -0,0 +1,145 @@
+// src/schemas/coverageSchema.js
+
+import { commonErrorResponses } from './shared_schemas/sharedSchemas.js';
+
+const LINKED_KINDS = ['command', 'channel', 'evr'];
+
+const dictionaryTypeParam = {
+  description: 'Type of Dictionary (sse/flight)',
+  type: 'string',
+  enum: ['sse', 'flight'],
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/coverage
+export const getCoverageSchema = {
+  summary: 'Verification coverage of a dictionary version',
+  description: 'Lists the commands, channels or evrs of a dictionary version together with the verification items linked to them. Use covered=false to list the elements no verification item refers to.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: dictionaryTypeParam,
+      dictionary_version: {
+        description: 'Version of the Dictionary',
+        type: 'string',
+      },
+    },
+  },
+  querystring: {
+    type: 'object',
+    properties: {
+      kind: {
+        description: 'Kind of dictionary content to report on',
+        type: 'string',
+        enum: LINKED_KINDS,
+        default: 'channel',
+      },
+      covered: {
+        description: 'Only list elements with (true) or without (false) linked verification items',
+        type: 'boolean',
+      },
+      limit: {
+        description: 'Limit on the number of returned results',
+        type: 'integer',
+        default: 20,
+      },
+      offset: {
+        description: 'Offset for pagination',
+        type: 'integer',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Elements of the dictionary version and their linked verification items.',
+      headers: {
+        'x-total-count': {
+          description: 'The total number of matching elements',
+          type: 'integer',
+        },
+      },
+      type: 'array',
+      items: {
+        type: 'object',
+        properties: {
+          name: {
+            description: 'Name of the element (command stem, channel name or evr name)',
+            type: 'string',
+          },
+          vi_ids: {
+            description: 'vi_ids of the linked verification items',
+            type: 'array',
+            items: { type: 'string' },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/impact
+export const getImpactSchema = {
+  summary: 'Verification items affected by changes between two dictionary versions',
+  description: 'Compares two versions of a dictionary and returns the verification items linked to commands, channels or evrs that were added, removed or changed between them.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type'],
+    properties: {
+      dictionary_type: dictionaryTypeParam,
+    },
+  },
+  querystring: {
+    type: 'object',
+    required: ['from_version', 'to_version'],
+    properties: {
+      from_version: {
+        description: 'Version to compare from',
+        type: 'string',
+      },
+      to_version: {
+        description: 'Version to compare to',
+        type: 'string',
+      },
+      kinds: {
+        description: 'Kinds of dictionary content to compare (defaults to all linked kinds)',
+        type: 'array',
+        items: {
+          type: 'string',
+          enum: LINKED_KINDS,
+        },
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Affected verification items, sorted by vi_id.',
+      type: 'array',
+      items: {
+        type: 'object',
+        properties: {
+          vi_id: { type: 'string' },
+          vi_name: { type: 'string' },
+          vi_type: { type: 'string' },
+          changes: {
+            description: 'Changed elements the verification item is linked to',
+            type: 'array',
+            items: {
+              type: 'object',
+              properties: {
+                kind: { type: 'string', enum: LINKED_KINDS },
+                name: { type: 'string' },
+                change: { type: 'string', enum: ['added', 'removed', 'changed'] },
+              },
+            },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
@@ -714,6 +714,62 @@ export const bulkQueryCustomScriptsSchema = {
   },
 };
 
+const syncScriptIdList = {
+  type: 'array',
+  items: { type: 'string' },
+};
+
+// Schema for POST /custom_scripts/sync
+export const syncCustomScriptsSchema = {
+  summary: 'Synchronize the registered custom scripts with a complete set of scripts',
+  description: 'Idempotent registration of a complete set of custom scripts. Scripts are matched by script_id and compared by hash: new scripts are inserted, scripts whose hash (or status) changed are replaced and unchanged scripts are not written. With deactivate_missing, registered scripts absent from the set are marked INACTIVE. Scripts that could not be written are reported under failed.',
+  tags: ['Scripts'],
+  security: [{ bearerAuth: [] }],
+  body: {
+    type: 'object',
+    required: ['scripts'],
+    properties: {
+      scripts: {
+        description: 'The complete set of scripts. Scripts without a status are registered as ACTIVE.',
+        type: 'array',
+        items: {
+          ...CustomScriptObjectSchema,
+          required: ['script_id', 'hash'],
+        },
+      },
+      deactivate_missing: {
+        description: 'Mark registered scripts that are not part of the set as INACTIVE',
+        type: 'boolean',
+        default: false,
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Summary of the changes applied.',
+      type: 'object',
+      properties: {
+        inserted: { description: 'script_ids of the inserted scripts', ...syncScriptIdList },
+        updated: { description: 'script_ids of the scripts whose hash or status changed', ...syncScriptIdList },
+        deactivated: { description: 'script_ids of the scripts marked INACTIVE', ...syncScriptIdList },
+        unchanged: { description: 'Number of scripts left untouched', type: 'integer' },
+        failed: {
+          description: 'Scripts that could not be written, with the reason. They are not listed as inserted or updated; send the set again to retry them.',
+          type: 'array',
+          items: {
+            type: 'object',
+            properties: {
+              script_id: { type: 'string' },
+              message: { type: 'string' },
+            },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
 const customScriptUpdateSchema = {
   type: 'object',
   properties: {
@@ -32,6 +32,13 @@ const allowableRangeSchema = {
   },
 };
 
+// Query parameter returning shared enumeration sets inline (channels and mil1553)
+const expandEnumerationsSchema = {
+  description: 'enumerations: return `enumerations` inline for elements whose enumerations are stored as a shared set (`enumerations_ref`)',
+  type: 'string',
+  enum: ['enumerations'],
+};
+
 // Schema for Argument (used in Command)
 const argumentSchema = {
   type: 'object',
@@ -69,7 +76,7 @@ const argumentSchema = {
 };
 
 // Schema for the Command object itself
-const commandObjectSchema = {
+export const commandObjectSchema = {
   type: 'object',
   properties: {
     command_stem: {
@@ -188,6 +195,12 @@ export const getCommandsSchema = {
         type: 'boolean',
         default: false,
       },
+      count: {
+        description: 'How x-total-count is computed. exact: precise total (cached for unfiltered queries), estimate: cached total for unfiltered queries, otherwise a lower bound from the returned page, none: no total is returned',
+        type: 'string',
+        enum: ['exact', 'estimate', 'none'],
+        default: 'exact',
+      },
       command_stem: {
         description: 'Limits (partial match) the query on command stem (aka command mneumonic)',
         type: 'string',
@@ -360,7 +373,7 @@ export const deleteCommandSchema = {
 };
 
 // Schema for the EVR object itself
-const evrObjectSchema = {
+export const evrObjectSchema = {
   type: 'object',
   properties: {
     evr_name: {
@@ -468,6 +481,12 @@ export const getEvrsSchema = {
         type: 'boolean',
         default: false,
       },
+      count: {
+        description: 'How x-total-count is computed. exact: precise total (cached for unfiltered queries), estimate: cached total for unfiltered queries, otherwise a lower bound from the returned page, none: no total is returned',
+        type: 'string',
+        enum: ['exact', 'estimate', 'none'],
+        default: 'exact',
+      },
       evr_id: {
         description: 'Limits (partial match) the query on evr_id',
         type: 'string',
@@ -652,7 +671,7 @@ export const deleteEvrSchema = {
 };
 
 // Schema for the Channel object itself
-const channelObjectSchema = {
+export const channelObjectSchema = {
   type: 'object',
   properties: {
     channel_name: {
@@ -693,6 +712,10 @@ const channelObjectSchema = {
       type: 'array',
       items: enumerationsSchema, 
     },
+    enumerations_ref: {
+      description: 'Hash of the enumeration set shared by elements of this dictionary version, in place of `enumerations`. Request `expand=enumerations` to receive the enumerations inline.',
+      type: 'string',
+    },
   },
   
 };
@@ -775,6 +798,13 @@ export const getChannelsSchema = {
         type: 'boolean',
         default: false,
       },
+      count: {
+        description: 'How x-total-count is computed. exact: precise total (cached for unfiltered queries), estimate: cached total for unfiltered queries, otherwise a lower bound from the returned page, none: no total is returned',
+        type: 'string',
+        enum: ['exact', 'estimate', 'none'],
+        default: 'exact',
+      },
+      expand: expandEnumerationsSchema,
       channel_name: {
         description: 'Limits (partial match) the query on channel_name',
         type: 'string',
@@ -835,6 +865,12 @@ export const bulkQueryChannelsSchema = {
       },
     },
   },
+  querystring: {
+    type: 'object',
+    properties: {
+      expand: expandEnumerationsSchema,
+    },
+  },
   body: {
     description: 'Array of Channel names to query for',
     type: 'array',
@@ -877,6 +913,12 @@ export const getChannelByNameSchema = {
       },
     },
   },
+  querystring: {
+    type: 'object',
+    properties: {
+      expand: expandEnumerationsSchema,
+    },
+  },
   response: {
     200: {
       description: 'Success. A Channel.',
@@ -999,6 +1041,10 @@ const mil1553DetailsObjectSchema = {
       type: 'array',
       items: enumerationsSchema, 
     },
+    enumerations_ref: {
+      description: 'Hash of the enumeration set shared by elements of this dictionary version, in place of `enumerations`. Request `expand=enumerations` to receive the enumerations inline.',
+      type: 'string',
+    },
   },
 };
 
@@ -1080,6 +1126,13 @@ export const getMil1553VariablesSchema = {
         type: 'boolean',
         default: false,
       },
+      count: {
+        description: 'How x-total-count is computed. exact: precise total (cached for unfiltered queries), estimate: cached total for unfiltered queries, otherwise a lower bound from the returned page, none: no total is returned',
+        type: 'string',
+        enum: ['exact', 'estimate', 'none'],
+        default: 'exact',
+      },
+      expand: expandEnumerationsSchema,
       mil1553_name: {
         description: 'Limits (partial match) the query on mil1553 variable name',
         type: 'string',
@@ -1149,6 +1202,12 @@ export const bulkQueryMil1553VariablesSchema = {
       },
     },
   },
+  querystring: {
+    type: 'object',
+    properties: {
+      expand: expandEnumerationsSchema,
+    },
+  },
   body: {
     description: 'Array of mil1553 names to query for',
     type: 'array',
@@ -1191,6 +1250,12 @@ export const getMil1553VariableByNameSchema = {
       },
     },
   },
+  querystring: {
+    type: 'object',
+    properties: {
+      expand: expandEnumerationsSchema,
+    },
+  },
   response: {
     200: {
       description: 'Success. 1553 details provided',
@@ -1268,3 +1333,345 @@ export const deleteMil1553VariableSchema = {
     ...commonErrorResponses,
   },
 };
+
+// Schema for a single unified search hit
+const searchHitSchema = {
+  type: 'object',
+  properties: {
+    type: {
+      description: 'Kind of element matched (command, evr, channel, mil1553 or vi)',
+      type: 'string',
+      enum: ['command', 'evr', 'channel', 'mil1553', 'vi'],
+    },
+    name: {
+      description: 'Name of the matched element (command stem, evr name, channel name, mil1553 name or vi name)',
+      type: 'string',
+    },
+    score: {
+      description: 'Relevance score (BM25), higher is better',
+      type: 'number',
+    },
+    item: {
+      description: 'The matched document',
+      type: 'object',
+      additionalProperties: true,
+    },
+  },
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/search
+export const searchDictionaryContentSchema = {
+  summary: 'Search all content of a dictionary version',
+  description: 'Searches commands, evrs, channels and mil1553 variables of the dictionary version, plus the verification items linked to them, in a single ranked query. Matches are case-insensitive substring matches on names, ids and descriptions.',
+  tags: ['Dictionary Content'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: {
+        description: 'Type of Dictionary (sse/flight)',
+        type: 'string',
+        enum: ['sse', 'flight'],
+      },
+      dictionary_version: {
+        description: 'Version of the specific dictionary type',
+        type: 'string',
+      },
+    },
+  },
+  querystring: {
+    type: 'object',
+    required: ['q'],
+    properties: {
+      q: {
+        description: 'Text to search for (at least 3 characters)',
+        type: 'string',
+        minLength: 3,
+      },
+      types: {
+        description: 'Limits the search to the given kinds of elements. Supports multiple values with additional \'key=value\' pairs.',
+        type: 'array',
+        items: {
+          type: 'string',
+          enum: ['command', 'evr', 'channel', 'mil1553', 'vi'],
+        },
+      },
+      limit: {
+        description: 'Maximum number of hits returned per kind of element',
+        type: 'integer',
+        minimum: 1,
+        maximum: 100,
+        default: 10,
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Hits ordered by descending relevance.',
+      type: 'array',
+      items: searchHitSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/suggest
+export const suggestNamesSchema = {
+  summary: 'Suggest element names of a dictionary version',
+  description: 'Returns command stems, evr names, channel names and mil1553 names of the dictionary version that start with the given prefix (ignoring case), in alphabetical order. Meant for autocompletion: names are served from memory and kept current with writes.',
+  tags: ['Dictionary Content'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: {
+        description: 'Type of Dictionary (sse/flight)',
+        type: 'string',
+        enum: ['sse', 'flight'],
+      },
+      dictionary_version: {
+        description: 'Version of the specific dictionary type',
+        type: 'string',
+      },
+    },
+  },
+  querystring: {
+    type: 'object',
+    required: ['prefix'],
+    properties: {
+      prefix: {
+        description: 'Beginning of the names to suggest',
+        type: 'string',
+      },
+      kind: {
+        description: 'Limits suggestions to the given kinds of elements. Supports multiple values with additional \'key=value\' pairs.',
+        type: 'array',
+        items: {
+          type: 'string',
+          enum: ['command', 'evr', 'channel', 'mil1553'],
+        },
+      },
+      limit: {
+        description: 'Maximum number of names returned',
+        type: 'integer',
+        minimum: 1,
+        maximum: 100,
+        default: 20,
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Matching names in alphabetical order.',
+      type: 'array',
+      items: {
+        type: 'object',
+        properties: {
+          kind: {
+            description: 'Kind of element (command, evr, channel or mil1553)',
+            type: 'string',
+          },
+          name: {
+            description: 'Command stem, evr name, channel name or mil1553 name',
+            type: 'string',
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/changes
+export const getDictionaryContentChangesSchema = {
+  summary: 'Changes to a dictionary version since a revision',
+  description: 'Returns the commands, evrs, channels and mil1553 variables created, updated or deleted after the given revision, ordered by revision. Every write to a dictionary version advances its revision; pass the returned revision as `since` on the next call. Changes are returned in pages of about `limit` changes that always end with a whole revision; while `next` is not null, more changes are waiting and should be fetched with `since=next`. Replicas should key records by `key`, which stays the same when an element is renamed. Channels and mil1553 variables stored with a shared enumeration set carry `enumerations_ref` unless `expand=enumerations` is given.',
+  tags: ['Dictionary Content'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: {
+        description: 'Type of Dictionary (sse/flight)',
+        type: 'string',
+        enum: ['sse', 'flight'],
+      },
+      dictionary_version: {
+        description: 'Version of the specific dictionary type',
+        type: 'string',
+      },
+    },
+  },
+  querystring: {
+    type: 'object',
+    required: ['since'],
+    properties: {
+      since: {
+        description: 'Revision the client already holds (0 for everything)',
+        type: 'integer',
+        minimum: 0,
+      },
+      limit: {
+        description: 'Number of changes after which the page ends with the revision holding the last of them',
+        type: 'integer',
+        minimum: 1,
+        maximum: 10000,
+        default: 1000,
+      },
+      expand: expandEnumerationsSchema,
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Changes after `since` up to `revision`.',
+      type: 'object',
+      properties: {
+        revision: {
+          description: 'Revision the client holds once it has applied the returned changes',
+          type: 'integer',
+        },
+        next: {
+          description: 'Revision to pass as `since` for the next page, or null when the client is up to date with the version',
+          type: ['integer', 'null'],
+        },
+        changes: {
+          type: 'array',
+          items: {
+            type: 'object',
+            properties: {
+              kind: {
+                type: 'string',
+                enum: ['command', 'evr', 'channel', 'mil1553'],
+              },
+              op: {
+                description: 'upsert: the element was created or updated; delete: the element was deleted',
+                type: 'string',
+                enum: ['upsert', 'delete'],
+              },
+              revision: { type: 'integer' },
+              key: {
+                description: 'Stable identifier of the element',
+                type: 'string',
+              },
+              name: { type: 'string' },
+              document: {
+                description: 'The element as stored (upserts only)',
+                type: 'object',
+                additionalProperties: true,
+              },
+            },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/export
+export const exportDictionaryContentSchema = {
+  summary: 'Export the full content of a dictionary version',
+  description: 'Returns the dictionary and all of its commands, evrs, channels and mil1553 variables in one document. Published versions are served from a prebuilt, gzip-compressed artifact.',
+  tags: ['Dictionary Content'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: {
+        description: 'Type of Dictionary (sse/flight)',
+        type: 'string',
+        enum: ['sse', 'flight'],
+      },
+      dictionary_version: {
+        description: 'Version of the specific dictionary type',
+        type: 'string',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. The full dictionary version.',
+      type: 'object',
+      properties: {
+        format: {
+          description: 'Version of the export format',
+          type: 'integer',
+        },
+        built_at: {
+          description: 'When the export was produced',
+          type: 'string',
+        },
+        dictionary: {
+          description: 'The dictionary version details',
+          type: 'object',
+          additionalProperties: true,
+        },
+        content: {
+          type: 'object',
+          properties: {
+            command: { type: 'array', items: commandObjectSchema },
+            evr: { type: 'array', items: evrObjectSchema },
+            channel: { type: 'array', items: channelObjectSchema },
+            mil1553: { type: 'array', items: mil1553DetailsObjectSchema },
+          },
+        },
+        enumeration_sets: {
+          description: 'Shared enumeration sets referenced by `enumerations_ref`, keyed by hash',
+          type: 'object',
+          additionalProperties: { type: 'array', items: enumerationsSchema },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for POST /dictionaries/{dictionary_type}/versions/{dictionary_version}/import
+export const importDictionaryXmlSchema = {
+  summary: 'Import an FSW dictionary XML document',
+  description: 'Creates the commands, evrs and channels described by an XML dictionary sent as `application/xml`. The document is parsed while it is received and written in batches, so large dictionaries import with bounded memory. `command`, `evr` and `channel` elements are mapped onto the same fields as the create endpoints: scalar fields come from the attribute or child element of the same name, array fields from the children of the element of the same name (e.g. `<arguments><argument .../></arguments>`). If any element is invalid or already exists, nothing is imported.',
+  tags: ['Dictionary Content'],
+  security: [{ bearerAuth: [] }],
+  consumes: ['application/xml', 'text/xml'],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: {
+        description: 'Type of Dictionary (sse/flight)',
+        type: 'string',
+        enum: ['sse', 'flight'],
+      },
+      dictionary_version: {
+        description: 'Version of the specific dictionary type',
+        type: 'string',
+      },
+    },
+  },
+  response: {
+    201: {
+      description: 'Success. The dictionary content is imported.',
+      type: 'object',
+      properties: {
+        revision: {
+          description: 'Last revision of the dictionary version the import was written at (one revision per batch of elements)',
+          type: 'integer',
+        },
+        imported: {
+          description: 'Number of elements imported per kind',
+          type: 'object',
+          properties: {
+            command: { type: 'integer' },
+            evr: { type: 'integer' },
+            channel: { type: 'integer' },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
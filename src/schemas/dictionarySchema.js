@@ -181,6 +181,87 @@ export const getDictionaryByVersionSchema = {
   },
 };
 
+// Element counts of one content kind in a dictionary summary
+const kindSummarySchema = {
+  type: 'object',
+  properties: {
+    total: {
+      description: 'Number of elements',
+      type: 'integer',
+    },
+    by: {
+      description: 'For each summarized field, the number of elements per value (elements without the field are counted under "")',
+      type: 'object',
+      additionalProperties: {
+        type: 'object',
+        additionalProperties: { type: 'integer' },
+      },
+    },
+  },
+};
+
+// Schema for GET /dictionaries/{dictionary_type}/versions/{dictionary_version}/summary
+export const getDictionarySummarySchema = {
+  summary: 'Get summary statistics of a dictionary',
+  description: 'Returns the number of commands, evrs, channels and mil1553 variables of the dictionary version, by operations category, command type, evr level and channel type. Published versions are summarized when they are published; the summary of other versions is recomputed on the first read after a write.',
+  tags: ['Dictionary'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['dictionary_type', 'dictionary_version'],
+    properties: {
+      dictionary_type: {
+        description: 'Type of Dictionary (sse/flight)',
+        type: 'string',
+        enum: ['sse', 'flight'],
+      },
+      dictionary_version: {
+        description: 'Version of the specific dictionary type',
+        type: 'string',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Summary of the dictionary version.',
+      type: 'object',
+      properties: {
+        revision: {
+          description: 'Revision of the dictionary version the summary was computed at',
+          type: 'integer',
+        },
+        computed_at: {
+          description: 'When the summary was computed',
+          type: 'string',
+        },
+        content: {
+          description: 'Summary per kind of element',
+          type: 'object',
+          properties: {
+            command: {
+              ...kindSummarySchema,
+              description: 'Commands: total and counts by `operations_category` and `cmd_type`',
+            },
+            evr: {
+              ...kindSummarySchema,
+              description: 'EVRs: total and counts by `operations_category` and `evr_level`',
+            },
+            channel: {
+              ...kindSummarySchema,
+              description: 'Channels: total and counts by `operations_category` and `type`',
+            },
+            mil1553: {
+              ...kindSummarySchema,
+              description: 'Mil1553 variables: total and counts by `operations_category`',
+            },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
 // Schema for DELETE /dictionaries/{dictionary_type}/versions/{dictionary_version}
 export const deleteDictionarySchema = {
   summary: 'Deletes a dictionary',
@@ -18,3 +18,71 @@ export const healthCheckSchema = {
     ...commonErrorResponses 
   }
 };
+
+// Schema for GET /health/warmup
+export const warmupHealthSchema = {
+  description: 'Outcome of the startup cache warm-up of recently published dictionary versions. `/health` answers 503 while it is pending or running.',
+  tags: ['Health'],
+  response: {
+    200: {
+      description: 'Warm-up status',
+      type: 'object',
+      properties: {
+        state: {
+          type: 'string',
+          enum: ['disabled', 'pending', 'running', 'done', 'failed']
+        },
+        versions: {
+          type: 'array',
+          description: 'Versions warmed so far',
+          items: {
+            type: 'object',
+            properties: {
+              dictionary_type: { type: 'string' },
+              dictionary_version: { type: 'string' },
+              documents: { type: 'integer', description: 'Content documents read' },
+              artifact_bytes: { type: 'integer', description: 'Size of the loaded artifact (gzip)' }
+            }
+          }
+        },
+        documents: { type: 'integer', description: 'Content documents read in total' },
+        artifact_bytes: { type: 'integer', description: 'Size of the loaded artifacts in total' },
+        duration_ms: { type: 'integer', description: 'Duration of the finished warm-up' }
+      },
+      required: ['state']
+    },
+    ...commonErrorResponses
+  }
+};
+
+// Schema for GET /health/arangodb
+export const arangoHealthSchema = {
+  description: 'ArangoDB connection pool configuration and utilization.',
+  tags: ['Health'],
+  security: [{ bearerAuth: [] }],
+  response: {
+    200: {
+      description: 'Connection pool status',
+      type: 'object',
+      properties: {
+        status: {
+          type: 'string',
+          description: 'OK when the database answered a version request'
+        },
+        coordinators: { type: 'integer', description: 'Number of configured coordinator URLs' },
+        load_balancing: { type: 'string', description: 'Load balancing strategy across coordinators' },
+        max_sockets: { type: 'integer', description: 'Sockets per coordinator' },
+        keep_alive: { type: 'boolean' },
+        in_flight: { type: 'integer', description: 'Requests currently sent to ArangoDB' },
+        peak_in_flight: { type: 'integer', description: 'Most requests in flight at once since startup' },
+        utilization: { type: 'number', description: 'in_flight divided by the total socket capacity' },
+        saturated: { type: 'integer', description: 'Requests sent while every socket was in use' },
+        requests: { type: 'integer' },
+        errors: { type: 'integer' },
+        server_queue_time_ms: { type: 'number', description: 'Average time recent requests waited in the server queue' }
+      },
+      required: ['status']
+    },
+    ...commonErrorResponses
+  }
+};
@@ -33,6 +33,16 @@ export const notFoundErrorSchema = createErrorSchema(
   'The requested resource was not found.'
 );
 
+export const tooManyRequestsErrorSchema = createErrorSchema(
+  'Too Many Requests - The caller exceeded its request rate. Retry after the number of seconds in the Retry-After header.',
+  'Rate limit exceeded. Retry later.'
+);
+
+export const serviceUnavailableErrorSchema = createErrorSchema(
+  'Service Unavailable - Too many requests of this kind are in progress. Retry after the number of seconds in the Retry-After header.',
+  'The server is busy. Retry later.'
+);
+
 export const internalServerErrorSchema = createErrorSchema(
   'Internal Server Error - The server encountered an unexpected condition that prevented it from fulfilling the request.',
   'An unexpected error occurred on the server.'
@@ -82,5 +92,7 @@ export const commonErrorResponses = {
   401: unauthorizedErrorSchema,
   403: forbiddenErrorSchema,
   404: notFoundErrorSchema,
-  500: internalServerErrorSchema
+  429: tooManyRequestsErrorSchema,
+  500: internalServerErrorSchema,
+  503: serviceUnavailableErrorSchema
 };
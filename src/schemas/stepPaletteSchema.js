@@ -0,0 +1,264 @@
+// src/schemas/stepPaletteSchema.js
+
+import { commonErrorResponses } from './shared_schemas/sharedSchemas.js';
+import { BUILT_IN_STEP_TYPES } from '../config/stepPalette.js';
+
+// Schema for the PaletteBuiltInStep object
+const paletteBuiltInStepSchema = {
+  type: 'object',
+  properties: {
+    step_type: {
+      description: 'The Ingenium built in type',
+      type: 'string',
+      enum: BUILT_IN_STEP_TYPES,
+    },
+    step_display_name: {
+      description: 'The display name for a given step',
+      type: 'string',
+    },
+    palette_catagory: {
+      description: 'The catagory or header for the step (e.g. Telemetry)',
+      type: 'string',
+    },
+    enable_disable: {
+      description: "Whether the step is enabled in the palette (used primarily for builtins which can't be deleted)",
+      type: 'string',
+      enum: ['ENABLE', 'DISABLE'],
+    },
+  },
+};
+
+// Schema for the PaletteBuiltInStepPatch object
+const paletteBuiltInStepPatchSchema = {
+  type: 'object',
+  properties: {
+    step_display_name: paletteBuiltInStepSchema.properties.step_display_name,
+    palette_catagory: paletteBuiltInStepSchema.properties.palette_catagory,
+    enable_disable: paletteBuiltInStepSchema.properties.enable_disable,
+  },
+  additionalProperties: false,
+};
+
+// Schema for the PaletteCustomStep object
+const paletteCustomStepSchema = {
+  type: 'object',
+  required: ['step_id'],
+  properties: {
+    step_id: {
+      description: 'The custom script id (or built in hardcoded id)',
+      type: 'string',
+    },
+    step_display_name: {
+      description: 'The display name for a given step',
+      type: 'string',
+    },
+    palette_catagory: {
+      description: 'The catagory or header for the step (e.g. Telemetry)',
+      type: 'string',
+    },
+  },
+};
+
+// Schema for the PaletteCustomStepPatch object
+const paletteCustomStepPatchSchema = {
+  type: 'object',
+  properties: {
+    step_display_name: paletteCustomStepSchema.properties.step_display_name,
+    palette_catagory: paletteCustomStepSchema.properties.palette_catagory,
+  },
+  additionalProperties: false,
+};
+
+const notModifiedResponse = {
+  description: 'Not Modified. The palette has not changed since the ETag given in If-None-Match.',
+  type: 'null',
+};
+
+const stepIdParams = {
+  type: 'object',
+  required: ['step_id'],
+  properties: {
+    step_id: {
+      description: 'Id of the custom step',
+      type: 'string',
+    },
+  },
+};
+
+// Schema for GET /step_palette/built_in
+export const getBuiltInStepsSchema = {
+  summary: 'Get a list of all built in steps contained in the step palette',
+  description: 'Get a list of all built in steps contained in the step palette. Responses carry an ETag; send it back in If-None-Match to receive 304 Not Modified while the palette is unchanged.',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  querystring: {
+    type: 'object',
+    properties: {
+      step_type: {
+        description: 'Limits (partial match) the query on step_type of built in steps in the palette',
+        type: 'string',
+      },
+      display_name: {
+        description: 'Limits (partial match) the query on names of built in steps in the palette',
+        type: 'string',
+      },
+      enable_disable: {
+        description: 'Limits the query on whether a step is enabled or disabled',
+        type: 'string',
+        enum: ['ENABLE', 'DISABLE'],
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. A list of all the built in steps in the palette.',
+      type: 'array',
+      items: paletteBuiltInStepSchema,
+    },
+    304: notModifiedResponse,
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for PATCH /step_palette/built_in/{step_type}
+export const updateBuiltInStepSchema = {
+  summary: 'Update a built in step in the step palette',
+  description: 'Update a built in step in the step palette',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['step_type'],
+    properties: {
+      step_type: paletteBuiltInStepSchema.properties.step_type,
+    },
+  },
+  body: paletteBuiltInStepPatchSchema,
+  response: {
+    200: {
+      description: 'Success. Step Updated.',
+      ...paletteBuiltInStepSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /step_palette/custom
+export const getCustomStepsSchema = {
+  summary: 'Get a list of all custom steps contained in the step palette',
+  description: 'Get a list of all custom steps contained in the step palette. Every ACTIVE custom script is a custom step unless it was removed from the palette. Responses carry an ETag; send it back in If-None-Match to receive 304 Not Modified while the palette is unchanged.',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  querystring: {
+    type: 'object',
+    properties: {
+      sort: {
+        description: 'Orders the results by element name (alphabetic - ascending/descending)',
+        type: 'string',
+        enum: ['ASC', 'DESC'],
+      },
+      limit: {
+        description: 'Limit on the number of returned results',
+        type: 'integer',
+        default: 20,
+      },
+      offset: {
+        description: 'Offset for pagination',
+        type: 'integer',
+      },
+      wild: {
+        description: 'Modifies search fields to use search optimized (true) vs. typeahead optimized (false)',
+        type: 'boolean',
+        default: false,
+      },
+      display_name: {
+        description: 'Limits (partial match) the query on steps in the palette',
+        type: 'string',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. A list of all the custom steps in the palette.',
+      headers: {
+        'x-total-count': {
+          description: 'The total number of steps',
+          type: 'integer',
+        },
+      },
+      type: 'array',
+      items: paletteCustomStepSchema,
+    },
+    304: notModifiedResponse,
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for POST /step_palette/custom
+export const createCustomStepsSchema = {
+  summary: 'Add custom step(s) to the palette',
+  description: 'Add custom step(s) to the palette',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  body: {
+    type: 'array',
+    items: paletteCustomStepSchema,
+  },
+  response: {
+    201: {
+      description: 'Success. Custom Scripts added to the palette.',
+      type: 'array',
+      items: paletteCustomStepSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /step_palette/custom/{step_id}
+export const getCustomStepByIdSchema = {
+  summary: 'Get a specific custom step in the step palette',
+  description: 'Get a specific custom step in the step palette',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  params: stepIdParams,
+  response: {
+    200: {
+      description: 'Success. The details of a specific step in the palette.',
+      ...paletteCustomStepSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for PATCH /step_palette/custom/{step_id}
+export const updateCustomStepSchema = {
+  summary: 'Update a custom step in the palette',
+  description: 'Update a custom step in the palette',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  params: stepIdParams,
+  body: paletteCustomStepPatchSchema,
+  response: {
+    200: {
+      description: 'Success. Custom step updated.',
+      ...paletteCustomStepSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for DELETE /step_palette/custom/{step_id}
+export const deleteCustomStepSchema = {
+  summary: 'Delete a custom step in the palette',
+  description: 'Delete a custom step in the palette',
+  tags: ['Palette'],
+  security: [{ bearerAuth: [] }],
+  params: stepIdParams,
+  response: {
+    204: {
+      description: 'Success. Step in step palette deleted.',
+      type: 'null',
+    },
+    ...commonErrorResponses,
+  },
+};
@@ -120,10 +120,6 @@ export const getVerificationItemsSchema = {
         description: 'Limits (partial match) the query on the vi\'s text',
         type: 'string',
       },
-      va_poc: {
-        description: 'Limits (partial match) the query on verification activity point of contact',
-        type: 'string',
-      },
       vac_name: {
         description: 'Limits (partial match) the query on the name of the vac',
         type: 'string',
@@ -243,4 +239,246 @@ export const bulkQueryVerificationItemsSchema = {
     },
     ...commonErrorResponses,
   },
-};
\ No newline at end of file
+};
+
+// Schema for GET /vnv/vas/{va}
+export const getVerificationItemsByVaSchema = {
+  summary: 'List the verification items linked to a verification activity',
+  description: 'List the verification items whose vas contain the given verification activity. Served from an array index, sorted by vi_id.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['va'],
+    properties: {
+      va: {
+        description: 'Name of the verification activity',
+        type: 'string',
+      },
+    },
+  },
+  querystring: {
+    type: 'object',
+    properties: {
+      limit: {
+        description: 'Limit on the number of returned results',
+        type: 'integer',
+        default: 20,
+      },
+      offset: {
+        description: 'Offset for pagination',
+        type: 'integer',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. The verification items linked to the verification activity.',
+      headers: {
+        'x-total-count': {
+          description: 'The total number of linked verification items',
+          type: 'integer',
+        },
+      },
+      type: 'array',
+      items: verificationItemObjectSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for GET /vnv/vacs/{vac}
+export const getVerificationItemsByVacSchema = {
+  summary: 'List the verification items linked to a verification activity collection',
+  description: 'List the verification items whose vacs contain the given verification activity collection. Served from an array index, sorted by vi_id.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  params: {
+    type: 'object',
+    required: ['vac'],
+    properties: {
+      vac: {
+        description: 'Name of the verification activity collection',
+        type: 'string',
+      },
+    },
+  },
+  querystring: {
+    type: 'object',
+    properties: {
+      limit: {
+        description: 'Limit on the number of returned results',
+        type: 'integer',
+        default: 20,
+      },
+      offset: {
+        description: 'Offset for pagination',
+        type: 'integer',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. The verification items linked to the verification activity collection.',
+      headers: {
+        'x-total-count': {
+          description: 'The total number of linked verification items',
+          type: 'integer',
+        },
+      },
+      type: 'array',
+      items: verificationItemObjectSchema,
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for POST /vnv/vas/bulk
+export const bulkQueryVasSchema = {
+  summary: 'Look up the verification items linked to many verification activities',
+  description: 'Returns, for every verification activity in the request body, the vi_ids of the verification items linked to it. Post is used instead of Get since many verification activities may be sent. Accepts up to 10000 verification activities.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  body: {
+    description: 'Array of verification activity names',
+    type: 'array',
+    maxItems: 10000,
+    items: {
+      type: 'string',
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. One entry per requested verification activity, in request order.',
+      type: 'array',
+      items: {
+        type: 'object',
+        properties: {
+          va: {
+            description: 'Name of the verification activity',
+            type: 'string',
+          },
+          vi_ids: {
+            description: 'vi_ids of the linked verification items, sorted',
+            type: 'array',
+            items: { type: 'string' },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
+// Schema for POST /vnv/vacs/bulk
+export const bulkQueryVacsSchema = {
+  summary: 'Look up the verification items linked to many verification activity collections',
+  description: 'Returns, for every verification activity collection in the request body, the vi_ids of the verification items linked to it. Post is used instead of Get since many verification activity collections may be sent. Accepts up to 10000 verification activity collections.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  body: {
+    description: 'Array of verification activity collection names',
+    type: 'array',
+    maxItems: 10000,
+    items: {
+      type: 'string',
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. One entry per requested verification activity collection, in request order.',
+      type: 'array',
+      items: {
+        type: 'object',
+        properties: {
+          vac: {
+            description: 'Name of the verification activity collection',
+            type: 'string',
+          },
+          vi_ids: {
+            description: 'vi_ids of the linked verification items, sorted',
+            type: 'array',
+            items: { type: 'string' },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
+
+const viGroupStatsProperties = {
+  count: {
+    description: 'Number of verification items in the group',
+    type: 'integer',
+  },
+  without_vas: {
+    description: 'Number of verification items in the group not linked to any verification activity',
+    type: 'integer',
+  },
+  without_vacs: {
+    description: 'Number of verification items in the group not linked to any verification activity collection',
+    type: 'integer',
+  },
+};
+
+// Schema for GET /vnv/stats
+export const getVerificationItemStatsSchema = {
+  summary: 'Aggregated statistics of verification items',
+  description: 'Counts verification items by vi_type and by vi_owner, and how many are not linked to any verification activity (empty vas) or activity collection (empty vacs). Computed in the database and cached briefly; any VI write invalidates the cache.',
+  tags: ['Verification and Validation'],
+  security: [{ bearerAuth: [] }],
+  querystring: {
+    type: 'object',
+    properties: {
+      vi_type: {
+        description: 'Only count verification items of this type',
+        type: 'string',
+      },
+      vi_owner: {
+        description: 'Only count verification items of this owner',
+        type: 'string',
+      },
+      va_name: {
+        description: 'Only count verification items linked to this verification activity',
+        type: 'string',
+      },
+      vac_name: {
+        description: 'Only count verification items linked to this verification activity collection',
+        type: 'string',
+      },
+    },
+  },
+  response: {
+    200: {
+      description: 'Success. Verification item statistics.',
+      type: 'object',
+      properties: {
+        ...viGroupStatsProperties,
+        by_type: {
+          description: 'Statistics per vi_type',
+          type: 'array',
+          items: {
+            type: 'object',
+            properties: {
+              vi_type: { type: 'string', nullable: true },
+              ...viGroupStatsProperties,
+            },
+          },
+        },
+        by_owner: {
+          description: 'Statistics per vi_owner',
+          type: 'array',
+          items: {
+            type: 'object',
+            properties: {
+              vi_owner: { type: 'string', nullable: true },
+              ...viGroupStatsProperties,
+            },
+          },
+        },
+      },
+    },
+    ...commonErrorResponses,
+  },
+};
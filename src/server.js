@@ -1,15 +1,40 @@
 // Import Fastify
 import Fastify from 'fastify';
+import { performance } from 'node:perf_hooks';
 import fastifySwagger from '@fastify/swagger';
 import fastifySwaggerUi from '@fastify/swagger-ui';
-import { APP_PORT, APP_HOST, PUBLIC_PEM, NODE_ENV  } from './config/env.js';
+import { APP_PORT, APP_HOST, PUBLIC_PEM, NODE_ENV, SCHEMA_MODE, PRECOMPILED_SCHEMA_DIR } from './config/env.js';
 import healthRoutes from './routes/health.js';
 import dictionaryRoutes from './routes/dictionary.js';
 import dictionaryContentRoutes from './routes/dictionaryContent.js';
 import vnvRoutes from './routes/vnv.js';
 import customScriptRoutes from './routes/customScript.js';
+import stepPaletteRoutes from './routes/stepPalette.js';
+import batchRoutes from './routes/batch.js';
+import coverageRoutes from './routes/coverage.js';
+import tracingPlugin from './plugins/tracing.js';
 import arangoPlugin from './plugins/arangodb.js';
 import authPlugin from './plugins/auth.js';
+import admissionPlugin from './plugins/admission.js';
+import chunkedBodyPlugin from './plugins/chunkedBody.js';
+import contentCountsPlugin from './plugins/contentCounts.js';
+import contentEventsPlugin from './plugins/contentEvents.js';
+import contentRevisionsPlugin from './plugins/contentRevisions.js';
+import enumerationSetsPlugin from './plugins/enumerationSets.js';
+import publishedArtifactsPlugin from './plugins/publishedArtifacts.js';
+import stepPalettePlugin from './plugins/stepPalette.js';
+import viLinksPlugin from './plugins/viLinks.js';
+import msgpackPlugin from './plugins/msgpack.js';
+import compressionPlugin from './plugins/compression.js';
+import responseCachePlugin from './plugins/responseCache.js';
+import singleFlightPlugin from './plugins/singleFlight.js';
+import warmupPlugin from './plugins/warmup.js';
+import nameSuggestionsPlugin from './plugins/nameSuggestions.js';
+import dictionarySummaryPlugin from './plugins/dictionarySummary.js';
+import { createSchemaCompilers, readOpenApiDocument } from './utils/schemaCompilers.js';
+
+// Time spent loading modules, in milliseconds since the process started
+const modulesLoaded = performance.now();
 
 const envToLogger = {
   development: {
@@ -25,76 +50,169 @@ const envToLogger = {
   production: true,
   test: false,
 }
-const fastify = Fastify({
-  logger: envToLogger[NODE_ENV] ?? true, // defaults to true if no entry matches in the map
-  bodyLimit: 100 * 1024 * 1024 
-})
-// Register Auth Plugin
-fastify.register(authPlugin, { secret: PUBLIC_PEM });
-// Register ArangoDB Plugin
-fastify.register(arangoPlugin);
-
-// Register Swagger
-fastify.register(fastifySwagger, {
-  openapi: {
-    info: {
-      title: 'Project Config Service API',
-      description: 'API documentation for the Project Config Service',
-      version: '0.1.0'
-    },
-    components: {
-      securitySchemes: {
-        bearerAuth: {
-          type: 'http',
-          scheme: 'bearer',
-          bearerFormat: 'JWT'
-        }
-      }
-    },
-    servers: [{ url: `http://${APP_HOST}:${APP_PORT}` }],
+
+const round = ms => Math.round(ms * 10) / 10;
+
+// Builds the application. `db` replaces the ArangoDB connection, e.g. with
+// the fake database of the benchmarks.
+export function buildServer({ db } = {}) {
+  // Startup milestones, in milliseconds since the process started
+  const startup = { modules: modulesLoaded };
+
+  // Route validators and serializers, compiled or loaded from a schema build
+  const schemaCompilers = createSchemaCompilers(SCHEMA_MODE, PRECOMPILED_SCHEMA_DIR);
+
+  const fastify = Fastify({
+    logger: envToLogger[NODE_ENV] ?? true, // defaults to true if no entry matches in the map
+    bodyLimit: 100 * 1024 * 1024,
+    schemaController: schemaCompilers.schemaController
+  })
+  fastify.addHook('onReady', async () => {
+    startup.ready = performance.now();
+  });
+  // Register request tracing first so every hook and route is covered
+  fastify.register(tracingPlugin);
+  // Register Auth Plugin
+  fastify.register(authPlugin, { secret: PUBLIC_PEM });
+  // Register admission control (concurrency limits per route class)
+  fastify.register(admissionPlugin);
+  // Register cooperative validation of large array bodies
+  fastify.register(chunkedBodyPlugin);
+  // Register ArangoDB Plugin
+  fastify.register(arangoPlugin, { db });
+  // Register cached content counts (depends on ArangoDB)
+  fastify.register(contentCountsPlugin);
+  // Register revision stamping of dictionary content writes (incremental sync)
+  fastify.register(contentRevisionsPlugin);
+  // Register write notifications and published dictionary artifacts
+  fastify.register(contentEventsPlugin);
+  // Register shared enumeration sets of channels and mil1553 variables
+  fastify.register(enumerationSetsPlugin);
+  fastify.register(publishedArtifactsPlugin);
+  // Register the in-memory step palette (kept current from write notifications)
+  fastify.register(stepPalettePlugin);
+  // Register verification item links to dictionary content (kept current from write notifications)
+  fastify.register(viLinksPlugin);
+  // Register in-memory element names for suggestions (kept current from write notifications)
+  fastify.register(nameSuggestionsPlugin);
+  // Register per-version summary statistics (stored on publish, recomputed after writes)
+  fastify.register(dictionarySummaryPlugin);
+  // Register the startup cache warm-up of recently published versions (gates /health)
+  fastify.register(warmupPlugin);
+  // Register response content negotiation (MessagePack, then gzip/brotli compression)
+  fastify.register(msgpackPlugin);
+  fastify.register(compressionPlugin);
+  // Register the serialized response cache for list and search endpoints
+  fastify.register(responseCachePlugin);
+  // Register request coalescing for identical concurrent reads (after compression so shared bytes are final)
+  fastify.register(singleFlightPlugin);
+
+  // Register Swagger. The OpenAPI document of a schema build is served as is
+  // while the route schemas match the build; otherwise it is generated from
+  // the routes, which are only all known once the server is ready.
+  const openapiStart = performance.now();
+  const openapiDocument = SCHEMA_MODE === 'precompiled' ? readOpenApiDocument(PRECOMPILED_SCHEMA_DIR) : null;
+  startup.openapi = performance.now() - openapiStart;
+  const servers = [{ url: `http://${APP_HOST}:${APP_PORT}` }];
+  let storedDocument = null;
+
+  if (SCHEMA_MODE === 'precompiled' && !openapiDocument) {
+    fastify.log.warn(`No OpenAPI document in ${PRECOMPILED_SCHEMA_DIR}; generating it from the routes`);
   }
-});
-
-// Register Swagger UI
-fastify.register(fastifySwaggerUi, {
-  routePrefix: '/api-docs',
-  uiConfig: {
-    docExpansion: 'list',
-    deepLinking: true
-  },
-  uiHooks: {
-    onRequest: function (request, reply, next) { next() },
-    preHandler: function (request, reply, next) { next() }
-  },
-  staticCSP: false,
-  transformStaticCSP: (header) => header,
-  transformSpecification: (swaggerObject, request, reply) => { return swaggerObject },
-  transformSpecificationClone: true
-});
-
-
-// Global error handler
-fastify.setErrorHandler((error, request, reply) => {
-  fastify.log.error(error, 'An error occurred');
-
-  const statusCode = error.statusCode && error.statusCode >= 400 ? error.statusCode : 500;
-  const response = {
-    statusCode: statusCode,
-    error: error.validation ? 'Validation Error' : (error.name && statusCode !== 500 ? error.name : 'Internal Server Error'),
-    message: error.validation ? error.message : (statusCode === 500 && process.env.NODE_ENV !== 'development' ? 'An unexpected error occurred' : error.message)
-  };
-
-  if (error.validation) {
-    response.details = error.validation;
+  if (openapiDocument) {
+    fastify.addHook('onReady', async () => {
+      if (schemaCompilers.matchesBuild()) {
+        storedDocument = { ...openapiDocument, servers };
+      } else {
+        fastify.log.warn(`Route schemas changed since the build in ${PRECOMPILED_SCHEMA_DIR}; generating the OpenAPI document from the routes`);
+      }
+    });
   }
 
-  reply.status(statusCode).send(response);
-});
+  fastify.register(fastifySwagger, {
+    openapi: {
+      info: {
+        title: 'Project Config Service API',
+        description: 'API documentation for the Project Config Service',
+        version: '0.1.0'
+      },
+      components: {
+        securitySchemes: {
+          bearerAuth: {
+            type: 'http',
+            scheme: 'bearer',
+            bearerFormat: 'JWT'
+          }
+        }
+      },
+      servers,
+    }
+  });
+
+  // Register Swagger UI
+  fastify.register(fastifySwaggerUi, {
+    routePrefix: '/api-docs',
+    uiConfig: {
+      docExpansion: 'list',
+      deepLinking: true
+    },
+    uiHooks: {
+      onRequest: function (request, reply, next) { next() },
+      preHandler: function (request, reply, next) { next() }
+    },
+    staticCSP: false,
+    transformStaticCSP: (header) => header,
+    transformSpecification: (swaggerObject, request, reply) => { return storedDocument ?? swaggerObject },
+    transformSpecificationClone: true
+  });
+
+
+  // Global error handler
+  fastify.setErrorHandler((error, request, reply) => {
+    fastify.log.error(error, 'An error occurred');
+
+    const statusCode = error.statusCode && error.statusCode >= 400 ? error.statusCode : 500;
+    const response = {
+      statusCode: statusCode,
+      error: error.validation ? 'Validation Error' : (error.name && statusCode !== 500 ? error.name : 'Internal Server Error'),
+      message: error.validation ? error.message : (statusCode === 500 && process.env.NODE_ENV !== 'development' ? 'An unexpected error occurred' : error.message)
+    };
+
+    if (error.validation) {
+      response.details = error.validation;
+    }
+
+    reply.status(statusCode).send(response);
+  });
+
+  // Register health routes
+  fastify.register(healthRoutes, { prefix: '/api/v4' });
+  fastify.register(dictionaryRoutes, { prefix: 'api/v4'});
+  fastify.register(dictionaryContentRoutes, { prefix: 'api/v4'});
+  fastify.register(vnvRoutes, { prefix: 'api/v4'});
+  fastify.register(customScriptRoutes, { prefix: 'api/v4'});
+  fastify.register(stepPaletteRoutes, { prefix: 'api/v4'});
+  fastify.register(batchRoutes, { prefix: 'api/v4'});
+  fastify.register(coverageRoutes, { prefix: 'api/v4'});
+
+  fastify.decorate('schemaCompilers', schemaCompilers);
+
+  // Where startup time went, in milliseconds; call once the server is listening
+  fastify.decorate('startupBreakdown', () => {
+    const { validators, serializers } = schemaCompilers.stats;
+    return {
+      schema_mode: SCHEMA_MODE,
+      modules_ms: round(startup.modules),
+      openapi_ms: round(startup.openapi),
+      validators: { ...validators, ms: round(validators.ms) },
+      serializers: { ...serializers, ms: round(serializers.ms) },
+      plugins_and_routes_ms: round(startup.ready - startup.modules - startup.openapi - validators.ms - serializers.ms),
+      listen_ms: round(performance.now() - startup.ready),
+      total_ms: round(performance.now()),
+    };
+  });
+
+  return fastify;
+}
 
-// Register health routes
-fastify.register(healthRoutes, { prefix: '/api/v4' });
-fastify.register(dictionaryRoutes, { prefix: 'api/v4'});
-fastify.register(dictionaryContentRoutes, { prefix: 'api/v4'});
-fastify.register(vnvRoutes, { prefix: 'api/v4'});
-fastify.register(customScriptRoutes, { prefix: 'api/v4'});
-export default fastify;
+export default buildServer;
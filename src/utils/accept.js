@@ -0,0 +1,37 @@
+// Helpers for HTTP content negotiation (Accept / Accept-Encoding headers)
+
+// Parses an Accept style header into a Map of lower-cased value -> quality
+export function parseAcceptHeader(header) {
+  const values = new Map();
+  if (!header) return values;
+
+  for (const part of String(header).split(',')) {
+    const [value, ...params] = part.trim().split(';');
+    if (!value) continue;
+
+    let quality = 1;
+    for (const param of params) {
+      const [name, q] = param.trim().split('=');
+      if (name === 'q') {
+        const parsed = Number.parseFloat(q);
+        quality = Number.isNaN(parsed) ? 0 : parsed;
+      }
+    }
+    values.set(value.trim().toLowerCase(), quality);
+  }
+  return values;
+}
+
+// Returns the quality the header gives to `value`, honouring a '*' wildcard
+// (and 'type/*' for media types). Returns 0 when the value is not accepted.
+export function acceptQuality(accepted, value) {
+  if (accepted.has(value)) return accepted.get(value);
+
+  const slash = value.indexOf('/');
+  if (slash !== -1 && accepted.has(`${value.slice(0, slash)}/*`)) {
+    return accepted.get(`${value.slice(0, slash)}/*`);
+  }
+  if (accepted.has('*/*')) return accepted.get('*/*');
+  if (accepted.has('*')) return accepted.get('*');
+  return 0;
+}
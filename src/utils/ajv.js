@@ -0,0 +1,11 @@
+import Ajv from 'ajv';
+
+// Validator with the same coercion and defaults as Fastify's own, for
+// validating data outside of a route's schema
+export const ajv = new Ajv({
+  coerceTypes: 'array',
+  useDefaults: true,
+  removeAdditional: true,
+  allErrors: false,
+  strict: false
+});
@@ -0,0 +1,35 @@
+import { BODY_CHUNK_SIZE } from '../config/env.js';
+
+// Lets pending I/O callbacks (other requests) run before continuing
+export function yieldToEventLoop() {
+  return new Promise(resolve => setImmediate(resolve));
+}
+
+// Calls fn(chunk, offset) for consecutive slices of items, yielding to the
+// event loop between slices so long arrays do not block other requests.
+export async function forEachChunk(items, fn, chunkSize = BODY_CHUNK_SIZE) {
+  for (let offset = 0; offset < items.length; offset += chunkSize) {
+    if (offset > 0) await yieldToEventLoop();
+    await fn(items.slice(offset, offset + chunkSize), offset);
+  }
+}
+
+// Like items.map(fn), cooperatively
+export async function mapInChunks(items, fn, chunkSize = BODY_CHUNK_SIZE) {
+  const results = new Array(items.length);
+  await forEachChunk(items, (chunk, offset) => {
+    for (let i = 0; i < chunk.length; i++) {
+      results[offset + i] = fn(chunk[i], offset + i);
+    }
+  }, chunkSize);
+  return results;
+}
+
+// Saves documents with one saveAll per chunk and returns the combined results
+export async function saveAllInChunks(collection, documents, options, chunkSize = BODY_CHUNK_SIZE) {
+  const results = [];
+  await forEachChunk(documents, async chunk => {
+    results.push(...await collection.saveAll(chunk, options));
+  }, chunkSize);
+  return results;
+}
@@ -0,0 +1,97 @@
+import {
+  commandObjectSchema,
+  evrObjectSchema,
+  channelObjectSchema
+} from '../schemas/dictionaryContentSchema.js';
+import { ajv } from './ajv.js';
+import { XmlSaxParser } from './xmlSax.js';
+
+// Elements of an FSW dictionary XML document that become dictionary content,
+// by content kind. Each is mapped onto its object schema: a scalar field is
+// read from the attribute or child element of the same name, and an array
+// field from the children of the element of the same name, e.g.
+//
+//   <command command_stem="FSW_NOOP" repeat_min="0">
+//     <cmd_description>No operation</cmd_description>
+//     <restricted_modes><mode>SAFE</mode></restricted_modes>
+//     <arguments>
+//       <argument argument_type="ENUM" argument_size="8">
+//         <enumerations><enum symbol="ON" numeric="1"/></enumerations>
+//       </argument>
+//     </arguments>
+//   </command>
+//
+// Other elements (the document root, grouping elements, headers) are ignored.
+export const XML_RECORD_SCHEMAS = {
+  command: commandObjectSchema,
+  evr: evrObjectSchema,
+  channel: channelObjectSchema,
+};
+
+const validators = Object.fromEntries(
+  Object.entries(XML_RECORD_SCHEMAS).map(([kind, schema]) => [kind, ajv.compile(schema)])
+);
+
+function childNamed(node, name) {
+  return node.children.find(child => child.name === name);
+}
+
+function coerce(raw, property) {
+  const value = raw.trim();
+  if (property.type === 'integer' && /^[-+]?\d+$/.test(value)) return Number(value);
+  if (property.type === 'number' && value !== '' && Number.isFinite(Number(value))) return Number(value);
+  return value;
+}
+
+function toDocument(node, schema) {
+  const doc = {};
+  for (const [field, property] of Object.entries(schema.properties)) {
+    if (property.type === 'array') {
+      const list = childNamed(node, field);
+      if (!list) continue;
+      doc[field] = list.children.map(item => property.items.type === 'object'
+        ? toDocument(item, property.items)
+        : coerce(item.text, property.items));
+    } else {
+      const value = node.attributes[field] ?? childNamed(node, field)?.text;
+      if (value !== undefined) doc[field] = coerce(value, property);
+    }
+  }
+  return doc;
+}
+
+// Returns a streaming parser that calls onRecord(kind, document) as soon as
+// each command, evr or channel element has been read. Only the element being
+// read is held in memory. Invalid elements throw with their position.
+export function createDictionaryXmlParser(onRecord) {
+  const counts = Object.fromEntries(Object.keys(XML_RECORD_SCHEMAS).map(kind => [kind, 0]));
+  // Open elements of the record being read; empty between records
+  const stack = [];
+
+  return new XmlSaxParser({
+    onOpen(name, attributes) {
+      if (stack.length === 0 && !XML_RECORD_SCHEMAS[name]) return;
+      const node = { name, attributes, children: [], text: '' };
+      stack.at(-1)?.children.push(node);
+      stack.push(node);
+    },
+    onText(text) {
+      if (stack.length > 0) stack.at(-1).text += text;
+    },
+    onClose() {
+      if (stack.length === 0) return;
+      const node = stack.pop();
+      if (stack.length > 0) return;
+
+      const kind = node.name;
+      const document = toDocument(node, XML_RECORD_SCHEMAS[kind]);
+      const validate = validators[kind];
+      counts[kind]++;
+      if (!validate(document)) {
+        const detail = validate.errors.map(error => `${kind}${error.instancePath} ${error.message}`).join(', ');
+        throw new Error(`Invalid ${kind} #${counts[kind]}: ${detail}`);
+      }
+      onRecord(kind, document);
+    }
+  });
+}
@@ -0,0 +1,269 @@
+// Minimal MessagePack (https://msgpack.org) encoder.
+//
+// `encode` serializes any JSON-compatible value. `compileSerializer` builds an
+// encoder from a JSON schema that, like the fast-json-stringify serializer
+// Fastify uses for JSON, only writes the properties declared in the schema
+// and coerces values to the declared types.
+
+const INITIAL_SIZE = 8 * 1024;
+
+class Writer {
+  constructor() {
+    this.buffer = Buffer.allocUnsafe(INITIAL_SIZE);
+    this.offset = 0;
+  }
+
+  ensure(size) {
+    if (this.offset + size <= this.buffer.length) return;
+
+    let length = this.buffer.length * 2;
+    while (length < this.offset + size) length *= 2;
+    const buffer = Buffer.allocUnsafe(length);
+    this.buffer.copy(buffer, 0, 0, this.offset);
+    this.buffer = buffer;
+  }
+
+  u8(value) {
+    this.ensure(1);
+    this.buffer[this.offset++] = value;
+  }
+
+  header(length, fix, fixMax, code8, code16, code32) {
+    if (fix !== null && length <= fixMax) {
+      this.u8(fix | length);
+    } else if (code8 !== null && length < 0x100) {
+      this.ensure(2);
+      this.buffer[this.offset++] = code8;
+      this.buffer[this.offset++] = length;
+    } else if (length < 0x10000) {
+      this.ensure(3);
+      this.buffer[this.offset++] = code16;
+      this.buffer.writeUInt16BE(length, this.offset);
+      this.offset += 2;
+    } else {
+      this.ensure(5);
+      this.buffer[this.offset++] = code32;
+      this.buffer.writeUInt32BE(length, this.offset);
+      this.offset += 4;
+    }
+  }
+
+  nil() {
+    this.u8(0xc0);
+  }
+
+  boolean(value) {
+    this.u8(value ? 0xc3 : 0xc2);
+  }
+
+  integer(value) {
+    if (!Number.isSafeInteger(value)) {
+      this.float(value);
+    } else if (value >= 0) {
+      if (value < 0x80) {
+        this.u8(value);
+      } else if (value < 0x100) {
+        this.ensure(2);
+        this.buffer[this.offset++] = 0xcc;
+        this.buffer[this.offset++] = value;
+      } else if (value < 0x10000) {
+        this.ensure(3);
+        this.buffer[this.offset++] = 0xcd;
+        this.buffer.writeUInt16BE(value, this.offset);
+        this.offset += 2;
+      } else if (value < 0x100000000) {
+        this.ensure(5);
+        this.buffer[this.offset++] = 0xce;
+        this.buffer.writeUInt32BE(value, this.offset);
+        this.offset += 4;
+      } else {
+        this.ensure(9);
+        this.buffer[this.offset++] = 0xcf;
+        this.buffer.writeBigUInt64BE(BigInt(value), this.offset);
+        this.offset += 8;
+      }
+    } else if (value >= -0x20) {
+      this.u8(value & 0xff);
+    } else if (value >= -0x80) {
+      this.ensure(2);
+      this.buffer[this.offset++] = 0xd0;
+      this.buffer.writeInt8(value, this.offset++);
+    } else if (value >= -0x8000) {
+      this.ensure(3);
+      this.buffer[this.offset++] = 0xd1;
+      this.buffer.writeInt16BE(value, this.offset);
+      this.offset += 2;
+    } else if (value >= -0x80000000) {
+      this.ensure(5);
+      this.buffer[this.offset++] = 0xd2;
+      this.buffer.writeInt32BE(value, this.offset);
+      this.offset += 4;
+    } else {
+      this.ensure(9);
+      this.buffer[this.offset++] = 0xd3;
+      this.buffer.writeBigInt64BE(BigInt(value), this.offset);
+      this.offset += 8;
+    }
+  }
+
+  float(value) {
+    this.ensure(9);
+    this.buffer[this.offset++] = 0xcb;
+    this.buffer.writeDoubleBE(value, this.offset);
+    this.offset += 8;
+  }
+
+  number(value) {
+    if (Number.isInteger(value)) {
+      this.integer(value);
+    } else {
+      this.float(value);
+    }
+  }
+
+  string(value) {
+    const length = Buffer.byteLength(value);
+    this.header(length, 0xa0, 31, 0xd9, 0xda, 0xdb);
+    this.ensure(length);
+    this.offset += this.buffer.write(value, this.offset, length, 'utf8');
+  }
+
+  binary(value) {
+    this.header(value.length, null, 0, 0xc4, 0xc5, 0xc6);
+    this.ensure(value.length);
+    value.copy(this.buffer, this.offset);
+    this.offset += value.length;
+  }
+
+  arrayHeader(length) {
+    this.header(length, 0x90, 15, null, 0xdc, 0xdd);
+  }
+
+  mapHeader(length) {
+    this.header(length, 0x80, 15, null, 0xde, 0xdf);
+  }
+
+  result() {
+    return this.buffer.subarray(0, this.offset);
+  }
+}
+
+// Writes any JSON-compatible value
+function writeValue(writer, value) {
+  if (value === null || value === undefined) {
+    writer.nil();
+  } else if (typeof value === 'string') {
+    writer.string(value);
+  } else if (typeof value === 'number') {
+    writer.number(value);
+  } else if (typeof value === 'boolean') {
+    writer.boolean(value);
+  } else if (typeof value === 'bigint') {
+    writer.integer(Number(value));
+  } else if (Array.isArray(value)) {
+    writer.arrayHeader(value.length);
+    for (const item of value) writeValue(writer, item);
+  } else if (Buffer.isBuffer(value)) {
+    writer.binary(value);
+  } else if (typeof value.toJSON === 'function') {
+    writeValue(writer, value.toJSON());
+  } else {
+    const keys = Object.keys(value).filter(key => value[key] !== undefined);
+    writer.mapHeader(keys.length);
+    for (const key of keys) {
+      writer.string(key);
+      writeValue(writer, value[key]);
+    }
+  }
+}
+
+export function encode(value) {
+  const writer = new Writer();
+  writeValue(writer, value);
+  return writer.result();
+}
+
+// Builds a writer function for a JSON schema. Untyped, union and composed
+// schemas fall back to writing the value as is.
+function compileSchema(schema) {
+  if (!schema || typeof schema !== 'object' || Array.isArray(schema.type) ||
+      schema.anyOf || schema.oneOf || schema.allOf || schema.nullable) {
+    return writeValue;
+  }
+
+  switch (schema.type) {
+    case 'string':
+      return (writer, value) => {
+        if (value === null || value === undefined) writer.nil();
+        else writer.string(typeof value === 'string' ? value : String(value?.toJSON?.() ?? value));
+      };
+    case 'integer':
+      return (writer, value) => {
+        if (value === null || value === undefined) writer.nil();
+        else writer.integer(Math.trunc(Number(value)));
+      };
+    case 'number':
+      return (writer, value) => {
+        if (value === null || value === undefined) writer.nil();
+        else writer.number(Number(value));
+      };
+    case 'boolean':
+      return (writer, value) => {
+        if (value === null || value === undefined) writer.nil();
+        else writer.boolean(Boolean(value));
+      };
+    case 'array': {
+      const writeItem = compileSchema(schema.items);
+      return (writer, value) => {
+        if (!Array.isArray(value)) {
+          writer.nil();
+          return;
+        }
+        writer.arrayHeader(value.length);
+        for (const item of value) writeItem(writer, item);
+      };
+    }
+    case 'object': {
+      const properties = Object.entries(schema.properties ?? {})
+        .map(([key, propertySchema]) => [key, compileSchema(propertySchema)]);
+      const declared = new Set(properties.map(([key]) => key));
+      const additional = schema.additionalProperties;
+      const writeAdditional = additional === true
+        ? writeValue
+        : (additional && typeof additional === 'object' ? compileSchema(additional) : null);
+
+      return (writer, value) => {
+        if (value === null || typeof value !== 'object') {
+          writer.nil();
+          return;
+        }
+
+        const present = properties.filter(([key]) => value[key] !== undefined);
+        const extra = writeAdditional
+          ? Object.keys(value).filter(key => !declared.has(key) && value[key] !== undefined)
+          : [];
+
+        writer.mapHeader(present.length + extra.length);
+        for (const [key, writeProperty] of present) {
+          writer.string(key);
+          writeProperty(writer, value[key]);
+        }
+        for (const key of extra) {
+          writer.string(key);
+          writeAdditional(writer, value[key]);
+        }
+      };
+    }
+    default:
+      return writeValue;
+  }
+}
+
+export function compileSerializer(schema) {
+  const write = compileSchema(schema);
+  return (value) => {
+    const writer = new Writer();
+    write(writer, value);
+    return writer.result();
+  };
+}
@@ -0,0 +1,122 @@
+import { createHash } from 'node:crypto';
+import { existsSync, mkdirSync, readFileSync, writeFileSync } from 'node:fs';
+import { createRequire } from 'node:module';
+import { resolve } from 'node:path';
+import { performance } from 'node:perf_hooks';
+import ajvCompiler from '@fastify/ajv-compiler';
+import serializerCompiler from '@fastify/fast-json-stringify-compiler';
+
+const { StandaloneValidator } = ajvCompiler;
+const { SerializerSelector, StandaloneSerializer } = serializerCompiler;
+
+const MANIFEST_FILE = 'manifest.json';
+export const OPENAPI_FILE = 'openapi.json';
+
+// Generated modules are CommonJS
+const require = createRequire(import.meta.url);
+
+const fingerprint = schema => createHash('sha1').update(JSON.stringify(schema)).digest('hex');
+
+function validatorFile({ method, url, httpPart }) {
+  return `validator-${fingerprint([method, url, httpPart]).slice(0, 16)}.cjs`;
+}
+
+function serializerFile({ method, url, httpStatus, contentType }) {
+  return `serializer-${fingerprint([method, url, httpStatus, contentType ?? null]).slice(0, 16)}.cjs`;
+}
+
+const newStats = () => ({ count: 0, restored: 0, compiled: 0, ms: 0 });
+
+// One fingerprint for the schemas of every route, keyed by generated file
+const routeSchemasFingerprint = ({ validators, serializers }) =>
+  fingerprint([Object.entries(validators).sort(), Object.entries(serializers).sort()]);
+
+// Schema controller for the Fastify instance, by SCHEMA_MODE:
+//
+//   compile      validators and serializers are compiled from the route schemas
+//   build        as compile, and their code is written to `dir`
+//   precompiled  the code written by a build is loaded instead of compiling
+//
+// A build records a fingerprint of each route schema; a precompiled function
+// whose schema has changed since (or that is missing) is compiled instead, so
+// stale output never serves a route. Time spent is counted in `stats`. The
+// build also fingerprints the route schemas as a whole, so that its OpenAPI
+// document is only served while no route schema was added, changed or removed.
+export function createSchemaCompilers(mode, dir) {
+  const directory = resolve(dir);
+  const stats = { validators: newStats(), serializers: newStats() };
+  const manifest = { validators: {}, serializers: {} };
+  const seen = { validators: {}, serializers: {} };
+  let restorable = { validators: {}, serializers: {} };
+
+  if (mode === 'build') {
+    mkdirSync(directory, { recursive: true });
+  } else if (mode === 'precompiled' && existsSync(resolve(directory, MANIFEST_FILE))) {
+    restorable = JSON.parse(readFileSync(resolve(directory, MANIFEST_FILE), 'utf8'));
+  }
+
+  function store(part, fileOf) {
+    return (routeOpts, code) => {
+      const file = fileOf(routeOpts);
+      writeFileSync(resolve(directory, file), code);
+      manifest[part][file] = fingerprint(routeOpts.schema);
+    };
+  }
+
+  function timed(part, fileOf, compilerFactory) {
+    return (externalSchemas, options) => {
+      let compile;
+      return routeOpts => {
+        const start = performance.now();
+        const file = fileOf(routeOpts);
+        const schemaFingerprint = fingerprint(routeOpts.schema);
+        seen[part][file] = schemaFingerprint;
+        let fn;
+        if (mode === 'precompiled' && restorable[part][file] === schemaFingerprint) {
+          fn = require(resolve(directory, file));
+          stats[part].restored++;
+        } else {
+          compile ??= compilerFactory(externalSchemas, options);
+          fn = compile(routeOpts);
+          stats[part].compiled++;
+        }
+        stats[part].count++;
+        stats[part].ms += performance.now() - start;
+        return fn;
+      };
+    };
+  }
+
+  const buildValidator = mode === 'build'
+    ? StandaloneValidator({ readMode: false, storeFunction: store('validators', validatorFile) })
+    : ajvCompiler();
+  const buildSerializer = mode === 'build'
+    ? StandaloneSerializer({ readMode: false, storeFunction: store('serializers', serializerFile) })
+    : SerializerSelector();
+
+  return {
+    schemaController: {
+      compilersFactory: {
+        buildValidator: timed('validators', validatorFile, buildValidator),
+        buildSerializer: timed('serializers', serializerFile, buildSerializer),
+      }
+    },
+    stats,
+    // Whether the route schemas are exactly those of the build; call once ready
+    matchesBuild() {
+      return mode === 'precompiled' && restorable.openapi === routeSchemasFingerprint(seen);
+    },
+    // Writes the manifest and OpenAPI document of a build
+    writeBuild(openapiDocument) {
+      manifest.openapi = routeSchemasFingerprint(seen);
+      writeFileSync(resolve(directory, MANIFEST_FILE), JSON.stringify(manifest, null, 2));
+      writeFileSync(resolve(directory, OPENAPI_FILE), JSON.stringify(openapiDocument));
+    }
+  };
+}
+
+// The OpenAPI document written by a build, or null if there is none
+export function readOpenApiDocument(dir) {
+  const file = resolve(dir, OPENAPI_FILE);
+  return existsSync(file) ? JSON.parse(readFileSync(file, 'utf8')) : null;
+}
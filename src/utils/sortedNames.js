@@ -0,0 +1,72 @@
+// Names kept in case-insensitive order for prefix lookups by binary search.
+// Lowercased keys and the names themselves are held in parallel arrays.
+export class SortedNames {
+  constructor(names = []) {
+    this.fill(names);
+  }
+
+  fill(names) {
+    const entries = names.map(name => [name.toLowerCase(), name]);
+    entries.sort((a, b) => compare(a[0], a[1], b[0], b[1]));
+    this.keys = entries.map(entry => entry[0]);
+    this.names = entries.map(entry => entry[1]);
+  }
+
+  get size() {
+    return this.names.length;
+  }
+
+  // Index of the first entry not ordered before (key, name)
+  lowerBound(key, name) {
+    let low = 0;
+    let high = this.keys.length;
+    while (low < high) {
+      const middle = (low + high) >>> 1;
+      if (compare(this.keys[middle], this.names[middle], key, name) < 0) low = middle + 1;
+      else high = middle;
+    }
+    return low;
+  }
+
+  // Up to `limit` names starting with prefix (ignoring case), in order
+  withPrefix(prefix, limit) {
+    const key = prefix.toLowerCase();
+    const found = [];
+    for (let i = this.lowerBound(key, ''); i < this.keys.length && found.length < limit; i++) {
+      if (!this.keys[i].startsWith(key)) break;
+      found.push(this.names[i]);
+    }
+    return found;
+  }
+
+  add(names) {
+    // Re-sorting once is cheaper than many single insertions
+    if (names.length > 16) {
+      const present = new Set(this.names);
+      this.fill(this.names.concat(names.filter(name => !present.has(name))));
+      return;
+    }
+    for (const name of names) {
+      const key = name.toLowerCase();
+      const index = this.lowerBound(key, name);
+      if (this.names[index] === name) continue;
+      this.keys.splice(index, 0, key);
+      this.names.splice(index, 0, name);
+    }
+  }
+
+  delete(names) {
+    for (const name of names) {
+      const index = this.lowerBound(name.toLowerCase(), name);
+      if (this.names[index] !== name) continue;
+      this.keys.splice(index, 1);
+      this.names.splice(index, 1);
+    }
+  }
+}
+
+function compare(keyA, nameA, keyB, nameB) {
+  if (keyA !== keyB) return keyA < keyB ? -1 : 1;
+  if (nameA !== nameB) return nameA < nameB ? -1 : 1;
+  return 0;
+}
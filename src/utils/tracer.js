@@ -0,0 +1,150 @@
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { randomBytes } from 'node:crypto';
+import { performance } from 'node:perf_hooks';
+
+// Minimal tracer producing OpenTelemetry (OTLP/JSON) spans. The span a piece
+// of code runs under is tracked with AsyncLocalStorage, so code deep in a
+// request (JWT verification, ArangoDB calls) can add child spans without
+// being handed the request. Outside a sampled request withSpan() costs one
+// store lookup and creates nothing.
+
+export const SPAN_KIND = { INTERNAL: 1, SERVER: 2, CLIENT: 3 };
+const STATUS_CODE = { UNSET: 0, OK: 1, ERROR: 2 };
+
+const storage = new AsyncLocalStorage();
+
+export function nowNanos() {
+  return BigInt(Math.round((performance.timeOrigin + performance.now()) * 1e6));
+}
+
+function toAttributeValue(value) {
+  if (typeof value === 'boolean') return { boolValue: value };
+  if (Number.isInteger(value)) return { intValue: String(value) };
+  if (typeof value === 'number') return { doubleValue: value };
+  return { stringValue: String(value) };
+}
+
+export class Span {
+  constructor({ name, kind = SPAN_KIND.INTERNAL, traceId, parentSpanId, attributes, startTime, onEnd }) {
+    this.name = name;
+    this.kind = kind;
+    this.traceId = traceId;
+    this.spanId = randomBytes(8).toString('hex');
+    this.parentSpanId = parentSpanId;
+    this.attributes = {};
+    if (attributes) this.setAttributes(attributes);
+    this.startTime = startTime ?? nowNanos();
+    this.endTime = null;
+    this.status = { code: STATUS_CODE.UNSET };
+    this.onEnd = onEnd;
+  }
+
+  setAttribute(key, value) {
+    if (value !== undefined && value !== null) this.attributes[key] = value;
+    return this;
+  }
+
+  setAttributes(attributes) {
+    for (const [key, value] of Object.entries(attributes)) this.setAttribute(key, value);
+    return this;
+  }
+
+  recordError(error) {
+    this.status = { code: STATUS_CODE.ERROR, message: error?.message ?? String(error) };
+    return this;
+  }
+
+  // A child span of this one, not made current
+  startChild(name, attributes, { kind, startTime } = {}) {
+    return new Span({ name, kind, traceId: this.traceId, parentSpanId: this.spanId, attributes, startTime, onEnd: this.onEnd });
+  }
+
+  end(endTime) {
+    if (this.endTime !== null) return;
+    this.endTime = endTime ?? nowNanos();
+    this.onEnd?.(this);
+  }
+
+  toOtlp() {
+    return {
+      traceId: this.traceId,
+      spanId: this.spanId,
+      ...(this.parentSpanId && { parentSpanId: this.parentSpanId }),
+      name: this.name,
+      kind: this.kind,
+      startTimeUnixNano: String(this.startTime),
+      endTimeUnixNano: String(this.endTime),
+      attributes: Object.entries(this.attributes).map(([key, value]) => ({ key, value: toAttributeValue(value) })),
+      status: this.status,
+    };
+  }
+}
+
+// Stands in for a span when the current request is not sampled
+export const NOOP_SPAN = {
+  setAttribute() { return this; },
+  setAttributes() { return this; },
+  recordError() { return this; },
+  end() {},
+};
+
+// Starts the root span of a trace, continuing a W3C `traceparent` if given.
+// Returns null when the trace is not sampled.
+export function startRootSpan(name, { traceparent, sampleRatio, attributes, onEnd }) {
+  const parent = /^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$/.exec(traceparent ?? '');
+  const sampled = parent
+    ? (parseInt(parent[3], 16) & 1) === 1
+    : Math.random() < sampleRatio;
+  if (!sampled) return null;
+
+  return new Span({
+    name,
+    kind: SPAN_KIND.SERVER,
+    traceId: parent ? parent[1] : randomBytes(16).toString('hex'),
+    parentSpanId: parent?.[2],
+    attributes,
+    onEnd,
+  });
+}
+
+export function traceparentOf(span) {
+  return `00-${span.traceId}-${span.spanId}-01`;
+}
+
+export function currentSpan() {
+  return storage.getStore() ?? null;
+}
+
+// Runs fn with span as the current span
+export function runWithSpan(span, fn) {
+  return storage.run(span, fn);
+}
+
+// Runs fn(span) with span as the current span and ends it when fn settles
+export function runInSpan(span, fn) {
+  return storage.run(span, () => {
+    let result;
+    try {
+      result = fn(span);
+    } catch (error) {
+      span.recordError(error).end();
+      throw error;
+    }
+    if (typeof result?.then !== 'function') {
+      span.end();
+      return result;
+    }
+    return result.then(
+      value => { span.end(); return value; },
+      error => { span.recordError(error).end(); throw error; }
+    );
+  });
+}
+
+// Runs fn(span) in a child span of the current span. Without a current span
+// fn runs untraced with NOOP_SPAN.
+export function withSpan(name, attributes, fn, kind = SPAN_KIND.INTERNAL) {
+  const parent = storage.getStore();
+  if (!parent) return fn(NOOP_SPAN);
+  return runInSpan(parent.startChild(name, attributes, { kind }), fn);
+}
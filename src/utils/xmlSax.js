@@ -0,0 +1,165 @@
+// Minimal streaming (SAX-style) XML tokenizer. Text is fed in arbitrary
+// chunks with write(); complete markup is reported through the handlers as
+// soon as it is available and only the unfinished tail is buffered, so
+// memory use does not grow with the document.
+//
+//   onOpen(name, attributes, selfClosing)
+//   onClose(name)
+//   onText(text)        character data and CDATA sections, entities decoded
+//
+// Comments, processing instructions and DOCTYPE declarations are skipped.
+// Element and attribute names are reported without namespace prefixes.
+
+const ENTITIES = { lt: '<', gt: '>', amp: '&', quot: '"', apos: "'" };
+const ENTITY_PATTERN = /&(#x[0-9a-fA-F]+|#[0-9]+|[a-zA-Z]+);/g;
+const ATTRIBUTE_PATTERN = /([^\s=/>]+)\s*=\s*("([^"]*)"|'([^']*)')/g;
+
+export class XmlSyntaxError extends Error {}
+
+export function decodeEntities(text) {
+  if (!text.includes('&')) return text;
+  return text.replace(ENTITY_PATTERN, (match, entity) => {
+    if (entity[0] === '#') {
+      const code = entity[1] === 'x' ? parseInt(entity.slice(2), 16) : parseInt(entity.slice(1), 10);
+      return String.fromCodePoint(code);
+    }
+    return ENTITIES[entity] ?? match;
+  });
+}
+
+function localName(name) {
+  const colon = name.indexOf(':');
+  return colon === -1 ? name : name.slice(colon + 1);
+}
+
+export class XmlSaxParser {
+  constructor({ onOpen = () => {}, onClose = () => {}, onText = () => {} }) {
+    this.onOpen = onOpen;
+    this.onClose = onClose;
+    this.onText = onText;
+    this.buffer = '';
+    this.depth = 0;
+  }
+
+  write(chunk) {
+    const buffer = this.buffer + chunk;
+    let position = 0;
+
+    while (position < buffer.length) {
+      const lt = buffer.indexOf('<', position);
+      if (lt === -1) {
+        // Text without a following tag yet: keep it until the tag arrives
+        break;
+      }
+      if (lt > position) {
+        this.text(buffer.slice(position, lt));
+        position = lt;
+      }
+
+      const end = this.markupEnd(buffer, lt);
+      if (end === -1) break;
+      this.markup(buffer, lt, end);
+      position = end;
+    }
+
+    this.buffer = buffer.slice(position);
+  }
+
+  end() {
+    if (this.buffer.trim().length > 0 && this.buffer.includes('<')) {
+      throw new XmlSyntaxError('Unexpected end of document inside markup');
+    }
+    if (this.depth !== 0) {
+      throw new XmlSyntaxError('Unexpected end of document: unclosed elements');
+    }
+    this.buffer = '';
+  }
+
+  text(raw) {
+    if (this.depth > 0) this.onText(decodeEntities(raw));
+  }
+
+  // Index just past the markup starting at `start`, or -1 if it is incomplete
+  markupEnd(buffer, start) {
+    if (buffer.startsWith('<!--', start)) {
+      const close = buffer.indexOf('-->', start + 4);
+      return close === -1 ? -1 : close + 3;
+    }
+    if (buffer.startsWith('<![CDATA[', start)) {
+      const close = buffer.indexOf(']]>', start + 9);
+      return close === -1 ? -1 : close + 3;
+    }
+    if (buffer.startsWith('<?', start)) {
+      const close = buffer.indexOf('?>', start + 2);
+      return close === -1 ? -1 : close + 2;
+    }
+    if (buffer.startsWith('<!', start)) {
+      // DOCTYPE, possibly with an internal subset in brackets
+      let bracketDepth = 0;
+      for (let i = start + 2; i < buffer.length; i++) {
+        const ch = buffer[i];
+        if (ch === '[') bracketDepth++;
+        else if (ch === ']') bracketDepth--;
+        else if (ch === '>' && bracketDepth <= 0) return i + 1;
+      }
+      return -1;
+    }
+
+    // Element tag: '>' inside quoted attribute values does not end it
+    let quote = null;
+    for (let i = start + 1; i < buffer.length; i++) {
+      const ch = buffer[i];
+      if (quote) {
+        if (ch === quote) quote = null;
+      } else if (ch === '"' || ch === "'") {
+        quote = ch;
+      } else if (ch === '>') {
+        return i + 1;
+      }
+    }
+    return -1;
+  }
+
+  markup(buffer, start, end) {
+    if (buffer.startsWith('<![CDATA[', start)) {
+      if (this.depth > 0) this.onText(buffer.slice(start + 9, end - 3));
+      return;
+    }
+    if (buffer[start + 1] === '!' || buffer[start + 1] === '?') {
+      return;
+    }
+
+    if (buffer[start + 1] === '/') {
+      const name = buffer.slice(start + 2, end - 1).trim();
+      if (this.depth === 0) {
+        throw new XmlSyntaxError(`Unexpected closing tag </${name}>`);
+      }
+      this.depth--;
+      this.onClose(localName(name));
+      return;
+    }
+
+    const selfClosing = buffer[end - 2] === '/';
+    const body = buffer.slice(start + 1, selfClosing ? end - 2 : end - 1);
+    const nameEnd = body.search(/[\s]/);
+    const name = nameEnd === -1 ? body : body.slice(0, nameEnd);
+    if (!name) {
+      throw new XmlSyntaxError('Element without a name');
+    }
+
+    const attributes = {};
+    if (nameEnd !== -1) {
+      for (const match of body.slice(nameEnd).matchAll(ATTRIBUTE_PATTERN)) {
+        attributes[localName(match[1])] = decodeEntities(match[3] ?? match[4]);
+      }
+    }
+
+    const element = localName(name);
+    this.onOpen(element, attributes, selfClosing);
+    if (selfClosing) {
+      this.onClose(element);
+    } else {
+      this.depth++;
+    }
+  }
+}
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+import xmlrunner
+import unittest
+import requests
+import json
+import time
+import utils
+import config
+
+class BatchApiTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        print("\n" + "█"*80)
+        print("📦 BATCH API TEST SUITE")
+        print("█"*80)
+        print("This test suite verifies the Batch API functionality")
+        print("Authentication: ENABLED (requires valid authentication token)")
+        print("Test Coverage:")
+        print("  1. Concurrent sub-requests return responses in request order")
+        print("  2. Sequential sub-requests see earlier writes")
+        print("  3. Nested batches and oversized batches are rejected")
+        print("  4. Batch requires authentication")
+        print("█"*80)
+
+        # Gets the token and sets the config header
+        try:
+            utils.set_header()
+        except:
+            print('Cannot login at the moment.')
+            exit(1)
+        cls.header = config.HEADER
+        cls.url = config.API_PATH
+        cls.test_id = str(int(time.time()))  # Unique ID for this test run
+
+        cls.test_script_id = f"batch_script_{cls.test_id}"
+
+        print(f"API Base URL: {cls.url}")
+        print(f"Test Session ID: {cls.test_id}")
+        print("="*80)
+
+    def test_batch_concurrent_requests(self):
+        """Test that independent sub-requests are answered in request order"""
+        print("\n" + "="*60)
+        print("TEST 1: Concurrent Batch Requests")
+        print("="*60)
+        print("Purpose: Run several read requests in one batch")
+        print("Expected: HTTP 200 with one response per sub-request, in order")
+
+        path = f"{self.url}/batch"
+        payload = {
+            "requests": [
+                {"id": "health", "method": "GET", "url": "/health"},
+                {"id": "scripts", "method": "GET", "url": "/custom_scripts?limit=5"},
+                {"id": "missing", "method": "GET", "url": f"/custom_scripts/missing_{self.test_id}"}
+            ]
+        }
+
+        response = requests.post(path, json=payload, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200, f"Batch failed: {response.text}")
+
+        results = response.json()
+        self.assertEqual(len(results), 3)
+        self.assertEqual([r['id'] for r in results], ["health", "scripts", "missing"])
+
+        self.assertEqual(results[0]['status'], 200)
+        self.assertEqual(results[0]['body'], {"status": "OK"})
+
+        self.assertEqual(results[1]['status'], 200)
+        self.assertIsInstance(results[1]['body'], list)
+        self.assertIn('x-total-count', results[1]['headers'])
+
+        self.assertEqual(results[2]['status'], 404)
+        print("✓ RESULT: Batch returned all sub-responses in order")
+
+    def test_batch_sequential_requests(self):
+        """Test that sequential sub-requests observe earlier writes"""
+        print("\n" + "="*60)
+        print("TEST 2: Sequential Batch Requests")
+        print("="*60)
+        print("Purpose: Create, read and delete a custom script in one batch")
+        print("Expected: HTTP 200 with 201, 200 and 204 sub-responses")
+
+        path = f"{self.url}/batch"
+        script = {
+            "script_id": self.test_script_id,
+            "script_path": f"/test/path/{self.test_script_id}.py",
+            "script_name": f"Batch Script {self.test_id}",
+            "description": "Custom script created by the batch test",
+            "hash": f"batchhash{self.test_id}",
+            "status": "ACTIVE",
+            "inputs": [],
+            "outputs": [],
+            "entries": [],
+            "layout": []
+        }
+        payload = {
+            "sequential": True,
+            "requests": [
+                {"method": "POST", "url": "/custom_scripts", "body": [script]},
+                {"method": "GET", "url": f"/custom_scripts/{self.test_script_id}"},
+                {"method": "DELETE", "url": f"/custom_scripts/{self.test_script_id}"}
+            ]
+        }
+
+        response = requests.post(path, json=payload, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200, f"Batch failed: {response.text}")
+
+        results = response.json()
+        print(f"✓ Sub-response statuses: {[r['status'] for r in results]}")
+        self.assertEqual([r['status'] for r in results], [201, 200, 204])
+        self.assertEqual(results[1]['body']['script_id'], self.test_script_id)
+        print("✓ RESULT: Sequential batch executed in order")
+
+    def test_batch_rejects_invalid_batches(self):
+        """Test that nested and oversized batches are rejected"""
+        print("\n" + "="*60)
+        print("TEST 3: Invalid Batches")
+        print("="*60)
+        print("Purpose: Verify nesting and size limits")
+        print("Expected: 400 sub-response for a nested batch, HTTP 400 for an oversized batch")
+
+        path = f"{self.url}/batch"
+
+        inner = {"requests": [{"method": "GET", "url": "/health"}]}
+        nested = {"requests": [{"method": "POST", "url": url, "body": inner} for url in ["/batch", "/%62atch", "/api/v4/batch/"]]}
+        response = requests.post(path, json=nested, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200, f"Batch failed: {response.text}")
+        for sub_response in response.json():
+            self.assertNotEqual(sub_response['status'], 200, f"Nested batch ran: {sub_response}")
+        print("✓ Nested batches rejected however their url is spelled")
+
+        oversized = {"requests": [{"method": "GET", "url": "/health"}] * 51}
+        response = requests.post(path, json=oversized, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 400)
+        print("✓ RESULT: Oversized batch rejected")
+
+    def test_batch_requires_authentication(self):
+        """Test that the batch endpoint requires authentication"""
+        print("\n" + "="*60)
+        print("TEST 4: Batch Authentication")
+        print("="*60)
+        print("Purpose: Verify the batch endpoint rejects requests without a token")
+        print("Expected: HTTP 401")
+
+        path = f"{self.url}/batch"
+        payload = {"requests": [{"method": "GET", "url": "/custom_scripts"}]}
+
+        response = requests.post(path, json=payload, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 401)
+        print("✓ RESULT: Unauthenticated batch rejected")
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\n" + "█"*80)
+        print("🏁 BATCH API TEST SUITE COMPLETED")
+        print("█"*80)
+        print("All Batch API tests have been executed.")
+        print("XML reports generated in: ./test-reports/")
+        print("█"*80)
+
+        # Make sure the script created by the sequential batch is gone
+        try:
+            requests.delete(f"{cls.url}/custom_scripts/{cls.test_script_id}", headers=cls.header, verify=False)
+        except Exception as e:
+            print(f"⚠️ Could not clean up test script: {e}")
+
+if __name__ == '__main__':
+    unittest.main(testRunner=xmlrunner.XMLTestRunner(output='test-reports'))
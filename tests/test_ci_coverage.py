@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+import xmlrunner
+import unittest
+import requests
+import json
+import time
+import utils
+import config
+
+class CoverageApiTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        print("\n" + "█"*80)
+        print("🔗 VERIFICATION COVERAGE API TEST SUITE")
+        print("█"*80)
+        print("This test suite verifies the links between verification items and dictionary content")
+        print("Authentication: ENABLED (requires valid authentication token)")
+        print("Test Coverage:")
+        print("  1. Coverage of a dictionary version (GET /dictionaries/{type}/versions/{version}/coverage)")
+        print("  2. Impact of changes between versions (GET /dictionaries/{type}/impact)")
+        print("  3. Impact rejects comparing a version with itself")
+        print("█"*80)
+
+        # Gets the token and sets the config header
+        try:
+            utils.set_header()
+        except:
+            print('Cannot login at the moment.')
+            exit(1)
+        cls.header = config.HEADER
+        cls.url = config.API_PATH
+        cls.test_id = str(int(time.time()))  # Unique ID for this test run
+
+        cls.test_dictionary_type = "sse"
+        cls.from_version = f"3.0.{cls.test_id}"
+        cls.to_version = f"3.1.{cls.test_id}"
+        cls.covered_stem = f"COV_CMD_{cls.test_id}"
+        cls.uncovered_stem = f"UNCOV_CMD_{cls.test_id}"
+        cls.test_vi_id = f"COV_VI_{cls.test_id}"
+
+        print(f"API Base URL: {cls.url}")
+        print(f"Test Session ID: {cls.test_id}")
+        print("="*80)
+
+        cls._create_test_data()
+
+    @classmethod
+    def _create_test_data(cls):
+        """Create two dictionary versions whose shared command differs, and a VI naming it"""
+        print(f"\n📋 Creating test dictionaries and verification item...")
+
+        for version, description in [(cls.from_version, "Original"), (cls.to_version, "Changed")]:
+            response = requests.post(
+                f"{cls.url}/dictionaries/{cls.test_dictionary_type}/versions",
+                json={
+                    "dictionary_description": f"Coverage test dictionary - {cls.test_id}",
+                    "dictionary_version": version,
+                    "state": "NOT_PUBLISHED"
+                },
+                headers=cls.header, verify=False)
+            print(f"  Dictionary {version}: {response.status_code}")
+
+            commands = [
+                {"command_stem": cls.covered_stem, "cmd_description": f"{description} command"},
+                {"command_stem": cls.uncovered_stem, "cmd_description": "Command without verification items"}
+            ]
+            response = requests.post(
+                f"{cls.url}/dictionaries/{cls.test_dictionary_type}/versions/{version}/cmds",
+                json=commands, headers=cls.header, verify=False)
+            print(f"  Commands in {version}: {response.status_code}")
+
+        response = requests.post(f"{cls.url}/vnv/vis", json=[{
+            "vi_id": cls.test_vi_id,
+            "vi_name": cls.covered_stem,
+            "vi_owner": "Test Owner",
+            "vi_type": "COMMAND",
+            "vi_text": f"Verify that {cls.covered_stem} is accepted",
+            "vas": [],
+            "vacs": []
+        }], headers=cls.header, verify=False)
+        print(f"  Verification item: {response.status_code}")
+
+    def test_coverage(self):
+        """Test that covered and uncovered commands are reported"""
+        print("\n" + "="*60)
+        print("TEST 1: Coverage of a Dictionary Version")
+        print("="*60)
+        print("Purpose: List commands with and without linked verification items")
+        print("Expected: The named command is covered by the VI, the other is not")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.from_version}/coverage"
+
+        response = requests.get(path, params={"kind": "command", "covered": "true"}, headers=self.header, verify=False)
+        print(f"✓ Covered Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200, f"Coverage failed: {response.text}")
+        self.assertIn('x-total-count', response.headers)
+        covered = {item['name']: item['vi_ids'] for item in response.json()}
+        self.assertEqual(covered.get(self.covered_stem), [self.test_vi_id])
+        self.assertNotIn(self.uncovered_stem, covered)
+
+        response = requests.get(path, params={"kind": "command", "covered": "false"}, headers=self.header, verify=False)
+        print(f"✓ Uncovered Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+        uncovered = [item['name'] for item in response.json()]
+        self.assertIn(self.uncovered_stem, uncovered)
+        self.assertNotIn(self.covered_stem, uncovered)
+        print("✓ RESULT: Coverage reports linked and unlinked commands")
+
+    def test_impact(self):
+        """Test that a changed command reports the VI linked to it"""
+        print("\n" + "="*60)
+        print("TEST 2: Impact Between Dictionary Versions")
+        print("="*60)
+        print("Purpose: Find verification items affected by changed commands")
+        print("Expected: The VI is listed with a 'changed' command")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/impact"
+        params = {"from_version": self.from_version, "to_version": self.to_version, "kinds": "command"}
+
+        response = requests.get(path, params=params, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200, f"Impact failed: {response.text}")
+
+        affected = {vi['vi_id']: vi for vi in response.json()}
+        self.assertIn(self.test_vi_id, affected)
+        self.assertIn(
+            {"kind": "command", "name": self.covered_stem, "change": "changed"},
+            affected[self.test_vi_id]['changes'])
+        print("✓ RESULT: Impact lists the verification item of the changed command")
+
+    def test_impact_same_version(self):
+        """Test that comparing a version with itself is rejected"""
+        print("\n" + "="*60)
+        print("TEST 3: Impact of a Version on Itself")
+        print("="*60)
+        print("Expected: HTTP 400")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/impact"
+        params = {"from_version": self.from_version, "to_version": self.from_version}
+
+        response = requests.get(path, params=params, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 400)
+        print("✓ RESULT: Comparing a version with itself was rejected")
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\n" + "█"*80)
+        print("🏁 VERIFICATION COVERAGE API TEST SUITE COMPLETED")
+        print("█"*80)
+        print("XML reports generated in: ./test-reports/")
+        print("█"*80)
+
+        # Clean up the verification item and both dictionary versions
+        try:
+            requests.delete(f"{cls.url}/vnv/vis/{cls.test_vi_id}", headers=cls.header, verify=False)
+            for version in [cls.from_version, cls.to_version]:
+                requests.delete(
+                    f"{cls.url}/dictionaries/{cls.test_dictionary_type}/versions/{version}",
+                    headers=cls.header, verify=False)
+            print("✓ Test data cleaned up")
+        except Exception as e:
+            print(f"⚠️ Could not clean up test data: {e}")
+
+if __name__ == '__main__':
+    unittest.main(testRunner=xmlrunner.XMLTestRunner(output='test-reports'))
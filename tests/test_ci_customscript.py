@@ -4,6 +4,7 @@ import unittest
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 import utils
 import config
 
@@ -24,6 +25,10 @@ class CustomScriptApiTest(unittest.TestCase):
         print("  6. Bulk query custom scripts (POST /custom_scripts/bulk_query)")
         print("  7. Test 404 handling for non-existent scripts")
         print("  8. Delete custom script (DELETE /custom_scripts/{id}) - Final test")
+        print("  9. Compressed custom script list (Accept-Encoding: gzip)")
+        print("  10. Sync custom scripts (POST /custom_scripts/sync)")
+        print("  11. Identical concurrent reads (GET /custom_scripts)")
+        print("  12. Cached custom script list reflects writes (GET /custom_scripts)")
         print("█"*80)
         
         # Gets the token and sets the config header
@@ -195,6 +200,145 @@ class CustomScriptApiTest(unittest.TestCase):
             print(f"✗ RESULT: GET request failed with error: {e}")
             self.fail(f"GET request failed: {e}")
 
+    def test_get_custom_scripts_compressed(self):
+        """Test that large custom script lists are compressed when the client accepts it"""
+        print("\n" + "="*60)
+        print("TEST 9: Compressed Custom Script List")
+        print("="*60)
+        print("Purpose: Verify gzip compression of responses above the size threshold")
+        print("Expected: HTTP 200, gzip Content-Encoding when the body is large, identical JSON")
+
+        path = f"{self.url}/custom_scripts"
+
+        plain = requests.get(path, headers={**self.header, 'Accept-Encoding': 'identity'}, verify=False)
+        self.assertEqual(plain.status_code, 200)
+        self.assertIsNone(plain.headers.get('content-encoding'))
+
+        compressed = requests.get(path, headers={**self.header, 'Accept-Encoding': 'gzip'}, verify=False)
+        self.assertEqual(compressed.status_code, 200)
+        print(f"✓ Uncompressed size: {len(plain.content)} bytes")
+        print(f"✓ Content-Encoding: {compressed.headers.get('content-encoding')}")
+        if len(plain.content) >= 1024:
+            self.assertEqual(compressed.headers.get('content-encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', compressed.headers.get('vary', ''))
+        self.assertEqual(compressed.json(), plain.json())
+        print("✓ RESULT: Compressed response decodes to the same scripts")
+
+    def test_concurrent_identical_reads(self):
+        """Test that identical concurrent reads all get the same complete response"""
+        print("\n" + "="*60)
+        print("TEST 11: Identical Concurrent Reads")
+        print("="*60)
+        print("Purpose: Issue the same list request many times at once")
+        print("Expected: Every request gets HTTP 200 with the same body and total count")
+
+        path = f"{self.url}/custom_scripts?limit=50"
+
+        def fetch(_):
+            return requests.get(path, headers=self.header, verify=False)
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            responses = list(pool.map(fetch, range(20)))
+
+        statuses = {response.status_code for response in responses}
+        print(f"✓ Response Statuses: {statuses}")
+        self.assertEqual(statuses, {200})
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(len({response.headers.get('x-total-count') for response in responses}), 1)
+        print("✓ RESULT: All concurrent requests received identical responses")
+
+    def test_cached_list_reflects_writes(self):
+        """Test that a repeated list query is not served stale after a write"""
+        print("\n" + "="*60)
+        print("TEST 12: Cached Custom Script List Reflects Writes")
+        print("="*60)
+        print("Purpose: Repeat a list query, write a script, then repeat it again")
+        print("Expected: Identical repeats; the total count grows by one after the write")
+
+        path = f"{self.url}/custom_scripts?limit=1"
+        script_id = f"cache_script_{self.test_id}"
+
+        first = requests.get(path, headers=self.header, verify=False)
+        repeat = requests.get(path, headers=self.header, verify=False)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(repeat.content, first.content)
+        self.assertEqual(repeat.headers.get('x-total-count'), first.headers.get('x-total-count'))
+        total = int(first.headers['x-total-count'])
+        print(f"✓ Total count before write: {total}")
+
+        try:
+            response = requests.post(f"{self.url}/custom_scripts", json=[{
+                "script_id": script_id,
+                "script_path": f"/test/cache/{script_id}.py",
+                "script_name": f"Cache Script {self.test_id}",
+                "hash": f"cachehash{self.test_id}",
+                "inputs": [],
+                "outputs": [],
+                "entries": [],
+                "layout": []
+            }], headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 201)
+
+            after = requests.get(path, headers=self.header, verify=False)
+            print(f"✓ Total count after write: {after.headers.get('x-total-count')}")
+            self.assertEqual(int(after.headers['x-total-count']), total + 1)
+            print("✓ RESULT: The list was recomputed after the write")
+        finally:
+            requests.delete(f"{self.url}/custom_scripts/{script_id}", headers=self.header, verify=False)
+
+    def test_sync_custom_scripts(self):
+        """Test idempotent synchronization of a set of custom scripts"""
+        print("\n" + "="*60)
+        print("TEST 10: Sync Custom Scripts")
+        print("="*60)
+        print("Purpose: Verify POST /custom_scripts/sync only writes new and changed scripts")
+        print("Expected: inserted on first sync, unchanged on repeat, updated on hash change")
+
+        path = f"{self.url}/custom_scripts/sync"
+        script_ids = [f"sync_script_{self.test_id}_{i}" for i in range(3)]
+
+        def script(script_id, content_hash):
+            return {
+                "script_id": script_id,
+                "script_path": f"/test/sync/{script_id}.py",
+                "script_name": f"Sync Script {script_id}",
+                "hash": content_hash,
+                "inputs": [],
+                "outputs": [],
+                "entries": [],
+                "layout": []
+            }
+
+        try:
+            scripts = [script(script_id, f"hash_{script_id}") for script_id in script_ids]
+
+            response = requests.post(path, json={"scripts": scripts}, headers=self.header, verify=False)
+            print(f"✓ First sync: {response.status_code} {response.text[:200]}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(sorted(response.json()['inserted']), sorted(script_ids))
+
+            response = requests.post(path, json={"scripts": scripts}, headers=self.header, verify=False)
+            summary = response.json()
+            print(f"✓ Repeated sync: {summary}")
+            self.assertEqual(summary['inserted'], [])
+            self.assertEqual(summary['updated'], [])
+            self.assertEqual(summary['unchanged'], 3)
+            self.assertEqual(summary['failed'], [])
+
+            scripts[0]['hash'] = f"changed_{self.test_id}"
+            response = requests.post(path, json={"scripts": scripts[:2]}, headers=self.header, verify=False)
+            summary = response.json()
+            print(f"✓ Sync with one changed script: {summary}")
+            self.assertEqual(summary['updated'], [script_ids[0]])
+            self.assertEqual(summary['unchanged'], 1)
+
+            duplicate = requests.post(path, json={"scripts": [scripts[0], scripts[0]]}, headers=self.header, verify=False)
+            self.assertEqual(duplicate.status_code, 400)
+            print("✓ RESULT: Sync wrote only new and changed scripts")
+        finally:
+            for script_id in script_ids:
+                requests.delete(f"{self.url}/custom_scripts/{script_id}", headers=self.header, verify=False)
+
     def test_get_specific_custom_script(self):
         """Test getting a specific custom script by ID"""
         print("\n" + "="*60)
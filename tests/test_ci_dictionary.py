@@ -23,6 +23,8 @@ class DictionaryApiTest(unittest.TestCase):
         print("  5. Update dictionary (PATCH /dictionaries/{type}/versions/{version})")
         print("  6. Test 404 handling for non-existent dictionaries")
         print("  7. Delete dictionary (DELETE /dictionaries/{type}/versions/{version}) - Final test")
+        print("  8. Recreated dictionary version starts without content")
+        print("  9. Dictionary summary statistics (GET /dictionaries/{type}/versions/{version}/summary)")
         print("█"*80)
         
         # Gets the token and sets the config header
@@ -308,6 +310,118 @@ class DictionaryApiTest(unittest.TestCase):
             print(f"✗ RESULT: DELETE request failed with error: {e}")
             self.fail(f"DELETE request failed: {e}")
 
+    def test_recreated_dictionary_starts_empty(self):
+        """Test that deleting a version removes its content for good"""
+        print("\n" + "="*60)
+        print("TEST 8: Recreated Dictionary Version Starts Without Content")
+        print("="*60)
+        print("Purpose: Delete a version holding a command, create it again and list its commands")
+        print("Expected: HTTP 204 on delete, then HTTP 200 with an empty list of commands")
+
+        version = f"2.0.{self.test_id}"
+        versions_path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions"
+        version_path = f"{versions_path}/{version}"
+        dictionary = {
+            "dictionary_description": f"Recreated Dictionary - {self.test_id}",
+            "dictionary_version": version,
+            "state": "NOT_PUBLISHED"
+        }
+        command = {
+            "command_stem": f"RECREATE_CMD_{self.test_id}",
+            "operations_category": "TEST_CATEGORY",
+            "cmd_description": "Removed with its dictionary version",
+            "restricted_modes": [],
+            "cmd_type": "FSW",
+            "repeat_min": 0,
+            "repeat_max": 0,
+            "arguments": []
+        }
+
+        try:
+            response = requests.post(versions_path, json=dictionary, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            response = requests.post(f"{version_path}/cmds", json=[command], headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 201)
+            print("✓ Created version with one command")
+
+            response = requests.delete(version_path, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 204)
+            print("✓ Deleted version")
+
+            response = requests.post(versions_path, json=dictionary, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            response = requests.get(f"{version_path}/cmds", headers=self.header, verify=False)
+            print(f"✓ Response Status: {response.status_code}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), [])
+            print("✓ RESULT: Recreated version has no commands")
+        finally:
+            requests.delete(version_path, headers=self.header, verify=False)
+
+    def test_dictionary_summary(self):
+        """Test summary statistics follow writes and are stored on publish"""
+        print("\n" + "="*60)
+        print("TEST 9: Dictionary Summary Statistics")
+        print("="*60)
+        print("Purpose: Read the summary of a version before and after adding commands, then publish it")
+        print("Expected: Counts by operations_category and cmd_type match the commands written")
+
+        version = f"3.0.{self.test_id}"
+        versions_path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions"
+        version_path = f"{versions_path}/{version}"
+        dictionary = {
+            "dictionary_description": f"Summary Dictionary - {self.test_id}",
+            "dictionary_version": version,
+            "state": "NOT_PUBLISHED"
+        }
+
+        def command(index, category, cmd_type):
+            return {
+                "command_stem": f"SUMMARY_CMD_{self.test_id}_{index}",
+                "operations_category": category,
+                "cmd_description": "Counted by the dictionary summary",
+                "restricted_modes": [],
+                "cmd_type": cmd_type,
+                "repeat_min": 0,
+                "repeat_max": 0,
+                "arguments": []
+            }
+
+        try:
+            response = requests.post(versions_path, json=dictionary, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+
+            response = requests.get(f"{version_path}/summary", headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['content']['command'], {'total': 0, 'by': {'operations_category': {}, 'cmd_type': {}}})
+            print("✓ Empty version has an empty summary")
+
+            commands = [command(0, "POWER", "FSW"), command(1, "POWER", "FSW"), command(2, "THERMAL", "SSE")]
+            response = requests.post(f"{version_path}/cmds", json=commands, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 201)
+
+            response = requests.get(f"{version_path}/summary", headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            summary = response.json()
+            print(f"✓ Summary after write: {summary['content']['command']}")
+            self.assertEqual(summary['content']['command'], {
+                'total': 3,
+                'by': {'operations_category': {'POWER': 2, 'THERMAL': 1}, 'cmd_type': {'FSW': 2, 'SSE': 1}}
+            })
+            self.assertEqual(summary['content']['channel']['total'], 0)
+
+            response = requests.patch(version_path, json={"state": "PUBLISHED"}, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            response = requests.get(f"{version_path}/summary", headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), summary)
+            print("✓ RESULT: Published version serves the stored summary")
+
+            response = requests.get(f"{versions_path}/missing-{self.test_id}/summary", headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 404)
+        finally:
+            requests.delete(version_path, headers=self.header, verify=False)
+
     @classmethod
     def tearDownClass(cls):
         print("\n" + "█"*80)
@@ -4,6 +4,7 @@ import unittest
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 import utils
 import config
 
@@ -407,6 +408,397 @@ class DictionaryContentApiTest(unittest.TestCase):
             print(f"✗ RESULT: DELETE request failed with error: {e}")
             self.fail(f"DELETE request failed: {e}")
 
+    def test_get_commands_count_modes(self):
+        """Test the count query parameter on the command list"""
+        print("\n" + "="*60)
+        print("TEST 9: Command List Count Modes")
+        print("="*60)
+        print("Purpose: Test x-total-count handling for count=exact|estimate|none")
+        print("Expected: Header present for exact/estimate, absent for none")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/cmds"
+
+        try:
+            exact = requests.get(f"{path}?limit=1000&count=exact", headers=self.header, verify=False)
+            print(f"✓ count=exact status: {exact.status_code}, header: {exact.headers.get('x-total-count')}")
+            self.assertEqual(exact.status_code, 200)
+            self.assertIn('x-total-count', exact.headers)
+            self.assertEqual(int(exact.headers['x-total-count']), len(exact.json()))
+
+            estimate = requests.get(f"{path}?command_stem={self.test_command_stem}&count=estimate", headers=self.header, verify=False)
+            print(f"✓ count=estimate status: {estimate.status_code}, header: {estimate.headers.get('x-total-count')}")
+            self.assertEqual(estimate.status_code, 200)
+            self.assertIn('x-total-count', estimate.headers)
+            self.assertGreaterEqual(int(estimate.headers['x-total-count']), len(estimate.json()))
+
+            none = requests.get(f"{path}?count=none", headers=self.header, verify=False)
+            print(f"✓ count=none status: {none.status_code}, header: {none.headers.get('x-total-count')}")
+            self.assertEqual(none.status_code, 200)
+            self.assertNotIn('x-total-count', none.headers)
+
+            print("✓ RESULT: Count modes behave as expected")
+
+        except Exception as e:
+            print(f"✗ RESULT: Count mode request failed with error: {e}")
+            self.fail(f"Count mode request failed: {e}")
+
+    def test_search_dictionary_content(self):
+        """Test the unified search across dictionary content"""
+        print("\n" + "="*60)
+        print("TEST 10: Unified Dictionary Content Search")
+        print("="*60)
+        print("Purpose: Test searching all content kinds of a version in one request")
+        print("Expected: HTTP 200 with typed, scored hits ordered by relevance")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/search"
+        params = {'q': 'TEST_CMD', 'limit': 5}
+        print(f"Sending GET request to: {path} with {params}")
+
+        try:
+            response = requests.get(path, params=params, headers=self.header, verify=False)
+            print(f"✓ Response Status: {response.status_code}")
+            print(f"✓ Response Content (first 200 chars): {response.text[:200]}...")
+
+            self.assertEqual(response.status_code, 200)
+            res_data = response.json()
+            self.assertIsInstance(res_data, list)
+
+            scores = [hit['score'] for hit in res_data]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            for hit in res_data:
+                self.assertIn(hit['type'], ['command', 'evr', 'channel', 'mil1553', 'vi'])
+                self.assertIn('name', hit)
+
+            print(f"✓ RESULT: Search returned {len(res_data)} hits")
+
+            # Queries shorter than 3 characters are rejected
+            short_response = requests.get(path, params={'q': 'TE'}, headers=self.header, verify=False)
+            print(f"  Short query status: {short_response.status_code}")
+            self.assertEqual(short_response.status_code, 400)
+
+        except Exception as e:
+            print(f"✗ RESULT: Search request failed with error: {e}")
+            self.fail(f"Search request failed: {e}")
+
+    def test_export_dictionary_content(self):
+        """Test exporting the full content of a dictionary version"""
+        print("\n" + "="*60)
+        print("TEST 11: Export Dictionary Content")
+        print("="*60)
+        print("Purpose: Test reading a whole dictionary version in one request")
+        print("Expected: HTTP 200 with the dictionary and all content kinds")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/export"
+        print(f"Sending GET request to: {path}")
+
+        try:
+            response = requests.get(path, headers=self.header, verify=False)
+            print(f"✓ Response Status: {response.status_code}")
+            print(f"✓ Response Content (first 200 chars): {response.text[:200]}...")
+
+            self.assertEqual(response.status_code, 200)
+            res_data = response.json()
+            self.assertEqual(res_data['dictionary']['dictionary_version'], self.test_dictionary_version)
+            for kind in ['command', 'evr', 'channel', 'mil1553']:
+                self.assertIsInstance(res_data['content'][kind], list)
+
+            print(f"✓ RESULT: Exported {len(res_data['content']['command'])} commands")
+
+            # Unknown versions are reported as not found
+            missing_path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/NONEXISTENT_{self.test_id}/export"
+            missing_response = requests.get(missing_path, headers=self.header, verify=False)
+            print(f"  Unknown version status: {missing_response.status_code}")
+            self.assertEqual(missing_response.status_code, 404)
+
+        except Exception as e:
+            print(f"✗ RESULT: Export request failed with error: {e}")
+            self.fail(f"Export request failed: {e}")
+
+    def test_admission_control_under_load(self):
+        """Test that a burst of wild list queries is either served or rejected with Retry-After"""
+        print("\n" + "="*60)
+        print("TEST 12: Admission Control Under Load")
+        print("="*60)
+        print("Purpose: Fire many concurrent wild searches at once")
+        print("Expected: Each request gets HTTP 200, or HTTP 503 with a Retry-After header")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/cmds"
+
+        def fetch(i):
+            params = {'wild': 'true', 'command_stem': f"CMD_{i}"}
+            return requests.get(path, params=params, headers=self.header, verify=False)
+
+        with ThreadPoolExecutor(max_workers=30) as pool:
+            responses = list(pool.map(fetch, range(60)))
+
+        statuses = [response.status_code for response in responses]
+        print(f"✓ Served: {statuses.count(200)}, rejected: {statuses.count(503)}")
+        for response in responses:
+            self.assertIn(response.status_code, [200, 503])
+            if response.status_code == 503:
+                self.assertGreater(int(response.headers['retry-after']), 0)
+                self.assertIn('message', response.json())
+
+        # Point reads keep their own slots
+        response = requests.get(f"{path}/{self.test_command_stem}", headers=self.header, verify=False)
+        self.assertIn(response.status_code, [200, 404])
+        print("✓ RESULT: Overload was answered with fast rejections, not failures")
+
+    def test_create_commands_invalid_item(self):
+        """Test that an invalid item in a command array is reported with its index"""
+        print("\n" + "="*60)
+        print("TEST 13: Create Commands With an Invalid Item")
+        print("="*60)
+        print("Purpose: Post a command array whose second item fails validation")
+        print("Expected: HTTP 400 pointing at the failing item; nothing is saved")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/cmds"
+        valid_stem = f"VALID_CMD_{self.test_id}"
+        payload = [
+            {"command_stem": valid_stem, "repeat_min": 0},
+            {"command_stem": f"INVALID_CMD_{self.test_id}", "repeat_min": "not a number"}
+        ]
+
+        response = requests.post(path, json=payload, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        print(f"✓ Response Body: {response.text[:300]}")
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertIn('/1/repeat_min', body['message'])
+
+        response = requests.get(f"{path}/{valid_stem}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 404)
+        print("✓ RESULT: The invalid item was reported and no command was saved")
+
+    def test_content_changes_since_revision(self):
+        """Test the incremental change feed of a dictionary version"""
+        print("\n" + "="*60)
+        print("TEST 14: Dictionary Content Changes Since a Revision")
+        print("="*60)
+        print("Purpose: Create and delete a command and follow both through the change feed")
+        print("Expected: One upsert after the create, one delete after the delete")
+
+        base = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}"
+        stem = f"SYNC_CMD_{self.test_id}"
+
+        response = requests.get(f"{base}/changes", params={'since': 0}, headers=self.header, verify=False)
+        print(f"✓ Initial Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+        start = response.json()['revision']
+
+        response = requests.post(f"{base}/cmds", json=[{"command_stem": stem}], headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 201)
+
+        response = requests.get(f"{base}/changes", params={'since': start}, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        feed = response.json()
+        print(f"✓ Changes after create: {feed['changes']}")
+        self.assertGreater(feed['revision'], start)
+        self.assertEqual([(c['kind'], c['op'], c['name']) for c in feed['changes']], [('command', 'upsert', stem)])
+        key = feed['changes'][0]['key']
+        after_create = feed['revision']
+
+        response = requests.delete(f"{base}/cmds/{stem}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 204)
+
+        response = requests.get(f"{base}/changes", params={'since': after_create}, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        feed = response.json()
+        print(f"✓ Changes after delete: {feed['changes']}")
+        self.assertEqual([(c['op'], c['key']) for c in feed['changes']], [('delete', key)])
+
+        response = requests.get(f"{base}/changes", params={'since': feed['revision']}, headers=self.header, verify=False)
+        self.assertEqual(response.json()['changes'], [])
+        print("✓ RESULT: The change feed reported exactly the edits made")
+
+    def test_import_dictionary_xml(self):
+        """Test importing commands, evrs and channels from an XML dictionary"""
+        print("\n" + "="*60)
+        print("TEST 15: Import Dictionary XML")
+        print("="*60)
+        print("Purpose: Stream an XML dictionary into the version, then import it again")
+        print("Expected: 201 with counts per kind, then 409 with nothing imported twice")
+
+        base = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}"
+        stem = f"XML_CMD_{self.test_id}"
+        xml = f"""<?xml version="1.0" encoding="UTF-8"?>
+<fsw_dictionary>
+  <commands>
+    <command command_stem="{stem}" repeat_min="0" repeat_max="2">
+      <cmd_description>Imported &amp; mapped</cmd_description>
+      <restricted_modes><mode>SAFE</mode></restricted_modes>
+      <arguments>
+        <argument argument_type="ENUM" argument_size="8" repeat_arg="No">
+          <enumerations><enum symbol="ON" numeric="1"/><enum symbol="OFF" numeric="0"/></enumerations>
+        </argument>
+      </arguments>
+    </command>
+  </commands>
+  <evrs>
+    <evr evr_name="XML_EVR_{self.test_id}" evr_id="0x10" evr_level="WARNING_HI"><evr_message>Seen %d</evr_message></evr>
+  </evrs>
+  <channels>
+    <channel channel_name="XML_CHAN_{self.test_id}" channel_id="X-{self.test_id}" type="unsigned" bit_size="16"/>
+  </channels>
+</fsw_dictionary>"""
+        header = {**self.header, 'Content-Type': 'application/xml'}
+
+        response = requests.post(f"{base}/import", data=xml.encode('utf-8'), headers=header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        print(f"✓ Response Body: {response.text}")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['imported'], {'command': 1, 'evr': 1, 'channel': 1})
+
+        response = requests.get(f"{base}/cmds/{stem}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        command = response.json()
+        self.assertEqual(command['cmd_description'], 'Imported & mapped')
+        self.assertEqual(command['repeat_max'], 2)
+        self.assertEqual(command['restricted_modes'], ['SAFE'])
+        self.assertEqual(command['arguments'][0]['enumerations'], [{'symbol': 'ON', 'numeric': 1}, {'symbol': 'OFF', 'numeric': 0}])
+
+        # The same document again conflicts on every element and leaves nothing behind
+        response = requests.post(f"{base}/import", data=xml.encode('utf-8'), headers=header, verify=False)
+        print(f"✓ Repeated Import Status: {response.status_code}")
+        self.assertEqual(response.status_code, 409)
+
+        response = requests.get(f"{base}/cmds/{stem}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        print("✓ RESULT: XML elements were imported once with their nested fields")
+
+    def test_channel_enumerations_expand(self):
+        """Test that channel enumerations are available inline with expand=enumerations"""
+        print("\n" + "="*60)
+        print("TEST 16: Channel Enumerations (Shared Sets)")
+        print("="*60)
+        print("Purpose: Create channels sharing one enumeration table and read them back")
+        print("Expected: Either the table or its shared reference by default, the table with expand=enumerations")
+
+        base = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/channels"
+        enumerations = [{"symbol": "OFF", "numeric": 0}, {"symbol": "ON", "numeric": 1}]
+        names = [f"ENUM_CHAN_{i}_{self.test_id}" for i in range(3)]
+        channels = [{"channel_name": name, "channel_id": f"E-{i}-{self.test_id}", "type": "enum", "enumerations": enumerations}
+                    for i, name in enumerate(names)]
+
+        response = requests.post(base, json=channels, headers=self.header, verify=False)
+        print(f"✓ Create Status: {response.status_code}")
+        self.assertEqual(response.status_code, 201)
+
+        response = requests.get(f"{base}/{names[0]}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        channel = response.json()
+        print(f"✓ Stored form: {sorted(channel.keys())}")
+        self.assertTrue('enumerations' in channel or 'enumerations_ref' in channel)
+
+        response = requests.get(f"{base}/{names[0]}", params={'expand': 'enumerations'}, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['enumerations'], enumerations)
+        self.assertNotIn('enumerations_ref', response.json())
+
+        response = requests.post(f"{base}/bulk_query", params={'expand': 'enumerations'}, json=names, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['enumerations'] for c in response.json()], [enumerations] * 3)
+        print("✓ RESULT: Enumerations were returned inline on request")
+
+    def test_suggest_names(self):
+        """Test prefix suggestions, including names written after the first request"""
+        print("\n" + "="*60)
+        print("TEST 17: Name Suggestions")
+        print("="*60)
+        print("Purpose: Suggest command stems by prefix before and after creating and deleting a command")
+        print("Expected: New stems are suggested at once, deleted stems no longer are, prefixes ignore case")
+
+        version_path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}"
+        prefix = f"SUGGEST_{self.test_id}_"
+        stems = [f"{prefix}{i}" for i in range(3)]
+
+        def suggested(**params):
+            response = requests.get(f"{version_path}/suggest", params={'prefix': prefix, **params}, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            return response.json()
+
+        # Loads the version's names before the writes below
+        self.assertEqual(suggested(kind='command'), [])
+
+        response = requests.post(f"{version_path}/cmds", json=[{"command_stem": stem} for stem in stems], headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 201)
+        hits = suggested(kind='command')
+        print(f"✓ Suggestions after create: {hits}")
+        self.assertEqual(hits, [{'kind': 'command', 'name': stem} for stem in stems])
+
+        response = requests.get(f"{version_path}/suggest", params={'prefix': prefix.lower(), 'limit': 2}, headers=self.header, verify=False)
+        self.assertEqual([hit['name'] for hit in response.json()], stems[:2])
+
+        response = requests.delete(f"{version_path}/cmds/{stems[0]}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual([hit['name'] for hit in suggested()], stems[1:])
+
+        response = requests.get(f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/no-such-version-{self.test_id}/suggest",
+                                params={'prefix': 'A'}, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 404)
+        print("✓ RESULT: Suggestions follow writes without delay")
+
+    def test_create_commands_repeated_stem(self):
+        """Test creating commands where the request repeats a command_stem"""
+        print("\n" + "="*60)
+        print("TEST 18: Create Commands With a Repeated Stem")
+        print("="*60)
+        print("Purpose: POST the same command_stem twice in one request")
+        print("Expected: 409 naming the stem, with the first of the two saved")
+
+        path = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}/cmds"
+        stem = f"REPEATED_CMD_{self.test_id}"
+
+        response = requests.post(path, json=[{"command_stem": stem}, {"command_stem": stem}], headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        print(f"✓ Response Body: {response.text[:300]}")
+        self.assertEqual(response.status_code, 409)
+        self.assertIn(stem, response.json()['message'])
+
+        response = requests.get(f"{path}/{stem}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        print("✓ RESULT: The repeated stem was reported and saved once")
+
+    def test_content_changes_paged(self):
+        """Test paging through the change feed with limit and next"""
+        print("\n" + "="*60)
+        print("TEST 19: Dictionary Content Changes in Pages")
+        print("="*60)
+        print("Purpose: Create two commands in separate writes and read the feed one change at a time")
+        print("Expected: Two pages of one change each, the first with a next revision, the last without")
+
+        base = f"{self.url}/dictionaries/{self.test_dictionary_type}/versions/{self.test_dictionary_version}"
+        stems = [f"PAGED_CMD_{i}_{self.test_id}" for i in range(2)]
+
+        response = requests.get(f"{base}/changes", params={'since': 0}, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        since = response.json()['revision']
+        while response.json()['next'] is not None:
+            response = requests.get(f"{base}/changes", params={'since': since}, headers=self.header, verify=False)
+            since = response.json()['revision']
+
+        for stem in stems:
+            response = requests.post(f"{base}/cmds", json=[{"command_stem": stem}], headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 201)
+
+        names = []
+        pages = 0
+        while True:
+            response = requests.get(f"{base}/changes", params={'since': since, 'limit': 1}, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            print(f"✓ Page: revision {page['revision']}, next {page['next']}, {len(page['changes'])} change(s)")
+            names += [change['name'] for change in page['changes']]
+            pages += 1
+            since = page['revision']
+            if page['next'] is None:
+                break
+            self.assertEqual(page['next'], page['revision'])
+
+        self.assertEqual(names, stems)
+        self.assertEqual(pages, 2)
+        print("✓ RESULT: The feed was read in pages of whole revisions")
+
     @classmethod
     def tearDownClass(cls):
         print("\n" + "█"*80)
@@ -4,6 +4,7 @@ import unittest
 import requests
 import json
 import time
+import utils
 import config
 
 class HealthApiTest(unittest.TestCase):
@@ -17,6 +18,10 @@ class HealthApiTest(unittest.TestCase):
         print("Test Coverage:")
         print("  1. Basic health endpoint connectivity and status")
         print("  2. Response format validation and structure")
+        print("  3. MessagePack content negotiation and compression threshold")
+        print("  4. ArangoDB connection pool status (GET /health/arangodb, authenticated)")
+        print("  5. Trace context propagation (traceparent), when tracing is enabled")
+        print("  6. Startup cache warm-up status (GET /health/warmup)")
         print("█"*80)
         
         cls.url = config.API_PATH
@@ -117,6 +122,114 @@ class HealthApiTest(unittest.TestCase):
         print(f"  Status value: {response_data['status']}")
         print(f"  Status type: {type(response_data['status']).__name__}")
 
+    def test_health_endpoint_content_negotiation(self):
+        """Test MessagePack negotiation and that small responses stay uncompressed"""
+        print("\n" + "="*60)
+        print("TEST 3: Health Endpoint Content Negotiation")
+        print("="*60)
+        print("Purpose: Verify Accept: application/msgpack and the compression threshold")
+        print("Expected: MessagePack map {'status': 'OK'}, no Content-Encoding on a tiny response")
+
+        path = f"{self.url}/health"
+
+        response = requests.get(path, headers={'Accept': 'application/msgpack'}, verify=False)
+        print(f"✓ Response Status Code: {response.status_code}")
+        print(f"✓ Content-Type: {response.headers.get('content-type')}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers.get('content-type', '').startswith('application/msgpack'))
+        # fixmap with one entry: fixstr "status" -> fixstr "OK"
+        self.assertEqual(response.content, b'\x81\xa6status\xa2OK')
+        print("✓ MessagePack body matches the JSON response")
+
+        response = requests.get(path, headers={'Accept-Encoding': 'gzip, br'}, verify=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.headers.get('content-encoding'))
+        self.assertEqual(response.json(), {'status': 'OK'})
+        print("✓ RESULT: Small response sent uncompressed")
+
+    def test_arangodb_pool_status(self):
+        """Test the ArangoDB connection pool status endpoint"""
+        print("\n" + "="*60)
+        print("TEST 4: ArangoDB Connection Pool Status")
+        print("="*60)
+        print("Purpose: Verify the pool configuration and utilization metrics")
+        print("Expected: HTTP 401 without a token, HTTP 200 with pool metrics with one")
+
+        path = f"{self.url}/health/arangodb"
+
+        response = requests.get(path, verify=False)
+        self.assertEqual(response.status_code, 401)
+
+        try:
+            utils.set_header()
+        except:
+            self.skipTest('Cannot login at the moment.')
+
+        response = requests.get(path, headers=config.HEADER, verify=False)
+        print(f"✓ Response Status Code: {response.status_code}")
+        print(f"✓ Response Content: {response.text}")
+        self.assertEqual(response.status_code, 200)
+
+        stats = response.json()
+        self.assertEqual(stats['status'], 'OK')
+        self.assertGreaterEqual(stats['coordinators'], 1)
+        self.assertGreater(stats['max_sockets'], 0)
+        self.assertGreaterEqual(stats['peak_in_flight'], stats['in_flight'])
+        self.assertGreater(stats['requests'], 0)
+        print("✓ RESULT: Pool status reported")
+
+    def test_trace_context_propagation(self):
+        """Test that a sampled traceparent is continued by the service"""
+        print("\n" + "="*60)
+        print("TEST 5: Trace Context Propagation")
+        print("="*60)
+        print("Purpose: Verify that a request's trace is continued and its root span returned")
+        print("Expected: A traceparent response header with the caller's trace id and a new span id")
+
+        trace_id = f"{int(self.test_id):032x}"
+        parent_span_id = "00f067aa0ba902b7"
+        headers = {'traceparent': f"00-{trace_id}-{parent_span_id}-01"}
+
+        response = requests.get(f"{self.url}/health", headers=headers, verify=False)
+        print(f"✓ Response Status Code: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+
+        traceparent = response.headers.get('traceparent')
+        print(f"✓ Response traceparent: {traceparent}")
+        if traceparent is None:
+            self.skipTest('Tracing is not enabled on this server')
+
+        version, returned_trace_id, span_id, flags = traceparent.split('-')
+        self.assertEqual(returned_trace_id, trace_id)
+        self.assertNotEqual(span_id, parent_span_id)
+        self.assertEqual(flags, '01')
+        print("✓ RESULT: The caller's trace was continued")
+
+    def test_warmup_status(self):
+        """Test the warm-up status and that a finished warm-up leaves the service ready"""
+        print("\n" + "="*60)
+        print("TEST 6: Startup Cache Warm-up Status")
+        print("="*60)
+        print("Purpose: Verify GET /health/warmup and its agreement with GET /health")
+        print("Expected: HTTP 200 with a state; /health is 200 once the warm-up is no longer running")
+
+        response = requests.get(f"{self.url}/health/warmup", verify=False)
+        print(f"✓ Response Status Code: {response.status_code}")
+        print(f"✓ Response Content: {response.text}")
+        self.assertEqual(response.status_code, 200)
+
+        status = response.json()
+        self.assertIn(status['state'], ['disabled', 'pending', 'running', 'done', 'failed'])
+        if status['state'] in ['pending', 'running']:
+            self.skipTest('The warm-up is still running')
+
+        self.assertEqual(status['documents'], sum(v['documents'] for v in status['versions']))
+        self.assertEqual(status['artifact_bytes'], sum(v['artifact_bytes'] for v in status['versions']))
+        health = requests.get(f"{self.url}/health", verify=False)
+        print(f"✓ /health Status Code: {health.status_code}")
+        self.assertEqual(health.status_code, 200)
+        print(f"✓ RESULT: Warm-up {status['state']} in {status.get('duration_ms', 0)}ms; service is ready")
+
     @classmethod
     def tearDownClass(cls):
         print("\n" + "█"*80)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+import xmlrunner
+import unittest
+import requests
+import json
+import time
+import utils
+import config
+
+class StepPaletteApiTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        print("\n" + "█"*80)
+        print("🎨 STEP PALETTE API TEST SUITE")
+        print("█"*80)
+        print("This test suite verifies the Step Palette API functionality")
+        print("Authentication: ENABLED (requires valid authentication token)")
+        print("Test Coverage:")
+        print("  1. Get built in steps (GET /step_palette/built_in)")
+        print("  2. ETag revalidation (If-None-Match -> 304)")
+        print("  3. Update built in step (PATCH /step_palette/built_in/{step_type})")
+        print("  4. Active custom scripts appear as custom steps")
+        print("  5. Custom step lifecycle (POST, PATCH, DELETE /step_palette/custom)")
+        print("█"*80)
+
+        # Gets the token and sets the config header
+        try:
+            utils.set_header()
+        except:
+            print('Cannot login at the moment.')
+            exit(1)
+        cls.header = config.HEADER
+        cls.url = config.API_PATH
+        cls.test_id = str(int(time.time()))  # Unique ID for this test run
+
+        cls.test_script_id = f"palette_script_{cls.test_id}"
+        cls.test_step_id = f"palette_step_{cls.test_id}"
+
+        print(f"API Base URL: {cls.url}")
+        print(f"Test Session ID: {cls.test_id}")
+        print("="*80)
+
+        # Create an active custom script that should show up in the palette
+        script = {
+            "script_id": cls.test_script_id,
+            "script_path": f"/test/path/{cls.test_script_id}.py",
+            "script_name": f"Palette Script {cls.test_id}",
+            "description": "Custom script created by the step palette test",
+            "hash": f"palettehash{cls.test_id}",
+            "status": "ACTIVE",
+            "inputs": [],
+            "outputs": [],
+            "entries": [],
+            "layout": []
+        }
+        response = requests.post(f"{cls.url}/custom_scripts", json=[script], headers=cls.header, verify=False)
+        print(f"Test script creation status: {response.status_code}")
+
+    def test_get_built_in_steps(self):
+        """Test retrieving the built in steps of the palette"""
+        print("\n" + "="*60)
+        print("TEST 1: Get Built In Steps")
+        print("="*60)
+        print("Purpose: Verify the built in steps are listed and filterable")
+        print("Expected: HTTP 200 with every built in step type")
+
+        path = f"{self.url}/step_palette/built_in"
+        response = requests.get(path, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+
+        steps = response.json()
+        step_types = [step['step_type'] for step in steps]
+        self.assertIn('CMD', step_types)
+        self.assertIn('CUSTOM_SCRIPT', step_types)
+        for step in steps:
+            self.assertIn(step['enable_disable'], ['ENABLE', 'DISABLE'])
+
+        filtered = requests.get(f"{path}?step_type=wait", headers=self.header, verify=False).json()
+        self.assertTrue(all('WAIT' in step['step_type'] for step in filtered))
+        print(f"✓ RESULT: {len(steps)} built in steps, {len(filtered)} matching 'wait'")
+
+    def test_built_in_steps_etag(self):
+        """Test that an unchanged palette is revalidated with 304"""
+        print("\n" + "="*60)
+        print("TEST 2: Palette ETag Revalidation")
+        print("="*60)
+        print("Purpose: Verify the palette is served with an ETag and If-None-Match works")
+        print("Expected: HTTP 304 with no body for a matching ETag")
+
+        path = f"{self.url}/step_palette/built_in"
+        response = requests.get(path, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers.get('etag')
+        print(f"✓ ETag: {etag}")
+        self.assertIsNotNone(etag)
+
+        revalidated = requests.get(path, headers={**self.header, 'If-None-Match': etag}, verify=False)
+        print(f"✓ Revalidation Status: {revalidated.status_code}")
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.content, b'')
+        print("✓ RESULT: Unchanged palette answered with 304")
+
+    def test_update_built_in_step(self):
+        """Test updating the display name of a built in step"""
+        print("\n" + "="*60)
+        print("TEST 3: Update Built In Step")
+        print("="*60)
+        print("Purpose: Verify PATCH overrides a built in step and changes the ETag")
+        print("Expected: HTTP 200 with the updated step, new ETag on the list")
+
+        path = f"{self.url}/step_palette/built_in"
+        etag = requests.get(path, headers=self.header, verify=False).headers.get('etag')
+
+        response = requests.patch(f"{path}/WAIT", json={"step_display_name": f"Wait {self.test_id}"},
+                                  headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['step_display_name'], f"Wait {self.test_id}")
+
+        after = requests.get(path, headers={**self.header, 'If-None-Match': etag}, verify=False)
+        self.assertEqual(after.status_code, 200)
+        self.assertNotEqual(after.headers.get('etag'), etag)
+
+        # Restore the default name
+        requests.patch(f"{path}/WAIT", json={"step_display_name": "Wait"}, headers=self.header, verify=False)
+        print("✓ RESULT: Built in step updated")
+
+    def test_active_script_in_custom_palette(self):
+        """Test that an active custom script is listed as a custom step"""
+        print("\n" + "="*60)
+        print("TEST 4: Active Custom Script In Palette")
+        print("="*60)
+        print("Purpose: Verify custom steps are derived from ACTIVE custom scripts")
+        print("Expected: The test script is a custom step until it is made INACTIVE")
+
+        path = f"{self.url}/step_palette/custom/{self.test_script_id}"
+        response = requests.get(path, headers=self.header, verify=False)
+        print(f"✓ Response Status: {response.status_code}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['step_display_name'], f"Palette Script {self.test_id}")
+
+        requests.patch(f"{self.url}/custom_scripts/{self.test_script_id}", json={"status": "INACTIVE"},
+                       headers=self.header, verify=False)
+        response = requests.get(path, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 404)
+
+        requests.patch(f"{self.url}/custom_scripts/{self.test_script_id}", json={"status": "ACTIVE"},
+                       headers=self.header, verify=False)
+        response = requests.get(path, headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        print("✓ RESULT: Palette follows the custom script status")
+
+    def test_custom_step_lifecycle(self):
+        """Test adding, updating and deleting a custom step"""
+        print("\n" + "="*60)
+        print("TEST 5: Custom Step Lifecycle")
+        print("="*60)
+        print("Purpose: Verify POST, PATCH and DELETE on /step_palette/custom")
+        print("Expected: 201, 409 on duplicate, 200 on update, 204 then 404 on delete")
+
+        path = f"{self.url}/step_palette/custom"
+        step = {"step_id": self.test_step_id, "step_display_name": "Palette Step", "palette_catagory": "Tests"}
+
+        response = requests.post(path, json=[step], headers=self.header, verify=False)
+        print(f"✓ Create Status: {response.status_code}")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()[0]['step_id'], self.test_step_id)
+
+        response = requests.post(path, json=[step], headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 409)
+
+        response = requests.patch(f"{path}/{self.test_step_id}", json={"step_display_name": "Renamed Step"},
+                                  headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['step_display_name'], "Renamed Step")
+
+        listed = requests.get(f"{path}?wild=true&display_name=renamed", headers=self.header, verify=False)
+        self.assertEqual(listed.status_code, 200)
+        self.assertIn(self.test_step_id, [s['step_id'] for s in listed.json()])
+        self.assertIn('x-total-count', listed.headers)
+
+        response = requests.delete(f"{path}/{self.test_step_id}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 204)
+        response = requests.get(f"{path}/{self.test_step_id}", headers=self.header, verify=False)
+        self.assertEqual(response.status_code, 404)
+        print("✓ RESULT: Custom step lifecycle completed")
+
+    @classmethod
+    def tearDownClass(cls):
+        print("\n" + "█"*80)
+        print("🏁 STEP PALETTE API TEST SUITE COMPLETED")
+        print("█"*80)
+        print("All Step Palette API tests have been executed.")
+        print("XML reports generated in: ./test-reports/")
+        print("█"*80)
+
+        try:
+            requests.delete(f"{cls.url}/custom_scripts/{cls.test_script_id}", headers=cls.header, verify=False)
+        except Exception as e:
+            print(f"⚠️ Could not clean up test script: {e}")
+
+if __name__ == '__main__':
+    unittest.main(testRunner=xmlrunner.XMLTestRunner(output='test-reports'))
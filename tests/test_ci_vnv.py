@@ -27,6 +27,8 @@ class VnvApiTest(unittest.TestCase):
         print("  6. Bulk query verification items (POST /vnv/vis/bulk)")
         print("  7. Test 404 handling for non-existent items")
         print("  8. Delete verification item (DELETE /vnv/vis/{id}) - Final test")
+        print("  9. Reverse lookup by VA/VAC (GET /vnv/vas/{va}, /vnv/vacs/{vac})")
+        print("  10. Verification item statistics (GET /vnv/stats)")
         print("█"*80)
         
         # Gets the token and sets the config header
@@ -337,6 +339,94 @@ class VnvApiTest(unittest.TestCase):
             print(f"✗ RESULT: DELETE request failed with error: {e}")
             self.fail(f"DELETE request failed: {e}")
 
+    def test_reverse_lookup_by_activity(self):
+        """Test looking up verification items by linked VA and VAC"""
+        print("\n" + "="*60)
+        print("TEST 9: Reverse Lookup by Verification Activity")
+        print("="*60)
+        print("Purpose: Verify GET /vnv/vas/{va}, GET /vnv/vacs/{vac} and their bulk variants")
+        print("Expected: Only the verification items linked to the activity are returned")
+
+        va = f"VA_LOOKUP_{self.test_id}"
+        vac = f"VAC_LOOKUP_{self.test_id}"
+        vi_ids = [f"VI_LOOKUP_{self.test_id}_{i}" for i in range(3)]
+        items = [
+            {"vi_id": vi_ids[0], "vi_name": "Lookup VI 0", "vas": [va], "vacs": [vac]},
+            {"vi_id": vi_ids[1], "vi_name": "Lookup VI 1", "vas": [va, "OTHER_VA"], "vacs": []},
+            {"vi_id": vi_ids[2], "vi_name": "Lookup VI 2", "vas": ["OTHER_VA"], "vacs": [vac]}
+        ]
+
+        try:
+            response = requests.post(f"{self.url}/vnv/vis", json=items, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 201, f"Could not create test VIs: {response.text}")
+
+            response = requests.get(f"{self.url}/vnv/vas/{va}", headers=self.header, verify=False)
+            print(f"✓ VA lookup status: {response.status_code}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([item['vi_id'] for item in response.json()], vi_ids[:2])
+            self.assertEqual(response.headers.get('x-total-count'), '2')
+
+            response = requests.get(f"{self.url}/vnv/vacs/{vac}", headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([item['vi_id'] for item in response.json()], [vi_ids[0], vi_ids[2]])
+
+            response = requests.post(f"{self.url}/vnv/vas/bulk", json=[va, f"MISSING_{self.test_id}"],
+                                     headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), [
+                {"va": va, "vi_ids": vi_ids[:2]},
+                {"va": f"MISSING_{self.test_id}", "vi_ids": []}
+            ])
+
+            response = requests.get(f"{self.url}/vnv/vis?vac_name={vac}", headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(sorted(item['vi_id'] for item in response.json()), [vi_ids[0], vi_ids[2]])
+            print("✓ RESULT: Reverse lookups returned the linked verification items")
+        finally:
+            for vi_id in vi_ids:
+                requests.delete(f"{self.url}/vnv/vis/{vi_id}", headers=self.header, verify=False)
+
+    def test_verification_item_stats(self):
+        """Test the aggregated verification item statistics"""
+        print("\n" + "="*60)
+        print("TEST 10: Verification Item Statistics")
+        print("="*60)
+        print("Purpose: Verify GET /vnv/stats aggregates counts and is refreshed after VI writes")
+        print("Expected: Counts by type/owner and unlinked VIs for the filtered set")
+
+        vi_type = f"STATS_TYPE_{self.test_id}"
+        vi_ids = [f"VI_STATS_{self.test_id}_{i}" for i in range(3)]
+        items = [
+            {"vi_id": vi_ids[0], "vi_name": "Stats VI 0", "vi_type": vi_type, "vi_owner": "alice", "vas": ["VA1"], "vacs": []},
+            {"vi_id": vi_ids[1], "vi_name": "Stats VI 1", "vi_type": vi_type, "vi_owner": "alice", "vas": [], "vacs": ["VAC1"]},
+            {"vi_id": vi_ids[2], "vi_name": "Stats VI 2", "vi_type": vi_type, "vi_owner": "bob", "vas": [], "vacs": []}
+        ]
+        path = f"{self.url}/vnv/stats?vi_type={vi_type}"
+
+        try:
+            # Prime the cache with an empty result, then check that the insert invalidates it
+            response = requests.get(path, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['count'], 0)
+
+            response = requests.post(f"{self.url}/vnv/vis", json=items, headers=self.header, verify=False)
+            self.assertEqual(response.status_code, 201, f"Could not create test VIs: {response.text}")
+
+            response = requests.get(path, headers=self.header, verify=False)
+            print(f"✓ Stats: {response.text[:300]}")
+            self.assertEqual(response.status_code, 200)
+            stats = response.json()
+            self.assertEqual(stats['count'], 3)
+            self.assertEqual(stats['without_vas'], 2)
+            self.assertEqual(stats['without_vacs'], 2)
+            self.assertEqual(stats['by_type'], [{"vi_type": vi_type, "count": 3, "without_vas": 2, "without_vacs": 2}])
+            owners = {group['vi_owner']: group['count'] for group in stats['by_owner']}
+            self.assertEqual(owners, {"alice": 2, "bob": 1})
+            print("✓ RESULT: Statistics aggregated server-side")
+        finally:
+            for vi_id in vi_ids:
+                requests.delete(f"{self.url}/vnv/vis/{vi_id}", headers=self.header, verify=False)
+
     @classmethod
     def tearDownClass(cls):
         print("\n" + "█"*80)